@@ -5,19 +5,39 @@
 
 #api/main.py
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+from functools import cache
+from datetime import date, datetime
 import sys, os
 
 # Import Taskmanager from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.logic import UserLogic, CategoryLogic, TransactionLogic, BudgetsLogic, SavingGoalsLogic
+from src.async_db import init_async_db, close_async_db
+from src.importer import StatementImporter, detect_format
+from src.exporter import EXPORT_FORMATS
+from src.metrics import MetricsMiddleware, render_metrics, PROMETHEUS_CONTENT_TYPE
+from src.responses import FastJSONResponse
+from src.async_logic import (
+    AsyncUserLogic, AsyncCategoryLogic, AsyncTransactionLogic, AsyncBudgetsLogic, AsyncSavingGoalsLogic
+)
 
 
 
 #----------App Setup----------
-app = FastAPI(title="FinTrack API", version="1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared, pooled async database client at startup and close it at shutdown."""
+    await init_async_db()
+    yield
+    await close_async_db()
+    for accessor in LOGIC_ACCESSORS:  # rebuilt against the new database on the next start
+        accessor.cache_clear()
+
+app = FastAPI(title="FinTrack API", version="1.0", lifespan=lifespan)
 
 #----------Allow frontend (Streamlit/React) to call the API----------
 
@@ -29,16 +49,41 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
     )
 
+#----------Request timing: /metrics + Server-Timing headers----------
+app.add_middleware(MetricsMiddleware)
+
 
 #Creating an instance (this will handle all the logic operations)
-user_logic = UserLogic()
-category_logic = CategoryLogic()
-transaction_logic = TransactionLogic()
-budgets_logic = BudgetsLogic()
-saving_goals_logic = SavingGoalsLogic()
+# Async logic: handlers await the DB instead of holding a threadpool thread per request.
+# They all share the one pooled AsyncDatabaseManager from src.async_db.get_async_db()
+# Each is built on first use, so importing this module reads no settings and opens nothing.
+@cache
+def user_logic():
+    return AsyncUserLogic()
+
+@cache
+def category_logic():
+    return AsyncCategoryLogic()
+
+@cache
+def transaction_logic():
+    return AsyncTransactionLogic()
+
+@cache
+def budgets_logic():
+    return AsyncBudgetsLogic()
+
+@cache
+def saving_goals_logic():
+    return AsyncSavingGoalsLogic()
+
+LOGIC_ACCESSORS = (user_logic, category_logic, transaction_logic, budgets_logic, saving_goals_logic)
 
 
 #----------Data Models----------
+MAX_BULK_TRANSACTIONS = 10000
+MAX_BULK_CONTRIBUTIONS = 1000
+
 #USER
 class User(BaseModel):
     """Schema for creating a new user."""
@@ -68,6 +113,9 @@ class Transaction(BaseModel):
     description: str | None = None
     date: str | None = None  # ISO format date string
     receipt_url: str | None = None
+class TransactionBatch(BaseModel):
+    """Schema for importing many transactions at once."""
+    transactions: list[Transaction] = Field(..., max_length=MAX_BULK_TRANSACTIONS)
 class TransactionUpdate(BaseModel):
     """Schema for updating a transaction."""
     category_id: str | None = None
@@ -106,46 +154,129 @@ class SavingGoalUpdate(BaseModel):
     saved_amount: float | None = None
     deadline: str | None = None  # ISO format date string
     status: str | None = None  # 'active', 'completed', 'paused'
+class Contribution(BaseModel):
+    """Schema for adding to (or, when negative, withdrawing from) one saving goal."""
+    delta: float
+class GoalContribution(Contribution):
+    goal_id: str
+class ContributionBatch(BaseModel):
+    """Schema for contributing to many saving goals at once."""
+    contributions: list[GoalContribution] = Field(..., max_length=MAX_BULK_CONTRIBUTIONS)
+
+
+#----------Response Models----------
+# Document the list endpoints in OpenAPI. Those routes return a FastJSONResponse,
+# so rows are encoded straight from the database without being re-validated.
+class TransactionOut(BaseModel):
+    id: str
+    user_id: str | None = None
+    category_id: str | None = None
+    type: str
+    amount: float
+    description: str | None = None
+    date: datetime
+    receipt_url: str | None = None
+class TransactionPage(BaseModel):
+    Success: bool
+    data: list[TransactionOut]
+    next_cursor: str | None = None  # pass back as ?cursor= for the next page
+
+class BudgetOut(BaseModel):
+    id: str
+    user_id: str | None = None
+    category_id: str | None = None
+    month: date
+    amount: float
+class BudgetList(BaseModel):
+    Success: bool
+    data: list[BudgetOut] | None = None
+    message: str | None = None
+
+class SavingGoalOut(BaseModel):
+    id: str
+    user_id: str | None = None
+    name: str
+    target_amount: float
+    saved_amount: float | None = 0.0
+    target_date: date
+    status: str | None = None
+class SavingGoalList(BaseModel):
+    Success: bool
+    data: list[SavingGoalOut] | None = None
+    message: str | None = None
+
+class Series(BaseModel):
+    key: str | None  # 'income' / 'expense', or a category id (None for uncategorized rows)
+    name: str
+    y: list[float]
+
+class TimeSeries(BaseModel):
+    bucket: str
+    group_by: str
+    type: str | None  # rows the series cover; by category 'expense' unless type=income was asked
+    from_: date = Field(alias="from")
+    to: date
+    x: list[date]  # first day of each bucket
+    series: list[Series]
+    count: list[int]
+
+class TimeSeriesResult(BaseModel):
+    Success: bool
+    data: TimeSeries | None = None
+    message: str | None = None
 
 
 #----------User Endpoints----------
 @app.get("/")
-def home():
+async def home():
     """
     Check if API is running.
     """
     return {"message": "FinTrack API is running!"}
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request wall time, DB calls, DB time and rows (this process)."""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
 @app.get("/users")
-def get_users():
+async def get_users():
     """
     Fetch all users.
     """
-    return user_logic.fetch_all_users()
+    return await user_logic().fetch_all_users()
+@app.get("/users/by_email")
+async def get_user_by_email(email: str):
+    """
+    Fetch one user by email.
+    """
+    result = await user_logic().fetch_user_by_email(email)
+    if not result.get("Success"):
+        raise HTTPException(status_code=404, detail=result.get("message"))
+    return result
 @app.post("/users")
-def create_user(user: User):
+async def create_user(user: User):
     """
     Create a new user.
     """
-    result = user_logic.create_user(user.email, user.name)
+    result = await user_logic().create_user(user.email, user.name)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail = result.get("message"))
     return result
 @app.put("/users/{user_id}")
-def update_user(user_id: str, user: UserUpdate):
+async def update_user(user_id: str, user: UserUpdate):
     """
     Update user details.
     """
-    result = user_logic.modify_user(user_id, email=user.email, name=user.name) if user.email or user.name else user_logic.modify_user(user_id)
+    result = await user_logic().modify_user(user_id, email=user.email, name=user.name) if user.email or user.name else await user_logic().modify_user(user_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 @app.delete("/users/{user_id}")
-def delete_user(user_id: str):
+async def delete_user(user_id: str):
     """
     Delete a user.
     """
-    result = user_logic.remove_user(user_id)
+    result = await user_logic().remove_user(user_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
@@ -154,32 +285,31 @@ def delete_user(user_id: str):
 
 #----------Category Endpoints----------
 @app.get("/categories")
-def get_categories():
+async def get_categories():
     """Fetch all categories."""
-    return category_logic.fetch_all_categories()
+    return await category_logic().fetch_all_categories()
 
 @app.post("/categories")
-def create_category(category: Category):
+async def create_category(category: Category):
     """Create a new Category."""
-    result = category_logic.create_category(category.name)
+    result = await category_logic().create_category(category.name)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 @app.put("/categories/{category_id}")
-def update_category(category_id: str, category: CategoryUpdate):
+async def update_category(category_id: str, category: CategoryUpdate):
     """Update category details."""
-    result = category_logic.modify_category(
-        category_id, 
-        name=category.name
-    ) if category.name else category_logic.modify_category(category_id)
+    if not category.name:
+        raise HTTPException(status_code=400, detail="Category name is required.")
+    result = await category_logic().modify_category(category_id, category.name)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 @app.delete("/categories/{category_id}")
-def delete_category(category_id: str):
+async def delete_category(category_id: str):
     """Delete a category."""
-    result = category_logic.remove_category(category_id)
+    result = await category_logic().remove_category(category_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
@@ -187,12 +317,81 @@ def delete_category(category_id: str):
 
 
 #----------Transaction Endpoints----------
-@app.get("/transactions")
-def get_transactions():
-    return transaction_logic.fetch_all_transactions()
+@app.get("/transactions", response_model=TransactionPage)
+async def get_transactions(
+    user_id: str | None = None,
+    start_date: str | None = None,  # inclusive, ISO date
+    end_date: str | None = None,  # exclusive, ISO date
+    type: str | None = None,  # 'income' or 'expense'
+    category_id: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,  # next_cursor from the previous page (of the same sort and order)
+    sort: str = "date",  # 'date' or 'amount'
+    order: str = "desc"  # 'desc' or 'asc'
+):
+    """Fetch a user's transactions, filtered, sorted and keyset-paginated in the database.
+    Without user_id this falls back to the newest transactions across all users."""
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Order must be asc or desc.")
+    if user_id is None:
+        result = await transaction_logic().fetch_all_transactions(limit=limit, cursor=cursor)
+        if not result.get("Success"):
+            raise HTTPException(status_code=400, detail=result.get("message"))
+        return FastJSONResponse(result)
+    result = await transaction_logic().fetch_user_transactions(
+        user_id,
+        start_date = start_date,
+        end_date = end_date,
+        t_type = type,
+        category_id = category_id,
+        limit = limit,
+        cursor = cursor,
+        sort_by = sort,
+        descending = order == "desc"
+    )
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return FastJSONResponse(result)
+@app.get("/transactions/summary")
+async def get_monthly_summary(user_id: str, month: str | None = None):
+    """Monthly income/expense/per-category totals for a user (month as 'YYYY-MM', default current)."""
+    result = await transaction_logic().get_monthly_summary(user_id, month)
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+@app.get("/transactions/export")
+async def export_transactions(
+    user_id: str,
+    format: str = "csv",  # 'csv' or 'ndjson'
+    start_date: str | None = None,
+    end_date: str | None = None
+):
+    """Stream a user's full transaction history as CSV or NDJSON.
+    Pages through the DB with a keyset cursor; only one page is ever held in memory."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    # Load the first page before answering, so a failing database is an error status, not an empty 200.
+    # A page failing later aborts the stream, so a cut-off export never looks complete.
+    chunks = transaction_logic().export_transactions(user_id, format, start_date, end_date)
+    try:
+        first = await anext(chunks, None)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        if first is not None:
+            yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    )
 @app.post("/transactions")
-def create_transaction(transaction: Transaction):
-    result = transaction_logic.create_transaction(
+async def create_transaction(transaction: Transaction):
+    result = await transaction_logic().create_transaction(
         user_id = transaction.user_id,
         category_id = transaction.category_id,
         t_type = transaction.type,
@@ -204,9 +403,28 @@ def create_transaction(transaction: Transaction):
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
+@app.post("/transactions/bulk")
+async def create_transactions_bulk(batch: TransactionBatch):
+    """Insert up to MAX_BULK_TRANSACTIONS transactions in chunked multi-row inserts.
+    Responds 200 with per-row errors (index into the request list) for rows that were rejected."""
+    return await transaction_logic().create_transactions_bulk([t.model_dump() for t in batch.transactions])
+@app.post("/transactions/import")
+def import_transactions(
+    user_id: str = Form(...),
+    file: UploadFile = File(...),
+    format: str | None = Form(None),  # 'csv', 'ofx' or 'qfx'; guessed from the file name if omitted
+    default_category_id: str | None = Form(None)
+):
+    """Stream a CSV/OFX bank statement into the user's transactions.
+    Plain def on purpose: parsing is CPU-bound, so FastAPI runs it in the threadpool."""
+    importer = StatementImporter(user_id, default_category_id=default_category_id)
+    try:
+        return importer.import_file(file.file, format or detect_format(file.filename))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 @app.put("/transactions/{transaction_id}")
-def update_transaction(transaction_id: str, transaction: TransactionUpdate):
-    result = transaction_logic.modify_transaction(
+async def update_transaction(transaction_id: str, transaction: TransactionUpdate):
+    result = await transaction_logic().modify_transaction(
         transaction_id,
         category_id = transaction.category_id,
         t_type = transaction.type,
@@ -217,21 +435,36 @@ def update_transaction(transaction_id: str, transaction: TransactionUpdate):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 @app.delete("/transactions/{transaction_id}")
-def delete_transaction(transaction_id: str):
-    result = transaction_logic.remove_transaction(transaction_id)
+async def delete_transaction(transaction_id: str):
+    result = await transaction_logic().remove_transaction(transaction_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 
 #----------Budget Endpoints----------
-@app.get("/budgets")
-def get_budgets(user_id: str | None = None):
+@app.get("/budgets", response_model=BudgetList)
+async def get_budgets(user_id: str | None = None):
     """Fetch all budgets, optionally filtered by user_id."""
-    return budgets_logic.fetch_all_budgets(user_id)
+    return FastJSONResponse(await budgets_logic().fetch_all_budgets(user_id))
+@app.get("/budgets/analysis")
+async def get_budget_analysis(user_id: str, start_month: str | None = None, end_month: str | None = None):
+    """Budget vs spend per month for start_month..end_month ('YYYY-MM', both inclusive, default current month)."""
+    start_month = start_month or date.today().strftime("%Y-%m")
+    result = await budgets_logic().check_budget_limits_range(user_id, start_month, end_month or start_month)
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+@app.get("/budgets/exceeded")
+async def get_exceeded_budgets(month: str | None = None):
+    """Exceeded budgets of all users for one month ('YYYY-MM', default current month), for notification jobs."""
+    result = await budgets_logic().fetch_exceeded_budgets(month)
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return FastJSONResponse(result)
 @app.post("/budgets")
-def create_budget(budget: Budget):
-    result = budgets_logic.create_budget(
+async def create_budget(budget: Budget):
+    result = await budgets_logic().create_budget(
         user_id = budget.user_id,
         category_id = budget.category_id,
         amount = budget.amount,
@@ -241,8 +474,8 @@ def create_budget(budget: Budget):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 @app.put("/budgets/{budget_id}")
-def update_budget(budget_id: str, budget: BudgetUpdate):
-    result = budgets_logic.modify_budget(
+async def update_budget(budget_id: str, budget: BudgetUpdate):
+    result = await budgets_logic().modify_budget(
         budget_id,
         category_id = budget.category_id,
         amount = budget.amount,
@@ -252,35 +485,35 @@ def update_budget(budget_id: str, budget: BudgetUpdate):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 @app.delete("/budgets/{budget_id}")
-def delete_budget(budget_id: str):
-    result = budgets_logic.remove_budget(budget_id)
+async def delete_budget(budget_id: str):
+    result = await budgets_logic().remove_budget(budget_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 
 #----------Saving Goals Endpoints----------
-@app.get("/saving_goals")
-def get_saving_goals(user_id: str | None = None):
+@app.get("/saving_goals", response_model=SavingGoalList)
+async def get_saving_goals(user_id: str | None = None):
     """Fetch all saving goals, optionally filtered by user_id."""
-    return saving_goals_logic.fetch_all_saving_goals(user_id)
+    return FastJSONResponse(await saving_goals_logic().fetch_all_saving_goals(user_id))
 
 @app.post("/saving_goals")
-def create_saving_goal(saving_goal: SavingGoal):
-    result = saving_goals_logic.create_saving_goal(
+async def create_saving_goal(saving_goal: SavingGoal):
+    result = await saving_goals_logic().create_saving_goal(
         user_id = saving_goal.user_id,
         name = saving_goal.name,
         target_amount = saving_goal.target_amount,
         saved_amount = saving_goal.saved_amount,
-        target_date = saving_goal.deadline,
+        deadline = saving_goal.deadline,
         status = saving_goal.status
     )
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 @app.put("/saving_goals/{goal_id}")
-def update_saving_goal(goal_id: str, saving_goal: SavingGoalUpdate):
-    result = saving_goals_logic.modify_saving_goal(
+async def update_saving_goal(goal_id: str, saving_goal: SavingGoalUpdate):
+    result = await saving_goals_logic().modify_saving_goal(
         goal_id,
         name = saving_goal.name,
         target_amount = saving_goal.target_amount,
@@ -291,14 +524,46 @@ def update_saving_goal(goal_id: str, saving_goal: SavingGoalUpdate):
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
+@app.post("/saving_goals/contributions")
+async def contribute_to_saving_goals(batch: ContributionBatch):
+    """Apply many goal contributions atomically in one database call; returns the updated goals."""
+    result = await saving_goals_logic().add_to_saving_goals([c.model_dump() for c in batch.contributions])
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
+@app.post("/saving_goals/{goal_id}/contributions")
+async def contribute_to_saving_goal(goal_id: str, contribution: Contribution):
+    """Atomically add to a goal's saved amount (server-side increment, safe under concurrency)."""
+    result = await saving_goals_logic().add_to_saving_goal(goal_id, contribution.delta)
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return result
 @app.delete("/saving_goals/{goal_id}")
-def delete_saving_goal(goal_id: str):
-    result = saving_goals_logic.remove_saving_goal(goal_id)
+async def delete_saving_goal(goal_id: str):
+    result = await saving_goals_logic().remove_saving_goal(goal_id)
     if not result.get("Success"):
         raise HTTPException(status_code=400, detail=result.get("message"))
     return result
 
 
+#----------Analytics Endpoints----------
+@app.get("/analytics/timeseries", response_model=TimeSeriesResult)
+async def get_timeseries(
+    user_id: str,
+    from_: str | None = Query(None, alias="from"),  # inclusive, ISO date; default 12 months back
+    to: str | None = None,  # inclusive, ISO date; default today
+    bucket: str = "month",  # 'day', 'week' (from Monday) or 'month'
+    group_by: str = "type",  # 'type' or 'category'
+    type: str | None = None  # only 'income' or 'expense' rows (by category: default 'expense')
+):
+    """Bucketed totals as chart-ready arrays: x holds the bucket starts and each series
+    one y value per bucket. Buckets are filled server-side in one pass over the range."""
+    result = await transaction_logic().get_timeseries(user_id, from_, to, bucket, group_by, type)
+    if not result.get("Success"):
+        raise HTTPException(status_code=400, detail=result.get("message"))
+    return FastJSONResponse(result)
+
+
 #----------Run----------
 
 if __name__ == "__main__":
@@ -0,0 +1,401 @@
+# benchmarks/run.py
+# Benchmark suite: Logic methods, API routes and the dashboard aggregation,
+# measured against a local backend seeded at several scales.
+#
+#   python -m benchmarks.run                          # 1k, 100k and 1M transactions on SQLite
+#   python -m benchmarks.run --scales 1k,100k --iterations 100
+#   python -m benchmarks.run --backend memory --latency-ms 20 --jitter-ms 5
+#   python -m benchmarks.run --compare benchmarks/results/<old>.json
+#
+# Results (latency percentiles in ms, throughput in ops/sec) are written as JSON to
+# benchmarks/results/<commit>.json unless --out is given.
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import src.async_db as async_db_module
+import src.db as db_module
+from src.async_db import ThreadedAsyncDatabaseManager
+from src.importer import StatementImporter
+from src.logic import UserLogic, CategoryLogic, TransactionLogic, BudgetsLogic, SavingGoalsLogic
+from src.memory_db import MemoryDatabaseManager, AsyncMemoryDatabaseManager
+from src.metrics import instrument
+from src.sqlite_db import SQLiteDatabaseManager
+from benchmarks.seed import seed
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+#----------Measurement----------
+def _percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def _summarize(samples, wall_seconds, errors=0):
+    """Seconds per call -> latency percentiles (ms), throughput and failed calls."""
+    samples = sorted(samples)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "count": len(samples),
+        "mean_ms": ms(sum(samples) / len(samples)),
+        "p50_ms": ms(_percentile(samples, 50)),
+        "p90_ms": ms(_percentile(samples, 90)),
+        "p99_ms": ms(_percentile(samples, 99)),
+        "max_ms": ms(samples[-1]),
+        "ops_per_sec": round(len(samples) / wall_seconds, 1) if wall_seconds else None,
+        "errors": errors,
+    }
+
+
+def measure(fn, iterations, warmup=3):
+    """Call fn(i) `iterations` times, one after another."""
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    return _summarize(samples, time.perf_counter() - started)
+
+
+async def ameasure(fn, iterations, concurrency, warmup=3):
+    """Await fn(i) `iterations` times with up to `concurrency` calls in flight.
+    Responses with an HTTP error status are counted in "errors"."""
+    for i in range(warmup):
+        await fn(i)
+    samples = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            response = await fn(i)
+            samples.append(time.perf_counter() - t0)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    return _summarize(samples, time.perf_counter() - started, errors)
+
+
+#----------Backends----------
+def make_backend(name, workdir, latency_ms=0.0, jitter_ms=0.0):
+    """(sync db, async view) for a fresh, empty database."""
+    if name == "sqlite":
+        db = SQLiteDatabaseManager(os.path.join(workdir, "bench.db"))
+        return db, ThreadedAsyncDatabaseManager(db)
+    if name == "memory":
+        db = MemoryDatabaseManager(latency_ms=0, jitter_ms=0, seed=0)
+        db.pending_latency = (latency_ms, jitter_ms)  # applied once seeding is done
+        return db, AsyncMemoryDatabaseManager(db)
+    raise ValueError(f"Unknown backend: {name}")
+
+
+def install(db, adb):
+    """Route get_db()/get_async_db() and the API's logic instances to the benchmark database."""
+    db_module._db = instrument(db)
+    async_db_module._async_db = adb = instrument(adb)
+    import api.main as api_main
+    for accessor in api_main.LOGIC_ACCESSORS:  # rebuilt on first use against adb
+        accessor.cache_clear()
+    return api_main.app
+
+
+#----------Fixtures----------
+def _statement_csv(rows=1000):
+    lines = ["Date,Description,Amount,Category"]
+    for i in range(rows):
+        lines.append(f"{date.today().isoformat()},Bench import {i},-{(i % 97) + 1}.50,Food")
+    return "\n".join(lines).encode()
+
+
+def _new_transaction(user_id, category_id, i):
+    return {"user_id": user_id, "category_id": category_id, "type": "expense",
+            "amount": (i % 50) + 1, "description": f"bench write {i}"}
+
+
+#----------Suites----------
+def logic_suite(db, data, iterations):
+    """Every Logic read the app relies on, plus the write paths (on a separate writer user)."""
+    reader, writer = data["users"][0], data["users"][1]
+    category_id = data["categories"][0]["id"]
+    months = data["months"]
+    users, categories = UserLogic(db), CategoryLogic(db)
+    transactions, budgets, goals = TransactionLogic(db), BudgetsLogic(db), SavingGoalsLogic(db)
+
+    cursor = None
+    for _ in range(5):  # a cursor a few pages deep
+        cursor = transactions.fetch_user_transactions(reader["id"], limit=100, cursor=cursor)["next_cursor"] or cursor
+    heavy = max(5, iterations // 10)
+    csv_bytes = _statement_csv()
+
+    cases = {
+        "UserLogic.fetch_user_by_email": (lambda i: users.fetch_user_by_email(reader["email"]), iterations),
+        "CategoryLogic.fetch_all_categories": (lambda i: categories.fetch_all_categories(), iterations),
+        "CategoryLogic.get_category_maps": (lambda i: categories.get_category_maps(), iterations),
+        "TransactionLogic.fetch_user_transactions": (
+            lambda i: transactions.fetch_user_transactions(reader["id"]), iterations),
+        "TransactionLogic.fetch_user_transactions[deep_page]": (
+            lambda i: transactions.fetch_user_transactions(reader["id"], cursor=cursor), iterations),
+        "TransactionLogic.fetch_all_user_transactions[one_month]": (
+            lambda i: transactions.fetch_all_user_transactions(
+                reader["id"], start_date=months[-2].isoformat(), end_date=months[-1].isoformat()), heavy),
+        "TransactionLogic.get_monthly_summary": (
+            lambda i: transactions.get_monthly_summary(reader["id"]), iterations),
+        "BudgetsLogic.fetch_all_budgets": (lambda i: budgets.fetch_all_budgets(reader["id"]), iterations),
+        "BudgetsLogic.check_budget_limits": (lambda i: budgets.check_budget_limits(reader["id"]), iterations),
+        "BudgetsLogic.check_budget_limits_range[12_months]": (
+            lambda i: budgets.check_budget_limits_range(reader["id"], months[-12], months[-1]), iterations),
+        "BudgetsLogic.fetch_exceeded_budgets[all_users]": (
+            lambda i: budgets.fetch_exceeded_budgets(months[-1]), heavy),
+        "SavingGoalsLogic.fetch_all_saving_goals": (
+            lambda i: goals.fetch_all_saving_goals(reader["id"]), iterations),
+        "TransactionLogic.create_transaction": (
+            lambda i: transactions.create_transaction(writer["id"], category_id, "expense", (i % 50) + 1), iterations),
+        "TransactionLogic.create_transactions_bulk[100]": (
+            lambda i: transactions.create_transactions_bulk(
+                [_new_transaction(writer["id"], category_id, j) for j in range(100)]), heavy),
+        "StatementImporter.import_file[1k_rows]": (
+            lambda i: StatementImporter(writer["id"], default_category_id=category_id,
+                                        transaction_logic=transactions, category_logic=categories
+                                        ).import_file(io.BytesIO(csv_bytes), "csv"), max(3, heavy // 2)),
+    }
+    return {name: measure(fn, n) for name, (fn, n) in cases.items()}
+
+
+def dashboard_suite(db, data, iterations):
+    """The reads one uncached render of the dashboard (frontend/app.py) makes, end to end."""
+    user_id = data["users"][0]["id"]
+    categories, transactions = CategoryLogic(db), TransactionLogic(db)
+    budgets, goals = BudgetsLogic(db), SavingGoalsLogic(db)
+
+    def render(i):
+        summary = transactions.get_monthly_summary(user_id)
+        budgets.fetch_all_budgets(user_id)
+        goals.fetch_all_saving_goals(user_id)
+        id_to_name = categories.get_category_maps()["data"]["id_to_name"]
+        analysis = budgets.check_budget_limits(user_id)
+        [id_to_name.get(b["category_id"]) for b in analysis["data"]]
+        [{"Category": id_to_name.get(k), "Amount": v} for k, v in summary["data"]["expense_by_category"].items()]
+        transactions.get_spending_analysis(user_id)
+
+    return {"dashboard.render": measure(render, iterations)}
+
+
+async def api_suite(app, data, iterations, concurrency):
+    """Every route in api/main.py through the ASGI app (no network), `concurrency` requests in flight."""
+    reader, writer = data["users"][0], data["users"][1]
+    category_id = data["categories"][0]["id"]
+    months = data["months"]
+    heavy = max(5, iterations // 10)
+    csv_bytes = _statement_csv()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def post_json(path, body):
+            return (await client.post(path, json=body)).json()
+
+        # Rows for the update/delete routes, created up front
+        n_fixtures = iterations + 10
+        txn_ids = [(await post_json("/transactions", _new_transaction(writer["id"], category_id, i)))["data"][0]["id"]
+                   for i in range(n_fixtures)]
+        budget_ids = [(await post_json("/budgets", {"user_id": writer["id"], "category_id": category_id,
+                                                    "amount": 100, "month": months[-1].strftime("%Y-%m")}))["data"][0]["id"]
+                      for _ in range(n_fixtures)]
+        goal_ids = [(await post_json("/saving_goals", {"user_id": writer["id"], "name": f"g{i}", "target_amount": 100,
+                                                       "deadline": date.today().isoformat(), "status": "active"}))["data"][0]["id"]
+                    for i in range(n_fixtures)]
+        user_ids = [(await post_json("/users", {"email": f"fixture{i}@example.com", "name": "f"}))["data"][0]["id"]
+                    for i in range(n_fixtures)]
+        category_ids = [(await post_json("/categories", {"name": f"Fixture {i}"}))["data"][0]["id"]
+                        for i in range(n_fixtures)]
+        page = (await client.get("/transactions", params={"user_id": reader["id"], "limit": 100})).json()
+        cursor = page["next_cursor"]
+
+        def get(path, **params):
+            return lambda i: client.get(path, params=params)
+
+        cases = {
+            "GET /": (get("/"), iterations),
+            "GET /users": (get("/users"), iterations),
+            "GET /users/by_email": (get("/users/by_email", email=reader["email"]), iterations),
+            "POST /users": (lambda i: client.post("/users", json={"email": f"new{i}@example.com", "name": "n"}),
+                            iterations),
+            "PUT /users/{id}": (lambda i: client.put(f"/users/{user_ids[i]}", json={"name": f"renamed {i}"}),
+                                iterations),
+            "DELETE /users/{id}": (lambda i: client.delete(f"/users/{user_ids[i]}"), iterations),
+            "GET /categories": (get("/categories"), iterations),
+            "POST /categories": (lambda i: client.post("/categories", json={"name": f"New {i}"}), iterations),
+            "PUT /categories/{id}": (
+                lambda i: client.put(f"/categories/{category_ids[i]}", json={"name": f"Renamed {i}"}), iterations),
+            "DELETE /categories/{id}": (lambda i: client.delete(f"/categories/{category_ids[i]}"), iterations),
+            "GET /transactions": (get("/transactions", user_id=reader["id"]), iterations),
+            "GET /transactions[deep_page]": (get("/transactions", user_id=reader["id"], cursor=cursor), iterations),
+            "GET /transactions[all_users]": (get("/transactions"), iterations),
+            "GET /transactions/summary": (get("/transactions/summary", user_id=reader["id"]), iterations),
+            "GET /transactions/export[one_month]": (
+                get("/transactions/export", user_id=reader["id"], start_date=months[-2].isoformat(),
+                    end_date=months[-1].isoformat()), heavy),
+            "GET /analytics/timeseries[week_by_category]": (
+                get("/analytics/timeseries", user_id=reader["id"], bucket="week", group_by="category"), heavy),
+            "GET /analytics/timeseries[day_by_type]": (
+                get("/analytics/timeseries", user_id=reader["id"], bucket="day"), heavy),
+            "POST /transactions": (
+                lambda i: client.post("/transactions", json=_new_transaction(writer["id"], category_id, i)), iterations),
+            "POST /transactions/bulk[100]": (
+                lambda i: client.post("/transactions/bulk", json={"transactions": [
+                    _new_transaction(writer["id"], category_id, j) for j in range(100)]}), heavy),
+            "POST /transactions/import[1k_rows]": (
+                lambda i: client.post("/transactions/import",
+                                      data={"user_id": writer["id"], "default_category_id": category_id},
+                                      files={"file": ("statement.csv", csv_bytes, "text/csv")}), max(3, heavy // 2)),
+            "PUT /transactions/{id}": (
+                lambda i: client.put(f"/transactions/{txn_ids[i]}", json={"amount": i + 1}), iterations),
+            "DELETE /transactions/{id}": (lambda i: client.delete(f"/transactions/{txn_ids[i]}"), iterations),
+            "GET /budgets": (get("/budgets", user_id=reader["id"]), iterations),
+            "GET /budgets/analysis": (get("/budgets/analysis", user_id=reader["id"]), iterations),
+            "GET /budgets/analysis[12_months]": (
+                get("/budgets/analysis", user_id=reader["id"], start_month=months[-12].strftime("%Y-%m"),
+                    end_month=months[-1].strftime("%Y-%m")), iterations),
+            "GET /budgets/exceeded": (get("/budgets/exceeded", month=months[-1].strftime("%Y-%m")), heavy),
+            "POST /budgets": (lambda i: client.post("/budgets", json={
+                "user_id": writer["id"], "category_id": category_id, "amount": 100,
+                "month": months[-1].strftime("%Y-%m")}), iterations),
+            "PUT /budgets/{id}": (lambda i: client.put(f"/budgets/{budget_ids[i]}", json={"amount": i + 1}),
+                                  iterations),
+            "DELETE /budgets/{id}": (lambda i: client.delete(f"/budgets/{budget_ids[i]}"), iterations),
+            "GET /saving_goals": (get("/saving_goals", user_id=reader["id"]), iterations),
+            "POST /saving_goals": (lambda i: client.post("/saving_goals", json={
+                "user_id": writer["id"], "name": f"new {i}", "target_amount": 100,
+                "deadline": date.today().isoformat(), "status": "active"}), iterations),
+            "PUT /saving_goals/{id}": (
+                lambda i: client.put(f"/saving_goals/{goal_ids[i]}", json={"saved_amount": i}), iterations),
+            "POST /saving_goals/{id}/contributions": (
+                lambda i: client.post(f"/saving_goals/{goal_ids[i % 10]}/contributions", json={"delta": 1}), iterations),
+            "POST /saving_goals/contributions": (lambda i: client.post("/saving_goals/contributions", json={
+                "contributions": [{"goal_id": g, "delta": 1} for g in goal_ids[:10]]}), iterations),
+            "DELETE /saving_goals/{id}": (lambda i: client.delete(f"/saving_goals/{goal_ids[i]}"), iterations),
+        }
+        results = {}
+        for name, (fn, n) in cases.items():
+            # warmup=0: the update/delete fixtures are consumed one per iteration
+            results[name] = await ameasure(fn, n, concurrency, warmup=0)
+        return results
+
+
+#----------Runner----------
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_scale(label, args):
+    workdir = tempfile.mkdtemp(prefix="fintrack-bench-")
+    try:
+        db, adb = make_backend(args.backend, workdir, args.latency_ms, args.jitter_ms)
+        started = time.perf_counter()
+        data = seed(db, SCALES[label])
+        seed_seconds = round(time.perf_counter() - started, 2)
+        if args.backend == "memory":
+            db.latency_ms, db.jitter_ms = db.pending_latency
+        app = install(db, adb)
+        print(f"[{label}] seeded {SCALES[label]:,} transactions in {seed_seconds}s", file=sys.stderr)
+
+        results = {}
+        results.update(dashboard_suite(db, data, args.iterations))
+        results.update(logic_suite(db, data, args.iterations))
+        results.update(asyncio.run(api_suite(app, data, args.iterations, args.concurrency)))
+        db.close()
+        return {"transactions": SCALES[label], "seed_seconds": seed_seconds, "results": results}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(baseline_path, current):
+    """Print p50/p99 change of every benchmark against an earlier results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"{'benchmark':<62} {'p50 ms':>18} {'p99 ms':>18}")
+    for label, scale in current["scales"].items():
+        old_scale = baseline.get("scales", {}).get(label)
+        if not old_scale:
+            continue
+        for name, new in scale["results"].items():
+            old = old_scale["results"].get(name)
+            if not old:
+                continue
+            cells = []
+            for key in ("p50_ms", "p99_ms"):
+                change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+                cells.append(f"{new[key]:>8.2f} ({change:+5.0f}%)")
+            print(f"[{label}] {name:<56} {cells[0]:>18} {cells[1]:>18}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FinTrack benchmark suite")
+    parser.add_argument("--scales", default="1k,100k,1m", help=f"comma separated, from {', '.join(SCALES)}")
+    parser.add_argument("--backend", choices=("sqlite", "memory"), default="sqlite")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="memory backend: simulated latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="memory backend: +/- latency jitter")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per benchmark (heavy ones run fewer)")
+    parser.add_argument("--concurrency", type=int, default=16, help="API requests in flight")
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    labels = [s.strip().lower() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in labels if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    commit = _commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "scales": {label: run_scale(label, args) for label in labels},
+    }
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {out}", file=sys.stderr)
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
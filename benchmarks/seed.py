@@ -0,0 +1,68 @@
+# benchmarks/seed.py
+# Deterministic synthetic data for the benchmark suite.
+import random
+from datetime import date, datetime, timedelta
+
+CATEGORY_NAMES = (
+    "Food", "Transport", "Salary", "Rent", "Utilities", "Shopping",
+    "Health", "Entertainment", "Travel", "Education", "Insurance", "Gifts",
+)
+
+
+def _months_back(count, today=None):
+    """First days of the last `count` months, oldest first (current month included)."""
+    today = today or date.today()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months[::-1]
+
+
+def seed(db, transactions, users=10, months=24, goals_per_user=5, chunk_size=5000, seed=0):
+    """
+    Fill an empty database manager with `users` users, the standard categories,
+    one budget per (user, month, category), a few saving goals and `transactions`
+    transactions spread evenly over users and the last `months` months.
+    Returns {"users": [...], "categories": [...], "months": [...]} for the benchmarks.
+    """
+    rng = random.Random(seed)
+    user_rows = []
+    for i in range(users):
+        result = db.add_user(f"bench{i}@example.com", f"Bench User {i}")
+        user_rows.append(result.data[0])
+    category_rows = [db.add_category(name).data[0] for name in CATEGORY_NAMES]
+    user_ids = [u["id"] for u in user_rows]
+    category_ids = [c["id"] for c in category_rows]
+    month_starts = _months_back(months)
+
+    for user_id in user_ids:
+        for month in month_starts:
+            for category_id in category_ids:
+                db.add_budget(user_id, category_id, round(rng.uniform(200, 5000), 2), month)
+        for g in range(goals_per_user):
+            db.add_saving_goal(user_id, f"Goal {g}", round(rng.uniform(1000, 50000), 2),
+                               saved_amount=round(rng.uniform(0, 1000), 2),
+                               target_date=date.today() + timedelta(days=30 * (g + 1)))
+
+    first_day = datetime.combine(month_starts[0], datetime.min.time())
+    span_seconds = int((datetime.now() - first_day).total_seconds())
+    batch = []
+    for i in range(transactions):
+        batch.append({
+            "user_id": user_ids[i % users],
+            "category_id": rng.choice(category_ids),
+            "type": "income" if rng.random() < 0.2 else "expense",
+            "amount": round(rng.uniform(1, 500), 2),
+            "description": f"Synthetic transaction {i}",
+            "date": (first_day + timedelta(seconds=rng.randrange(span_seconds))).isoformat(),
+            "receipt_url": None,
+        })
+        if len(batch) >= chunk_size:
+            db.add_transactions_batch(batch, chunk_size=chunk_size)
+            batch = []
+    if batch:
+        db.add_transactions_batch(batch, chunk_size=chunk_size)
+
+    return {"users": user_rows, "categories": category_rows, "months": month_starts}
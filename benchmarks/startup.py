@@ -0,0 +1,131 @@
+# benchmarks/startup.py
+# Cold-start timings: how long a fresh interpreter takes to import each entry
+# point, and for the API to import, run its startup hooks and answer a first request.
+# Every sample is a new process, so nothing is shared with earlier runs.
+#
+#   python -m benchmarks.startup                       # 10 runs per target
+#   python -m benchmarks.startup --runs 30 --out startup.json
+#   python -m benchmarks.startup --compare startup.json
+#   python -m benchmarks.startup --profile src.logic   # slowest imports of one module
+#
+# The API target uses the in-memory backend by default so no network is involved
+# (--backend supabase measures the real client, using the credentials in .env).
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGETS = ("src.db", "src.logic", "src.async_logic", "src.auth", "src.importer", "api.main")
+
+_IMPORT_SNIPPET = """
+import sys, time, json
+started = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - started, "modules": len(sys.modules)}}))
+"""
+
+_API_SNIPPET = """
+import sys, time, json, asyncio
+started = time.perf_counter()
+import httpx
+from api.main import app
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/")).raise_for_status()
+
+asyncio.run(first_request())
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": len(sys.modules)}))
+"""
+
+
+def _sample(snippet, env):
+    """Run snippet in a new interpreter: (in-process seconds, process wall seconds, modules loaded)."""
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed")
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["seconds"], wall, result["modules"]
+
+
+def measure(snippet, runs, env):
+    _sample(snippet, env)  # warm-up: writes the .pyc files so every sample starts from the same state
+    samples = [_sample(snippet, env) for _ in range(runs)]
+    inner = sorted(s[0] * 1000 for s in samples)
+    wall = sorted(s[1] * 1000 for s in samples)
+    return {
+        "median_ms": round(statistics.median(inner), 1),
+        "min_ms": round(inner[0], 1),
+        "max_ms": round(inner[-1], 1),
+        "process_median_ms": round(statistics.median(wall), 1),
+        "modules": samples[-1][2],
+    }
+
+
+def profile(module, env, top=20):
+    """Print the slowest imports (cumulative) of one module, from python -X importtime."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=env,
+                         capture_output=True, text=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FinTrack cold-start timings")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per target")
+    parser.add_argument("--backend", choices=("memory", "sqlite", "supabase"), default="memory",
+                        help="database backend for the API startup target")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--profile", metavar="MODULE", help="only print the slowest imports of MODULE")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, FINTRACK_DB_BACKEND=args.backend)
+    if args.backend == "sqlite":
+        env.setdefault("FINTRACK_SQLITE_PATH", ":memory:")
+
+    if args.profile:
+        profile(args.profile, env)
+        return
+
+    results = {}
+    for module in IMPORT_TARGETS:
+        results[f"import {module}"] = measure(_IMPORT_SNIPPET.format(module=module), args.runs, env)
+    results["api startup + first request"] = measure(_API_SNIPPET, args.runs, env)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f).get("results", {})
+    print(f"{'target':<32} {'median ms':>10} {'min ms':>8} {'process ms':>11} {'modules':>8}")
+    for name, r in results.items():
+        line = f"{name:<32} {r['median_ms']:>10.1f} {r['min_ms']:>8.1f} {r['process_median_ms']:>11.1f} {r['modules']:>8}"
+        old = baseline.get(name)
+        if old and old["median_ms"]:
+            line += f"  ({(r['median_ms'] - old['median_ms']) / old['median_ms'] * 100:+.0f}% vs baseline)"
+        print(line)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"python": sys.version.split()[0], "backend": args.backend, "runs": args.runs,
+                       "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
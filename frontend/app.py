@@ -1,5 +1,4 @@
 import streamlit as st
-import plotly.express as px
 from datetime import date, datetime
 import sys, os
 from src.auth import AuthLogic
@@ -9,9 +8,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
 from src.logic import UserLogic, CategoryLogic, TransactionLogic, BudgetsLogic, SavingGoalsLogic
+from frontend.cached_logic import cached, clear_session_cache
+from frontend.dashboard_state import dashboard_state, clear_dashboard_state
+from frontend.query_tracer import start_render_trace, render_trace_sidebar
 
 # ------------------ App Configuration ------------------
 st.set_page_config(page_title="FinTrack", page_icon="💰", layout="wide")
+trace = start_render_trace()  # ?debug=queries lists this render's DB calls
 
 # ------------------ Initialize Session State ------------------
 if "logged_in_user" not in st.session_state:
@@ -24,6 +27,57 @@ transaction_logic = TransactionLogic()
 budgets_logic = BudgetsLogic()
 saving_goals_logic = SavingGoalsLogic()
 
+# ------------------ Dashboard Sections ------------------
+# Pure functions of their inputs; DashboardState reruns them only when those inputs change
+def budget_alerts(budget_analysis, category_id_to_name):
+    """(exceeded, warnings) as lists of (category name, amount over / percentage used)."""
+    if not (budget_analysis["Success"] and budget_analysis["data"]):
+        return None
+    exceeded, warnings = [], []
+    for b in budget_analysis["data"]:
+        category_name = category_id_to_name.get(b['category_id'], "Unknown Category")
+        if b['exceeded']:
+            exceeded.append((category_name, b['spent_amount'] - b['budget_amount']))
+        elif b['percentage_used'] >= 90:
+            warnings.append((category_name, b['percentage_used']))
+    return exceeded, warnings
+
+
+def goal_progress(goals):
+    """[(label, progress 0..1)] for each saving goal."""
+    if not (goals["Success"] and goals["data"]):
+        return []
+    return [
+        (f"**{g['name']}** (₹{g['saved_amount']} / ₹{g['target_amount']})",
+         min(g["saved_amount"] / g["target_amount"], 1.0) if g["target_amount"] else 0)
+        for g in goals["data"]
+    ]
+
+
+def spending_pie(cat_totals, category_id_to_name):
+    # Imported here, not at the top: the login screen never draws a chart
+    import plotly.graph_objects as go
+
+    # Use category names instead of IDs if available
+    if category_id_to_name:
+        names = [category_id_to_name.get(k, "Unknown") for k in cat_totals]
+    else:
+        names = list(cat_totals)
+    fig = go.Figure(go.Pie(labels=names, values=list(cat_totals.values())))
+    fig.update_layout(title="Expenses by Category")
+    return fig
+
+
+def trend_chart(trend):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=trend["months"], y=trend["income"], name="Income"))
+    fig.add_trace(go.Bar(x=trend["months"], y=trend["expense"], name="Expense"))
+    fig.add_trace(go.Scatter(x=trend["months"], y=trend["balance"], name="Balance", mode="lines+markers"))
+    fig.update_layout(barmode="group", title="Monthly Income and Expenses", xaxis_title="Month")
+    return fig
+
 # ------------------ LOGIN / REGISTER ------------------
 if not st.session_state.logged_in_user:
     st.markdown("<h1 style='text-align:center;'>💰 Welcome to FinTrack</h1>", unsafe_allow_html=True)
@@ -37,8 +91,9 @@ if not st.session_state.logged_in_user:
             auth_logic = AuthLogic()
             result = auth_logic.sign_in(email, password)
             if result["Success"]:
-                users = user_logic.fetch_all_users()
-                user_found = next((u for u in users["data"] if u["email"] == email), None)
+                auth_user = result["user"]
+                profile = user_logic.fetch_user_by_email(email, auth_user_id=auth_user.id if auth_user else None)
+                user_found = profile["data"] if profile["Success"] else None
                 if user_found:
                     st.session_state.logged_in_user = user_found
                     st.success("Logged in successfully ✅")
@@ -69,16 +124,21 @@ if st.session_state.logged_in_user:
     st.markdown("### Your Financial Overview for This Month")
 
     # -------- Fetch Data --------
-    txns = transaction_logic.fetch_all_transactions()
-    budgets = budgets_logic.fetch_all_budgets(user_id)
-    goals = saving_goals_logic.fetch_all_saving_goals(user_id)
+    # cached() only reaches the database after a write; sections below are only
+    # rebuilt when their own inputs changed
+    state = dashboard_state(user_id)
+    # Monthly totals come pre-aggregated, so this is constant-time in the number of transactions
+    summary_res = cached(transaction_logic, "get_monthly_summary", user_id)
+    budgets = cached(budgets_logic, "fetch_all_budgets", user_id)
+    goals = cached(saving_goals_logic, "fetch_all_saving_goals", user_id)
     
-    # ADDED: Fetch categories for budget alerts and spending chart
-    categories_res = category_logic.fetch_all_categories()
+    # Cached category lookups for budget alerts and spending chart
+    category_maps = category_logic.get_category_maps()
+    category_id_to_name = category_maps["data"]["id_to_name"] if category_maps["Success"] else {}
 
-    user_txns = [t for t in txns["data"] if t["user_id"] == user_id] if txns["Success"] else []
-    income = sum(t["amount"] for t in user_txns if t["type"] == "income")
-    expense = sum(t["amount"] for t in user_txns if t["type"] == "expense")
+    summary = summary_res["data"] if summary_res["Success"] else {}
+    income = summary.get("income", 0)
+    expense = summary.get("expense", 0)
     remaining_balance = income - expense
 
     # -------- Stats Section --------
@@ -95,25 +155,18 @@ if st.session_state.logged_in_user:
     st.subheader("🔔 Budget Alerts")
     
     # Check if categories were fetched successfully
-    if categories_res["Success"] and categories_res["data"]:
-        # Create a mapping from category ID to category name
-        category_id_to_name = {c["id"]: c["name"] for c in categories_res["data"]}
-        
-        budget_analysis = budgets_logic.check_budget_limits(user_id)
-        if budget_analysis["Success"] and budget_analysis["data"]:
-            exceeded_budgets = [b for b in budget_analysis["data"] if b['exceeded']]
-            warning_budgets = [b for b in budget_analysis["data"] if b['percentage_used'] >= 90 and not b['exceeded']]
-            
-            if exceeded_budgets:
-                for budget in exceeded_budgets:
-                    category_name = category_id_to_name.get(budget['category_id'], "Unknown Category")
-                    st.error(f"🚨 **{category_name}** budget exceeded by ₹{budget['spent_amount'] - budget['budget_amount']:,.2f}")
-            
-            if warning_budgets:
-                for budget in warning_budgets:
-                    category_name = category_id_to_name.get(budget['category_id'], "Unknown Category")
-                    st.warning(f"⚠️ **{category_name}** budget at {budget['percentage_used']:.1f}%")
-            
+    if category_id_to_name:
+        budget_analysis = cached(budgets_logic, "check_budget_limits", user_id)
+        alerts = state.section("alerts", (budget_analysis, category_id_to_name), budget_alerts)
+        if alerts is not None:
+            exceeded_budgets, warning_budgets = alerts
+
+            for category_name, over in exceeded_budgets:
+                st.error(f"🚨 **{category_name}** budget exceeded by ₹{over:,.2f}")
+
+            for category_name, percentage_used in warning_budgets:
+                st.warning(f"⚠️ **{category_name}** budget at {percentage_used:.1f}%")
+
             if not exceeded_budgets and not warning_budgets:
                 st.success("✅ All budgets are within limits!")
         else:
@@ -125,10 +178,10 @@ if st.session_state.logged_in_user:
 
     # -------- Active Saving Goals --------
     st.subheader("🎯 Active Saving Goals")
-    if goals["Success"] and goals["data"]:
-        for g in goals["data"]:
-            progress = min(g["saved_amount"] / g["target_amount"], 1.0) if g["target_amount"] else 0
-            st.write(f"**{g['name']}** (₹{g['saved_amount']} / ₹{g['target_amount']})")
+    progress_rows = state.section("goals", (goals,), goal_progress)
+    if progress_rows:
+        for label, progress in progress_rows:
+            st.write(label)
             st.progress(progress)
     else:
         st.info("No active saving goals yet.")
@@ -137,27 +190,26 @@ if st.session_state.logged_in_user:
 
     # -------- Spending by Category --------
     st.subheader("📊 Monthly Spending by Category")
-    if user_txns:
-        cat_totals = {}
-        for t in user_txns:
-            if t["type"] == "expense":
-                cat_totals[t["category_id"]] = cat_totals.get(t["category_id"], 0) + t["amount"]
+    if summary.get("transaction_count"):
+        cat_totals = summary["expense_by_category"]
 
         if cat_totals:
-            # Use category names instead of IDs if available
-            if categories_res["Success"] and categories_res["data"]:
-                category_id_to_name = {c["id"]: c["name"] for c in categories_res["data"]}
-                df = [{"Category": category_id_to_name.get(k, "Unknown"), "Amount": v} for k, v in cat_totals.items()]
-            else:
-                df = [{"Category": k, "Amount": v} for k, v in cat_totals.items()]
-                
-            fig = px.pie(df, names="Category", values="Amount", title="Expenses by Category")
+            fig = state.section("spending_pie", (cat_totals, category_id_to_name), spending_pie)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No expenses recorded this month.")
     else:
         st.info("No transactions available.")
 
+    # -------- Income vs Expense Trend --------
+    st.subheader("📈 Income vs Expense (Last 12 Months)")
+    analysis = cached(transaction_logic, "get_spending_analysis", user_id)
+    if analysis["Success"] and any(analysis["data"]["trend"]["count"]):
+        fig = state.section("trend", (analysis["data"]["trend"],), trend_chart)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No transactions in the last 12 months.")
+
     st.divider()
 
     # -------- Navigation Section --------
@@ -178,6 +230,8 @@ if st.session_state.logged_in_user:
 
     if n5.button("🚪 Logout"):
         st.session_state.logged_in_user = None
+        clear_session_cache()
+        clear_dashboard_state()
         st.success("Logged out successfully!")
         st.rerun()
 
@@ -212,4 +266,8 @@ if st.session_state.logged_in_user:
                 st.session_state.logged_in_user = None
                 st.rerun()
             else:
-                st.error(res["message"])
\ No newline at end of file
+                st.error(res["message"])
+
+if trace is not None and st.session_state.logged_in_user:
+    st.sidebar.caption(f"Dashboard sections rebuilt this render: {', '.join(state.rebuilt) or 'none'}")
+render_trace_sidebar(trace)
@@ -0,0 +1,58 @@
+# frontend/cached_logic.py
+# Caching of Logic reads for the Streamlit pages.
+#
+# Every widget interaction reruns the page script, so without this each click
+# re-queries everything. cached() keys results on the user's data version
+# (src.logic.data_version), which the Logic write methods bump, so a rerun only
+# reaches the database when that user's data actually changed.
+import time
+
+import streamlit as st
+
+from src.logic import data_version
+
+# Writes made by other processes (e.g. the API) are not seen by data_version,
+# so cached results are also dropped after this many seconds.
+CACHE_TTL = 300
+_SESSION_KEY = "_logic_cache"
+
+
+class _Uncached(Exception):
+    """Carries a failed result out of st.cache_data so it is not stored."""
+    def __init__(self, result):
+        self.result = result
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=5000, show_spinner=False)
+def _shared_call(_logic, logic_name, method, user_id, version, args, kwargs):
+    result = getattr(_logic, method)(user_id, *args, **dict(kwargs))
+    if not result.get("Success"):
+        raise _Uncached(result)
+    return result
+
+
+def cached(logic, method, user_id, *args, **kwargs):
+    """ logic.method(user_id, *args, **kwargs), cached until a write changes user_id's data.
+    Results are memoized in this session first, then in st.cache_data (shared by
+    every session of the same user). Failed results are never cached.
+    Treat the returned dict as read-only."""
+    version = data_version(user_id)
+    logic_name = type(logic).__name__
+    kwargs = tuple(sorted(kwargs.items()))
+    key = (logic_name, method, user_id, args, kwargs)
+
+    memo = st.session_state.setdefault(_SESSION_KEY, {})
+    hit = memo.get(key)
+    if hit is not None and hit[0] == version and time.monotonic() - hit[1] < CACHE_TTL:
+        return hit[2]
+    try:
+        result = _shared_call(logic, logic_name, method, user_id, version, args, kwargs)
+    except _Uncached as e:
+        return e.result
+    memo[key] = (version, time.monotonic(), result)
+    return result
+
+
+def clear_session_cache():
+    """Forget this session's memoized results (e.g. on logout)."""
+    st.session_state.pop(_SESSION_KEY, None)
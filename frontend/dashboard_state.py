@@ -0,0 +1,53 @@
+# frontend/dashboard_state.py
+# Incremental refresh for the dashboard (frontend/app.py).
+#
+# Every widget interaction reruns the whole script. The inputs already come from
+# cached() (keyed on the user's data version, bumped by the Logic writes), so a
+# rerun without writes does not touch the database. DashboardState adds the
+# second half: each section (alerts, goal progress, charts) is rebuilt only when
+# its own inputs changed, otherwise the memoized alerts / figures are reused.
+# A write to one kind of data (e.g. a saving goal) then rebuilds only the
+# sections that read it, even though it bumps the user's whole data version.
+import streamlit as st
+
+_SESSION_KEY = "_dashboard_state"
+
+
+class DashboardState:
+    """Memoized dashboard sections of one user, kept in st.session_state."""
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.rebuilt = []  # sections rebuilt by the last render (shown in the query tracer sidebar)
+        self._sections = {}  # name -> (inputs, value)
+
+    def start_render(self):
+        """Call once per script run, before the sections."""
+        self.rebuilt = []
+
+    def section(self, name, inputs, build):
+        """build(*inputs), or the value from an earlier render if inputs are unchanged.
+        inputs are compared by identity first (cached() hands back the same objects
+        until the data changes), then by value."""
+        entry = self._sections.get(name)
+        if entry is not None and len(entry[0]) == len(inputs) and all(
+            old is new or old == new for old, new in zip(entry[0], inputs)
+        ):
+            return entry[1]
+        value = build(*inputs)
+        self._sections[name] = (inputs, value)
+        self.rebuilt.append(name)
+        return value
+
+
+def dashboard_state(user_id):
+    """This session's DashboardState for user_id (a fresh one when the user changes)."""
+    state = st.session_state.get(_SESSION_KEY)
+    if state is None or state.user_id != user_id:
+        state = st.session_state[_SESSION_KEY] = DashboardState(user_id)
+    state.start_render()
+    return state
+
+
+def clear_dashboard_state():
+    """Forget the memoized sections (e.g. on logout)."""
+    st.session_state.pop(_SESSION_KEY, None)
@@ -4,9 +4,11 @@ from datetime import date
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.logic import CategoryLogic
+from frontend.query_tracer import start_render_trace, render_trace_sidebar
 
 st.set_page_config(page_title="Categories", page_icon="📂", layout="wide")
 st.title("📂 Category Management")
+trace = start_render_trace()  # ?debug=queries lists this render's DB calls
 
 category_logic = CategoryLogic()
 
@@ -38,13 +40,14 @@ st.divider()
 
 # ----- Update Category -----
 st.subheader("✏️ Update Category")
-categories = category_logic.fetch_all_categories()
-if categories["Success"] and categories["data"]:
-    cat_names = [c["name"] for c in categories["data"]]
+category_maps = category_logic.get_category_maps()
+name_to_id = category_maps["data"]["name_to_id"] if category_maps["Success"] else {}
+if name_to_id:
+    cat_names = list(name_to_id)
     selected = st.selectbox("Select Category", cat_names)
     new_name = st.text_input("New Category Name", value=selected)
     if st.button("Update Category"):
-        cat_id = next(c["id"] for c in categories["data"] if c["name"] == selected)
+        cat_id = name_to_id[selected]
         res = category_logic.modify_category(cat_id, new_name)
         if res["Success"]:
             st.success("✅ Category updated successfully!")
@@ -57,10 +60,10 @@ st.divider()
 
 # ----- Delete Category -----
 st.subheader("🗑️ Delete Category")
-if categories["Success"] and categories["data"]:
-    del_cat = st.selectbox("Select Category to Delete", [c["name"] for c in categories["data"]])
+if name_to_id:
+    del_cat = st.selectbox("Select Category to Delete", list(name_to_id))
     if st.button("Delete Category"):
-        cat_id = next(c["id"] for c in categories["data"] if c["name"] == del_cat)
+        cat_id = name_to_id[del_cat]
         res = category_logic.remove_category(cat_id)
         if res["Success"]:
             st.success("✅ Category deleted successfully!")
@@ -68,3 +71,5 @@ if categories["Success"] and categories["data"]:
             st.error(res["message"])
 else:
     st.info("No categories available to delete.")
+
+render_trace_sidebar(trace)
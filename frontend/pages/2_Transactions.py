@@ -4,9 +4,13 @@ import sys, os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.logic import TransactionLogic, CategoryLogic
+from src.importer import StatementImporter, detect_format
+from frontend.transaction_table import transaction_table
+from frontend.query_tracer import start_render_trace, render_trace_sidebar
 
 st.set_page_config(page_title="Transactions", page_icon="💳", layout="wide")
 st.title("💳 Transaction Management")
+trace = start_render_trace()  # ?debug=queries lists this render's DB calls
 
 transaction_logic = TransactionLogic()
 category_logic = CategoryLogic()
@@ -16,9 +20,9 @@ if "logged_in_user" not in st.session_state:
 else:
     user_id = st.session_state.logged_in_user["id"]
 
-    categories = category_logic.fetch_all_categories()
-    cat_data = categories["data"] if categories["Success"] else []
-    cat_map = {c["name"]: c["id"] for c in cat_data}
+    category_maps = category_logic.get_category_maps()
+    cat_map = category_maps["data"]["name_to_id"] if category_maps["Success"] else {}
+    id_to_name = category_maps["data"]["id_to_name"] if category_maps["Success"] else {}
 
     st.subheader("➕ Add Transaction")
     cat_name = st.selectbox("Category", list(cat_map.keys()) if cat_map else ["No categories"])
@@ -36,11 +40,34 @@ else:
 
     st.divider()
 
+    st.subheader("📥 Import Bank Statement")
+    statement = st.file_uploader("Statement file (CSV or OFX)", type=["csv", "ofx", "qfx"])
+    default_cat_name = st.selectbox(
+        "Category for rows without a matching category",
+        list(cat_map.keys()) if cat_map else ["No categories"],
+        key="import_default_category"
+    )
+    if statement is not None and st.button("Import Statement"):
+        with st.spinner("Importing..."):
+            stats = StatementImporter(
+                user_id,
+                default_category_id=cat_map.get(default_cat_name),
+                transaction_logic=transaction_logic,
+                category_logic=category_logic
+            ).import_file(statement, detect_format(statement.name))
+        st.success(
+            f"✅ Imported {stats['inserted']} of {stats['rows_read']} rows "
+            f"({stats['duplicates']} duplicates skipped) at {stats['rows_per_sec']:,.0f} rows/sec"
+        )
+        if stats["errors"]:
+            st.warning(f"⚠️ {stats['failed']} rows could not be imported.")
+            for error in stats["errors"]:
+                st.write(f"Line {error['line']}: {error['message']}")
+
+    st.divider()
+
     st.subheader("📋 View All Transactions")
-    txns = transaction_logic.fetch_all_transactions()
-    user_txns = [t for t in txns["data"] if t["user_id"] == user_id] if txns["Success"] else []
-    if user_txns:
-        for t in user_txns:
-            st.write(f"**ID:** {t['id']} | **Type:** {t['type']} | ₹{t['amount']} | **Category:** {t['category_id']} | {t['description']}")
-    else:
-        st.info("No transactions found.")
+    # One page at a time, filtered in the database; pages stay cached across reruns
+    transaction_table(transaction_logic, user_id, id_to_name)
+
+render_trace_sidebar(trace)
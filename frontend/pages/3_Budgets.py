@@ -9,9 +9,12 @@ project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
 sys.path.insert(0, project_root)
 
 from src.logic import BudgetsLogic, CategoryLogic, TransactionLogic
+from frontend.cached_logic import cached
+from frontend.query_tracer import start_render_trace, render_trace_sidebar
 
 st.set_page_config(page_title="Budgets", page_icon="💰", layout="wide")
 st.title("💰 Budgets Management")
+trace = start_render_trace()  # ?debug=queries lists this render's DB calls
 
 budgets_logic = BudgetsLogic()
 category_logic = CategoryLogic()
@@ -28,15 +31,20 @@ else:
     current_month = current_date.month
 
     # ---------- Fetch all categories ----------
-    categories_res = category_logic.fetch_all_categories()
-    if categories_res["Success"] and categories_res["data"]:
-        category_options = {c["name"]: c["id"] for c in categories_res["data"]}
-        category_id_to_name = {c["id"]: c["name"] for c in categories_res["data"]}
+    category_maps = category_logic.get_category_maps()
+    if category_maps["Success"] and category_maps["data"]["name_to_id"]:
+        category_options = category_maps["data"]["name_to_id"]
+        category_id_to_name = category_maps["data"]["id_to_name"]
     else:
         category_options = {}
         category_id_to_name = {}
         st.error("No categories found. Please add categories first.")
 
+    # ---------- Fetch the user's budgets once per render ----------
+    # Used by the duplicate check and the listing below
+    budgets_res = cached(budgets_logic, "fetch_all_budgets", user_id)
+    budgets_data = budgets_res["data"] if budgets_res["Success"] else []
+
     # ---------- Add New Budget ----------
     st.subheader("➕ Add New Budget")
     
@@ -73,25 +81,13 @@ else:
                     budget_date = date(int(selected_year), month_number, 1)
 
                     # Check if budget already exists for this category and month
-                    existing_budgets = budgets_logic.fetch_all_budgets(user_id)
-                    budget_exists = False
-                    
-                    if existing_budgets["Success"] and existing_budgets["data"]:
-                        for budget in existing_budgets["data"]:
-                            # Extract year-month from the stored date
-                            if isinstance(budget['month'], str):
-                                budget_month = budget['month'][:7]  # Get YYYY-MM part
-                            else:
-                                # If it's already a date object
-                                budget_month = budget['month'].strftime('%Y-%m')
-                            
-                            target_month = f"{selected_year}-{month_number:02d}"
-                            
-                            if (budget['category_id'] == category_id and 
-                                budget_month == target_month):
-                                budget_exists = True
-                                st.error(f"❌ Budget already exists for {selected_month} {selected_year}")
-                                break
+                    target_month = f"{selected_year}-{month_number:02d}"
+                    budget_exists = any(
+                        budget['category_id'] == category_id and str(budget['month'])[:7] == target_month
+                        for budget in budgets_data
+                    )
+                    if budget_exists:
+                        st.error(f"❌ Budget already exists for {selected_month} {selected_year}")
 
                     if not budget_exists:
                         # Pass the date object directly (not as string)
@@ -132,7 +128,7 @@ else:
     
     if st.button("🔍 Check Budget Progress"):
         # Get budget analysis
-        budget_analysis = budgets_logic.check_budget_limits(user_id, analysis_date)
+        budget_analysis = cached(budgets_logic, "check_budget_limits", user_id, analysis_date)
         
         if budget_analysis["Success"] and budget_analysis["data"]:
             st.subheader(f"📊 Budget Analysis for {analysis_month} {analysis_year}")
@@ -179,12 +175,10 @@ else:
 
     # ---------- View All Budgets with Delete Option ----------
     st.subheader("🗂️ Your Budgets")
-    budgets_res = budgets_logic.fetch_all_budgets(user_id)
-    
-    if budgets_res["Success"] and budgets_res["data"]:
+    if budgets_data:
         # Group budgets by month
         budgets_by_month = {}
-        for budget in budgets_res["data"]:
+        for budget in budgets_data:
             # Handle both string and date formats
             if isinstance(budget['month'], str):
                 month_key = budget['month'][:7]  # YYYY-MM
@@ -222,4 +216,6 @@ else:
             
             st.write("---")
     else:
-        st.info("No budgets set yet. Create your first budget above!")
\ No newline at end of file
+        st.info("No budgets set yet. Create your first budget above!")
+
+render_trace_sidebar(trace)
@@ -1,16 +1,72 @@
 import streamlit as st
 from datetime import date
 import sys, os
-import plotly.graph_objects as go
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.logic import SavingGoalsLogic
+from frontend.cached_logic import cached
+from frontend.query_tracer import start_render_trace, render_trace_sidebar
 
 st.set_page_config(page_title="Saving Goals", page_icon="🎯", layout="wide")
 st.title("🎯 Saving Goals Management")
+trace = start_render_trace()  # ?debug=queries lists this render's DB calls
 
 saving_goals_logic = SavingGoalsLogic()
 
+
+def celebrate(updated_goals):
+    """Balloons for goals that just crossed their target; remembers the new saved amounts."""
+    for goal in updated_goals:
+        prev_saved = st.session_state.get(f"prev_saved_{goal['id']}", 0.0)
+        if prev_saved < goal["target_amount"] <= goal["saved_amount"]:
+            st.balloons()
+        st.session_state[f"prev_saved_{goal['id']}"] = goal["saved_amount"]
+
+
+def _delta_key(goal_id):
+    return f"delta_saved_{goal_id}"
+
+
+def _applied(res, goal_ids, shown_at, success_message, failure_message):
+    """Reset the inputs a contribution call applied, so no later click or rerun applies them again,
+    and keep its message for the next render to show at shown_at."""
+    if res["Success"]:
+        for goal_id in goal_ids:
+            st.session_state[_delta_key(goal_id)] = 0.0
+        celebrate(res["data"])
+        st.session_state["goal_flash"] = (shown_at, st.success, success_message(res))
+    else:
+        st.session_state["goal_flash"] = (shown_at, st.error, res.get("message", failure_message))
+
+
+def apply_contribution(goal_id):
+    """on_click of "Update Saved": atomic increment on the server (never below 0)."""
+    res = saving_goals_logic.add_to_saving_goal(goal_id, st.session_state.get(_delta_key(goal_id), 0.0))
+    _applied(res, [goal_id], goal_id,
+             lambda r: f"✅ Saved amount updated to ₹{r['data'][0]['saved_amount']}!", "Failed to update saved amount")
+
+
+def pending_contributions(goal_ids):
+    """Every non-zero amount currently entered, by goal."""
+    deltas = {goal_id: st.session_state.get(_delta_key(goal_id), 0.0) for goal_id in goal_ids}
+    return {goal_id: delta for goal_id, delta in deltas.items() if delta}
+
+
+def apply_all_contributions(goal_ids):
+    """on_click of "Apply All": the amounts entered when it is clicked, in one call."""
+    contributions = pending_contributions(goal_ids)
+    res = saving_goals_logic.add_to_saving_goals(contributions)
+    _applied(res, contributions, "all",
+             lambda r: f"✅ Updated {len(r['data'])} goal(s)!", "Failed to apply contributions")
+
+
+def show_flash(shown_at):
+    """Message of the contribution applied on the last click, once, where it was clicked."""
+    flash = st.session_state.get("goal_flash")
+    if flash and flash[0] == shown_at:
+        del st.session_state["goal_flash"]
+        flash[1](flash[2])
+
 # Check if user is logged in
 if "logged_in_user" not in st.session_state:
     st.warning("⚠️ Please login first.")
@@ -35,7 +91,7 @@ else:
 
     # ---------- View & Update Goals ----------
     st.subheader("📋 View & Update Goals")
-    goals_res = saving_goals_logic.fetch_all_saving_goals(user_id)
+    goals_res = cached(saving_goals_logic, "fetch_all_saving_goals", user_id)
 
     if goals_res["Success"] and goals_res["data"]:
         for g in goals_res["data"]:
@@ -51,36 +107,30 @@ else:
             progress = min(saved_amount / target_amount, 1.0)
             st.progress(progress)
 
-            # Input to add/subtract saved amount
-            delta_saved = st.number_input(
+            # Input to add/subtract saved amount (back to 0 once applied)
+            st.number_input(
                 f"Add/Subtract Money for {g['name']}",
-                value=0.0,
                 step=100.0,
-                key=f"delta_saved_{goal_id}"
+                key=_delta_key(goal_id)
             )
 
             col1, col2 = st.columns([1, 1])
             with col1:
-                if st.button(f"Update Saved {goal_id}"):
-                    new_saved_amount = max(saved_amount + delta_saved, 0.0)  # prevent negative total
-                    res = saving_goals_logic.modify_saving_goal(goal_id, saved_amount=new_saved_amount)
-                    if res["Success"]:
-                        st.success(f"✅ Saved amount updated to ₹{new_saved_amount}!")
-                        # Check for balloons
-                        prev_saved = st.session_state[f'prev_saved_{goal_id}']
-                        if prev_saved < target_amount <= new_saved_amount:
-                            st.balloons()
-                        st.session_state[f'prev_saved_{goal_id}'] = new_saved_amount
-                        # Update local variable to reflect change immediately
-                        saved_amount = new_saved_amount
-                    else:
-                        st.error(res.get("message", "Failed to update saved amount"))
+                st.button(f"Update Saved {goal_id}", on_click=apply_contribution, args=(goal_id,))
+                show_flash(goal_id)
             with col2:
                 if st.button(f"Delete Goal {goal_id}"):
                     saving_goals_logic.remove_saving_goal(goal_id)
                     st.success("✅ Goal deleted!")
                     st.session_state.pop(f'prev_saved_{goal_id}', None)
 
+        # Every non-zero amount entered above, applied in one call
+        goal_ids = [g["id"] for g in goals_res["data"]]
+        pending = pending_contributions(goal_ids)
+        st.button(f"Apply All Contributions ({len(pending)})", disabled=not pending,
+                  on_click=apply_all_contributions, args=(goal_ids,))
+        show_flash("all")
+
     else:
         st.info("No saving goals yet.")
 
@@ -89,6 +139,8 @@ else:
     # ---------- Goals Overview Chart ----------
     st.subheader("📊 Goals Overview")
     if goals_res["Success"] and goals_res["data"]:
+        import plotly.graph_objects as go  # only when there is a chart to draw
+
         goal_names = [g["name"] for g in goals_res["data"]]
         saved = [g["saved_amount"] for g in goals_res["data"]]
         target_amounts = [g["target_amount"] for g in goals_res["data"]]
@@ -106,3 +158,5 @@ else:
             xaxis_title="Goals"
         )
         st.plotly_chart(fig, use_container_width=True)
+
+render_trace_sidebar(trace)
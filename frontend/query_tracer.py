@@ -0,0 +1,97 @@
+# frontend/query_tracer.py
+# Per-render database query tracer for the Streamlit pages.
+#
+# Enable with FINTRACK_DEBUG_QUERIES=1 or by opening a page with ?debug=queries.
+# start_render_trace() at the top of a page records every DB call made during that
+# script run (through the src.metrics hook); render_trace_sidebar() at the bottom
+# lists them in the sidebar and flags
+#   * repeats: the same query with the same arguments more than once per render
+#   * loops:   the same query issued from one line with many different arguments
+#              (a query per row, i.e. an N+1 pattern)
+import os
+import sys
+from collections import Counter, defaultdict
+
+import streamlit as st
+
+from src.db import setting
+from src.metrics import DbStats, set_db_stats
+
+LOOP_THRESHOLD = 3  # distinct-argument calls from one line before it is flagged
+_FRONTEND_DIR = os.path.dirname(os.path.abspath(__file__))
+_SKIP_FILES = {os.path.join(_FRONTEND_DIR, "cached_logic.py"), os.path.abspath(__file__)}
+
+
+def _call_site():
+    """'pages/3_Budgets.py:92' -- the page line that (indirectly) issued the query."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_FRONTEND_DIR) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, _FRONTEND_DIR)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class QueryTrace(DbStats):
+    """DbStats that also keeps every call: operation, arguments, time, rows and call site."""
+    def __init__(self):
+        super().__init__()
+        self.queries = []
+
+    def record(self, operation, args, kwargs, seconds, rows):
+        super().record(operation, args, kwargs, seconds, rows)
+        arguments = ", ".join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in sorted(kwargs.items())])
+        self.queries.append({
+            "operation": operation,
+            "arguments": arguments,
+            "ms": round(seconds * 1000, 2),
+            "rows": rows,
+            "site": _call_site(),
+        })
+
+    def repeats(self):
+        """[(operation, arguments, count)] for identical queries issued more than once."""
+        counts = Counter((q["operation"], q["arguments"]) for q in self.queries)
+        return [(op, arguments, n) for (op, arguments), n in counts.items() if n > 1]
+
+    def loops(self, threshold=LOOP_THRESHOLD):
+        """[(operation, site, count)] for one line issuing a query with many different arguments."""
+        by_site = defaultdict(set)
+        for q in self.queries:
+            by_site[(q["operation"], q["site"])].add(q["arguments"])
+        return [(op, site, len(args)) for (op, site), args in by_site.items() if len(args) >= threshold]
+
+
+def tracing_enabled():
+    if setting("FINTRACK_DEBUG_QUERIES", "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return st.query_params.get("debug") == "queries"
+    except Exception:
+        return False
+
+
+def start_render_trace():
+    """Start tracing this script run; returns the QueryTrace (None when tracing is off)."""
+    if not tracing_enabled():
+        set_db_stats(None)
+        return None
+    trace = QueryTrace()
+    set_db_stats(trace)  # replaced by the next render of this script thread
+    return trace
+
+
+def render_trace_sidebar(trace):
+    """Show the render's queries and findings in the sidebar."""
+    if trace is None:
+        return
+    set_db_stats(None)
+    with st.sidebar.expander(f"🔍 Queries this render: {trace.calls}", expanded=bool(trace.repeats() or trace.loops())):
+        st.caption(f"{trace.seconds * 1000:.1f} ms in the database, {trace.rows} rows returned")
+        for operation, arguments, count in trace.repeats():
+            st.warning(f"Repeated {count}×: `{operation}({arguments})`")
+        for operation, site, count in trace.loops():
+            st.error(f"Per-row loop: `{operation}` called {count}× with different arguments at {site}")
+        if trace.queries:
+            st.dataframe(trace.queries, use_container_width=True, hide_index=True)
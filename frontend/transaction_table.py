@@ -0,0 +1,97 @@
+# frontend/transaction_table.py
+# Paginated transaction table for the Streamlit pages.
+#
+# Only the visible page is fetched and rendered (one st.dataframe, not one
+# element per row). Pages come from the keyset cursor of
+# TransactionLogic.fetch_user_transactions, filtered and sorted in the database, and go
+# through cached(), so pages already seen are served from cache on reruns until
+# the user's data changes. After the visible page is drawn the next one is
+# fetched too, so "Next" is answered from cache.
+from datetime import timedelta
+
+import streamlit as st
+
+from frontend.cached_logic import cached
+
+PAGE_SIZES = (25, 50, 100, 250)
+SORTS = {  # label -> (sort_by, descending)
+    "Newest first": ("date", True),
+    "Oldest first": ("date", False),
+    "Amount: high to low": ("amount", True),
+    "Amount: low to high": ("amount", False),
+}
+_ALL = "All"
+
+
+def _reset_on_change(key, signature):
+    """Pagination state for this table; back to page 1 whenever filters, sort or page size change."""
+    state = st.session_state.get(key)
+    if state is None or state["signature"] != signature:
+        state = st.session_state[key] = {"signature": signature, "cursors": [None], "page": 0}
+    return state
+
+
+def _turn_page(key, step):
+    st.session_state[key]["page"] += step
+
+
+def transaction_table(transaction_logic, user_id, id_to_name, key="transactions"):
+    """Filterable, sortable, paginated table of user_id's transactions, newest first by default."""
+    name_to_id = {name: category_id for category_id, name in id_to_name.items()}
+
+    f1, f2, f3, f4, f5, f6 = st.columns([1, 2, 2, 2, 2, 1])
+    t_type = f1.selectbox("Type", [_ALL, "income", "expense"], key=f"{key}_type")
+    category = f2.selectbox("Category", [_ALL] + sorted(name_to_id), key=f"{key}_category")
+    start = f3.date_input("From", value=None, key=f"{key}_from")
+    end = f4.date_input("To", value=None, key=f"{key}_to")
+    sort = f5.selectbox("Sort", list(SORTS), key=f"{key}_sort")
+    page_size = f6.selectbox("Rows", PAGE_SIZES, key=f"{key}_page_size")
+    sort_by, descending = SORTS[sort]
+
+    filters = {
+        "start_date": start.isoformat() if start else None,
+        "end_date": (end + timedelta(days=1)).isoformat() if end else None,  # "To" is inclusive
+        "t_type": None if t_type == _ALL else t_type,
+        "category_id": name_to_id.get(category),
+        "sort_by": sort_by,
+        "descending": descending,
+    }
+    state = _reset_on_change(key, (tuple(filters.items()), page_size))
+    page, cursors = state["page"], state["cursors"]
+
+    res = cached(transaction_logic, "fetch_user_transactions", user_id,
+                 limit=page_size, cursor=cursors[page], **filters)
+    if not res["Success"]:
+        st.error(res.get("message", "Failed to load transactions."))
+        return
+    rows, next_cursor = res["data"], res["next_cursor"]
+    if next_cursor and len(cursors) == page + 1:
+        cursors.append(next_cursor)
+
+    if rows:
+        st.dataframe(
+            [{
+                "Date": str(t["date"])[:10],
+                "Type": t["type"],
+                "Amount": t["amount"],
+                "Category": id_to_name.get(t["category_id"], "Unknown"),
+                "Description": t.get("description") or "",
+                "ID": t["id"],
+            } for t in rows],
+            column_config={"Amount": st.column_config.NumberColumn(format="₹%.2f")},
+            hide_index=True,
+            use_container_width=True,
+        )
+    else:
+        st.info("No transactions found.")
+
+    p1, p2, p3 = st.columns([1, 4, 1])
+    p1.button("⬅️ Previous", key=f"{key}_prev", disabled=page == 0, on_click=_turn_page, args=(key, -1))
+    first_row = page * page_size + 1 if rows else 0
+    p2.caption(f"Page {page + 1} · rows {first_row}–{page * page_size + len(rows)}")
+    p3.button("Next ➡️", key=f"{key}_next", disabled=not next_cursor, on_click=_turn_page, args=(key, 1))
+
+    # Warm the cache with the next page now that the visible one is on screen
+    if next_cursor:
+        cached(transaction_logic, "fetch_user_transactions", user_id,
+               limit=page_size, cursor=next_cursor, **filters)
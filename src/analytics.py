@@ -0,0 +1,185 @@
+# src/analytics.py
+# Columnar analytics over a user's raw transactions.
+#
+# TransactionFrame holds one column per field as NumPy arrays:
+#   amount    float64
+#   category  int32 codes into .categories (the category ids, None included)
+#   kind      int8: 0 income, 1 expense, -1 anything else
+#   date      datetime64[s]
+# Group-by totals, monthly trends and day/week/month time series are then
+# bincount / mask operations over the whole history instead of loops over row dicts.
+#
+# Month summaries and budget checks are still served from the monthly_rollups and
+# budget_utilization tables (see logic.py); the frame is for arbitrary date ranges
+# and multi-month views over the raw rows.
+import numpy as np
+
+FRAME_COLUMNS = "category_id,type,amount,date"
+KINDS = {"income": 0, "expense": 1}
+
+
+class _Columns:
+    """Accumulates rows column by column so pages can be appended as they arrive."""
+    def __init__(self):
+        self.codes = {}
+        self.amount, self.category, self.kind, self.date = [], [], [], []
+
+    def extend(self, rows):
+        codes = self.codes
+        for row in rows:
+            self.amount.append(row["amount"])
+            self.category.append(codes.setdefault(row.get("category_id"), len(codes)))
+            self.kind.append(KINDS.get(row.get("type"), -1))
+            self.date.append(str(row["date"])[:19])
+
+    def frame(self):
+        return TransactionFrame(
+            np.array(self.amount, dtype=np.float64),
+            np.array(self.category, dtype=np.int32),
+            np.array(self.kind, dtype=np.int8),
+            np.array(self.date, dtype="datetime64[s]"),
+            list(self.codes),
+        )
+
+
+def _bucket_start(days, bucket):
+    """First day of the day / week (Monday) / month bucket of datetime64[D] values."""
+    if bucket == "week":
+        return days - (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    if bucket == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days
+
+
+class TransactionFrame:
+    def __init__(self, amount, category, kind, date, categories):
+        self.amount = amount
+        self.category = category
+        self.kind = kind
+        self.date = date
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.amount)
+
+    #----------Loading----------
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a frame from transaction dicts (category_id, type, amount, date)."""
+        columns = _Columns()
+        columns.extend(rows)
+        return columns.frame()
+
+    @classmethod
+    def load(cls, db, user_id, start_date=None, end_date=None, t_type=None, page_size=5000):
+        """Page a user's transactions (start_date inclusive, end_date exclusive) into a frame."""
+        columns = _Columns()
+        columns.extend(db.iter_user_transactions(user_id, start_date, end_date, t_type,
+                                                 page_size=page_size, columns=FRAME_COLUMNS))
+        return columns.frame()
+
+    @classmethod
+    async def aload(cls, db, user_id, start_date=None, end_date=None, t_type=None, page_size=5000):
+        """load() for the async database managers."""
+        columns = _Columns()
+        async for row in db.iter_user_transactions(user_id, start_date, end_date, t_type,
+                                                   page_size=page_size, columns=FRAME_COLUMNS):
+            columns.extend((row,))
+        return columns.frame()
+
+    #----------Filters----------
+    def between(self, start=None, end=None):
+        """Rows with start <= date < end (dates or ISO strings; None leaves that side open)."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.date >= np.datetime64(str(start)[:19], "s")
+        if end is not None:
+            mask &= self.date < np.datetime64(str(end)[:19], "s")
+        return TransactionFrame(self.amount[mask], self.category[mask], self.kind[mask], self.date[mask],
+                                self.categories)
+
+    #----------Aggregates----------
+    def totals_by_category(self, t_type="expense"):
+        """{category_id: total} for one transaction type."""
+        mask = self.kind == KINDS[t_type]
+        totals = np.bincount(self.category[mask], weights=self.amount[mask], minlength=len(self.categories))
+        counts = np.bincount(self.category[mask], minlength=len(self.categories))
+        return {self.categories[code]: float(totals[code]) for code in np.flatnonzero(counts)}
+
+    def summary(self):
+        """Income, expense, balance and per-category totals (same keys as a rollup month summary)."""
+        income = float(self.amount[self.kind == 0].sum())
+        expense = float(self.amount[self.kind == 1].sum())
+        return {
+            "income": income,
+            "expense": expense,
+            "balance": income - expense,
+            "transaction_count": int(np.count_nonzero(self.kind >= 0)),
+            "income_by_category": self.totals_by_category("income"),
+            "expense_by_category": self.totals_by_category("expense"),
+        }
+
+    def _month_index(self, start_month=None, end_month=None):
+        """(first month, number of months, month offset of every row); months without rows are kept."""
+        months = self.date.astype("datetime64[M]")
+        first = np.datetime64(str(start_month)[:7], "M") if start_month else months.min()
+        last = np.datetime64(str(end_month)[:7], "M") if end_month else months.max()
+        return first, int((last - first).astype(int)) + 1, (months - first).astype(np.int64)
+
+    def monthly_trend(self, start_month=None, end_month=None):
+        """Income, expense, balance and count per month from start_month to end_month (inclusive),
+        as parallel lists ready for a chart. Defaults to the frame's first and last month."""
+        if not len(self) and not (start_month and end_month):
+            return {"months": [], "income": [], "expense": [], "balance": [], "count": []}
+        first, n_months, offset = self._month_index(start_month, end_month)
+        inside = (offset >= 0) & (offset < n_months)
+        income = np.bincount(offset[inside & (self.kind == 0)],
+                             weights=self.amount[inside & (self.kind == 0)], minlength=n_months)
+        expense = np.bincount(offset[inside & (self.kind == 1)],
+                              weights=self.amount[inside & (self.kind == 1)], minlength=n_months)
+        count = np.bincount(offset[inside & (self.kind >= 0)], minlength=n_months)
+        months = first + np.arange(n_months)
+        return {
+            "months": [f"{m}-01" for m in months.astype(str)],
+            "income": income.tolist(),
+            "expense": expense.tolist(),
+            "balance": (income - expense).tolist(),
+            "count": count.tolist(),
+        }
+
+    def timeseries(self, start, end, bucket="month", group_by="type", t_type=None):
+        """Totals per time bucket and group, for start..end (dates, both inclusive).
+        bucket: "day", "week" (starting Monday) or "month"; group_by: "type" or "category".
+        t_type keeps only "income" or "expense" rows; by category it defaults to "expense",
+        so one category's earnings and spending never add up in the same series.
+        Returns parallel lists ready for a chart: x (bucket start dates), one y list per
+        group that has rows, and the transaction count per bucket. Empty buckets are 0."""
+        first, last = np.datetime64(str(start)[:10], "D"), np.datetime64(str(end)[:10], "D")
+        axis = np.arange(_bucket_start(first, bucket), _bucket_start(last, bucket) + 1, dtype="datetime64[D]")
+        if bucket == "week":
+            axis = axis[::7]
+        elif bucket == "month":
+            axis = np.unique(axis.astype("datetime64[M]")).astype("datetime64[D]")
+
+        if group_by == "type":
+            keys, codes = ["income", "expense"], self.kind.astype(np.int64)
+            valid = self.kind >= 0 if t_type is None else self.kind == KINDS[t_type]
+        else:
+            keys, codes = self.categories, self.category.astype(np.int64)
+            valid = self.kind == KINDS[t_type or "expense"]
+        days = self.date.astype("datetime64[D]")
+        valid &= (days >= first) & (days <= last)
+
+        # one pass: bucket index of every row, then a single bincount over (bucket, group)
+        n_buckets, n_groups = len(axis), len(keys)
+        index = np.searchsorted(axis, _bucket_start(days[valid], bucket)) * n_groups + codes[valid]
+        totals = np.bincount(index, weights=self.amount[valid], minlength=n_buckets * n_groups)
+        counts = np.bincount(index, minlength=n_buckets * n_groups).reshape(n_buckets, n_groups)
+        totals = np.round(totals.reshape(n_buckets, n_groups), 2)
+
+        return {
+            "x": axis.astype(str).tolist(),
+            "series": [{"key": keys[g], "y": totals[:, g].tolist()}
+                       for g in np.flatnonzero(counts.sum(axis=0))],
+            "count": counts.sum(axis=1).tolist(),
+        }
@@ -0,0 +1,424 @@
+# async_db.py
+# Async twin of db.py for the FastAPI process: same tables, same method names,
+# but every call is awaited on the async Supabase client so one worker can keep
+# many database round-trips in flight.
+# Like db.py, the supabase package is only imported when the client is created.
+import asyncio
+from datetime import date, datetime, timedelta
+
+from src.db import DatabaseManager, TRANSACTION_SORTS, supabase_credentials, db_timeout, db_backend, get_db, close_db
+from src.metrics import instrument
+
+#-------------------------------------
+#--------Shared async client----------
+#-------------------------------------
+# Created by init_async_db() inside the running event loop (FastAPI startup)
+_async_client = None
+_async_db = None
+_async_lock = asyncio.Lock()
+
+
+async def init_async_db():
+    """Startup hook: create the shared async client and its pooled HTTP session"""
+    global _async_client
+    if db_backend() != "supabase":
+        return get_async_db()
+    async with _async_lock:
+        if _async_client is None:
+            from supabase import acreate_client, AClientOptions
+            _async_client = await acreate_client(*supabase_credentials(),
+                                                 options=AClientOptions(postgrest_client_timeout=db_timeout()))
+    return get_async_db()
+
+
+async def close_async_db():
+    """Shutdown hook: close the pooled HTTP connections of the async client"""
+    global _async_client, _async_db
+    if db_backend() != "supabase":
+        close_db()
+        _async_db = None
+        return
+    async with _async_lock:
+        if _async_client is not None:
+            await _async_client.postgrest.session.aclose()
+        _async_client = None
+
+
+def get_async_db():
+    """Return the process-wide async database manager"""
+    global _async_db
+    if _async_db is None:
+        backend = db_backend()
+        if backend == "supabase":
+            db = AsyncDatabaseManager()
+        elif backend == "memory":
+            from src.memory_db import AsyncMemoryDatabaseManager
+            db = AsyncMemoryDatabaseManager(get_db().wrapped)
+        else:
+            db = ThreadedAsyncDatabaseManager(get_db().wrapped)
+        _async_db = instrument(db)
+    return _async_db
+
+
+class ThreadedAsyncDatabaseManager:
+    """
+    Async facade over a synchronous backend (e.g. SQLite): each call runs in a worker
+    thread via asyncio.to_thread, so the event loop is never blocked on the database.
+    """
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        method = getattr(self._db, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return call
+
+    async def iter_user_transactions(self, *args, **kwargs):
+        """Yield every matching transaction, fetching one page per worker-thread call"""
+        async for row in AsyncDatabaseManager.iter_user_transactions(self, *args, **kwargs):
+            yield row
+
+
+class AsyncDatabaseManager:
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def supabase(self):
+        client = self._client or _async_client
+        if client is None:
+            raise RuntimeError("Async database client is not initialised; await init_async_db() first.")
+        return client
+
+    # ---------- HELPER METHOD ----------
+    _after_cursor = staticmethod(DatabaseManager._after_cursor)
+
+
+    #-------------------------------------
+    #-------------Users Table-------------
+    #-------------------------------------
+    # Create Users
+    async def add_user(self, email, name):
+        try:
+            res = await self.supabase.table("users").insert({"email": email, "name": name}).execute()
+            return res
+        except Exception as e:
+            err_msg = str(e)
+            if "duplicate key value" in err_msg or "already exists" in err_msg:
+                return {"Success": False, "message": "User already exists"}
+            return {"Success": False, "message": err_msg}
+
+    # Get All Users
+    async def get_all_users(self):
+        return await self.supabase.table("users").select("*").execute()
+
+    # Get User by ID
+    async def get_user_by_id(self, user_id):
+        return await self.supabase.table("users").select("*").eq("id", user_id).execute()
+
+    # Get User by Email
+    async def get_user_by_email(self, email):
+        return await self.supabase.table("users").select("*").eq("email", email).limit(1).execute()
+
+    # Update User
+    async def update_user(self, user_id, email=None, name=None):
+        update_data = {}
+        if email:
+            update_data["email"] = email
+        if name:
+            update_data["name"] = name
+        return await self.supabase.table("users").update(update_data).eq("id", user_id).execute()
+
+    # Delete User
+    async def delete_user(self, user_id):
+        return await self.supabase.table("users").delete().eq("id", user_id).execute()
+
+    #-------------------------------------
+    #-----------Categories Table----------
+    #-------------------------------------
+    # Create categories
+    async def add_category(self, name):
+        return await self.supabase.table("categories").insert({"name": name}).execute()
+
+    # Get All categories
+    async def get_all_categories(self):
+        return await self.supabase.table("categories").select("*").execute()
+
+    # Get category by ID
+    async def get_category_by_id(self, category_id):
+        return await self.supabase.table("categories").select("*").eq("id", category_id).execute()
+
+    # Update category
+    async def update_category(self, category_id, updated_name):
+        return await self.supabase.table("categories").update({"name": updated_name}).eq("id", category_id).execute()
+
+    # Delete Category
+    async def delete_category(self, category_id):
+        return await self.supabase.table("categories").delete().eq("id", category_id).execute()
+
+    #-----------------------------------------
+    #-----------Transactions Table------------
+    #-----------------------------------------
+    # Create Transaction
+    async def add_transaction(self, user_id, category_id, t_type, amount, description=None, date=None, receipt_url=None):
+        transaction_data = {
+            "user_id": user_id,
+            "category_id": category_id,
+            "type": t_type,
+            "amount": amount
+        }
+        if description:
+            transaction_data["description"] = description
+        if date:
+            transaction_data["date"] = date
+        if receipt_url:
+            transaction_data["receipt_url"] = receipt_url
+        return await self.supabase.table("transactions").insert(transaction_data).execute()
+
+    # Create Transactions in bulk
+    async def add_transactions_batch(self, transactions, chunk_size=500):
+        """See DatabaseManager.add_transactions_batch"""
+        from postgrest.types import ReturnMethod
+        inserted = 0
+        errors = []
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+            try:
+                await self.supabase.table("transactions").insert(chunk, returning=ReturnMethod.minimal).execute()
+                inserted += len(chunk)
+            except Exception as e:
+                errors.extend({"index": start + i, "message": str(e)} for i in range(len(chunk)))
+        return {"inserted": inserted, "errors": errors}
+
+    # Get All Transactions
+    async def get_all_transactions(self, limit=100, cursor_date=None, cursor_id=None):
+        """Newest transactions across all users, keyset paginated on (date, id)"""
+        query = self._after_cursor(self.supabase.table("transactions").select("*"), cursor_date, cursor_id)
+        return await query.order("date", desc=True).order("id", desc=True).limit(limit).execute()
+
+    # Get User Transactions (filtered server-side, keyset paginated)
+    async def get_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                                    limit=100, cursor_value=None, cursor_id=None, columns="*", sort_by="date",
+                                    descending=True):
+        """See DatabaseManager.get_user_transactions"""
+        if sort_by not in TRANSACTION_SORTS:
+            raise ValueError(f"Cannot sort transactions by {sort_by!r}.")
+        query = self.supabase.table("transactions").select(columns).eq("user_id", user_id)
+        if start_date:
+            query = query.gte("date", start_date)
+        if end_date:
+            query = query.lt("date", end_date)
+        if t_type:
+            query = query.eq("type", t_type)
+        if category_id:
+            query = query.eq("category_id", category_id)
+        query = self._after_cursor(query, cursor_value, cursor_id, sort_by, descending)
+        return await query.order(sort_by, desc=descending).order("id", desc=descending).limit(limit).execute()
+
+    async def iter_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                                     page_size=1000, columns="*"):
+        """Yield every matching transaction of a user, one keyset page at a time (RuntimeError if a page fails)"""
+        if columns != "*":
+            columns = ",".join(dict.fromkeys(columns.split(",") + ["date", "id"]))
+        cursor_value = cursor_id = None
+        while True:
+            result = await self.get_user_transactions(user_id, start_date, end_date, t_type, category_id,
+                                                      limit=page_size, cursor_value=cursor_value,
+                                                      cursor_id=cursor_id, columns=columns)
+            if result.data is None:
+                raise RuntimeError(f"Failed to fetch transactions: {result.error}")
+            page = result.data
+            for row in page:
+                yield row
+            if len(page) < page_size:
+                return
+            cursor_value, cursor_id = page[-1]["date"], page[-1]["id"]
+
+    # Get Monthly Transactions
+    async def get_monthly_transactions(self, user_id, year, month):
+        """Get transactions for a specific user and month"""
+        start_date = f"{year}-{month:02d}-01"
+        if month == 12:
+            end_date = f"{year + 1}-01-01"
+        else:
+            end_date = f"{year}-{month + 1:02d}-01"
+        return await self.supabase.table("transactions").select("*").eq("user_id", user_id).gte("date", start_date).lt("date", end_date).execute()
+
+    # Get Transaction by ID
+    async def get_transaction_by_id(self, transaction_id):
+        return await self.supabase.table("transactions").select("*").eq("id", transaction_id).execute()
+
+    # Update Transaction
+    async def update_transaction(self, transaction_id, category_id=None, t_type=None, amount=None, description=None):
+        update_data = {}
+        if category_id:
+            update_data["category_id"] = category_id
+        if t_type:
+            update_data["type"] = t_type
+        if amount:
+            update_data["amount"] = amount
+        if description is not None:  # Allow empty string
+            update_data["description"] = description
+        return await self.supabase.table("transactions").update(update_data).eq("id", transaction_id).execute()
+
+    # Delete Transaction
+    async def delete_transaction(self, transaction_id):
+        return await self.supabase.table("transactions").delete().eq("id", transaction_id).execute()
+
+    #-----------------------------------------
+    #-----------Monthly Rollups---------------
+    #-----------------------------------------
+    # Get Monthly Rollups
+    async def get_monthly_rollups(self, user_id, month):
+        month = month.isoformat() if isinstance(month, (date, datetime)) else month
+        return await self.supabase.table("monthly_rollups") \
+            .select("category_id,type,total,txn_count") \
+            .eq("user_id", user_id) \
+            .eq("month", month) \
+            .execute()
+
+    # Get Rollups in Range
+    async def get_rollups_in_range(self, user_id, start_month, end_month, t_type=None):
+        query = self.supabase.table("monthly_rollups") \
+            .select("month,category_id,type,total,txn_count") \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month)
+        if t_type:
+            query = query.eq("type", t_type)
+        return await query.execute()
+
+    #-----------------------------------------
+    #-----------Budget Utilization------------
+    #-----------------------------------------
+    UTILIZATION_COLUMNS = DatabaseManager.UTILIZATION_COLUMNS
+    _after_utilization_cursor = staticmethod(DatabaseManager._after_utilization_cursor)
+
+    # Get Budget Utilization
+    async def get_budget_utilization(self, user_id, start_month, end_month):
+        return await self.supabase.table("budget_utilization") \
+            .select(self.UTILIZATION_COLUMNS) \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month) \
+            .order("month") \
+            .execute()
+
+    # Get Exceeded Budgets
+    async def get_exceeded_budgets(self, month, limit=1000, cursor_user_id=None, cursor_category_id=None):
+        """See DatabaseManager.get_exceeded_budgets"""
+        month = month.isoformat() if isinstance(month, (date, datetime)) else month
+        query = self.supabase.table("budget_utilization") \
+            .select(self.UTILIZATION_COLUMNS) \
+            .eq("month", month) \
+            .eq("exceeded", True)
+        query = self._after_utilization_cursor(query, cursor_user_id, cursor_category_id)
+        return await query.order("user_id").order("category_id", nullsfirst=True).limit(limit).execute()
+
+    #-------------------------------------
+    #-----------Budgets Table-------------
+    #-------------------------------------
+    # Create Budget
+    async def add_budget(self, user_id, category_id, amount, month=None):
+        if month is None:
+            today = date.today()
+            month = date(today.year, today.month, 1)
+        budget_data = {
+            "user_id": user_id,
+            "category_id": category_id,
+            "amount": amount,
+            "month": month.isoformat() if isinstance(month, (date, datetime)) else month
+        }
+        return await self.supabase.table("budgets").insert(budget_data).execute()
+
+    # Get All Budgets
+    async def get_all_budgets(self, user_id=None):
+        query = self.supabase.table("budgets").select("*")
+        if user_id:
+            query = query.eq("user_id", user_id)
+        return await query.execute()
+
+    # Get Budgets in Range
+    async def get_budgets_in_range(self, user_id, start_month, end_month):
+        return await self.supabase.table("budgets") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month) \
+            .execute()
+
+    # Get Budget by ID
+    async def get_budget_by_id(self, budget_id):
+        return await self.supabase.table("budgets").select("*").eq("id", budget_id).execute()
+
+    # Update Budget
+    async def update_budget(self, budget_id, category_id=None, amount=None, month=None):
+        update_data = {}
+        if category_id:
+            update_data["category_id"] = category_id
+        if amount:
+            update_data["amount"] = amount
+        if month:
+            update_data["month"] = month.isoformat() if isinstance(month, (date, datetime)) else month
+        return await self.supabase.table("budgets").update(update_data).eq("id", budget_id).execute()
+
+    # Delete Budget
+    async def delete_budget(self, budget_id):
+        return await self.supabase.table("budgets").delete().eq("id", budget_id).execute()
+
+    #-------------------------------------------
+    #-----------Saving Goals Table---------------
+    #-------------------------------------------
+    # Create Saving Goal
+    async def add_saving_goal(self, user_id, name, target_amount, saved_amount=0.0, target_date=None, status="active"):
+        if target_date is None:
+            target_date = date.today() + timedelta(days=30)
+        goal_data = {
+            "user_id": user_id,
+            "name": name,
+            "target_amount": target_amount,
+            "saved_amount": saved_amount,
+            "target_date": target_date.isoformat() if isinstance(target_date, (date, datetime)) else target_date,
+            "status": status
+        }
+        return await self.supabase.table("savings_goals").insert(goal_data).execute()
+
+    # Get All Saving Goals
+    async def get_all_saving_goals(self, user_id=None):
+        query = self.supabase.table("savings_goals").select("*")
+        if user_id:
+            query = query.eq("user_id", user_id)
+        return await query.execute()
+
+    # Get Saving Goal by ID
+    async def get_saving_goal_by_id(self, goal_id):
+        return await self.supabase.table("savings_goals").select("*").eq("id", goal_id).execute()
+
+    # Update Saving Goal
+    async def update_saving_goal(self, goal_id, name=None, target_amount=None, saved_amount=None, target_date=None, status=None):
+        update_data = {}
+        if name:
+            update_data["name"] = name
+        if target_amount:
+            update_data["target_amount"] = target_amount
+        if saved_amount is not None:  # Allow zero
+            update_data["saved_amount"] = saved_amount
+        if target_date:
+            update_data["target_date"] = target_date
+        if status:
+            update_data["status"] = status
+        return await self.supabase.table("savings_goals").update(update_data).eq("id", goal_id).execute()
+
+    # Add to Saving Goal (atomic, server-side)
+    async def add_to_saving_goal(self, goal_id, delta):
+        return await self.supabase.rpc("add_to_saving_goal", {"goal_id": goal_id, "delta": delta}).execute()
+
+    # Add to many Saving Goals in one call
+    async def add_to_saving_goals(self, contributions):
+        return await self.supabase.rpc("add_to_saving_goals", {"contributions": contributions}).execute()
+
+    # Delete Saving Goal
+    async def delete_saving_goal(self, goal_id):
+        return await self.supabase.table("savings_goals").delete().eq("id", goal_id).execute()
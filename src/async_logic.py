@@ -0,0 +1,553 @@
+# src/async_logic.py
+# Async twin of logic.py used by the FastAPI handlers. Same method names and the
+# same {"Success": ..., "data"/"message": ...} results; validation and aggregation
+# helpers are shared with logic.py so both paths behave identically.
+from datetime import timedelta
+
+from src.async_db import get_async_db
+from src.db import TRANSACTION_SORTS
+from src.cache import ReferenceCache
+from src.exporter import EXPORT_COLUMNS, csv_header, encode_csv, encode_ndjson
+from src.logic import (
+    _profile_cache, _month_start, _next_month, _split_valid_rows, _summarize_rollups, _utilization_by_month,
+    _decode_cursor, _page, _category_caches, _category_cache_ttl, _bump_versions,
+    _utilization_row, _merge_contributions, _analysis_months, _spending_analysis, _timeseries_window, _timeseries
+)
+
+
+class AsyncUserLogic:
+    def __init__(self, db=None):
+        self.db = db or get_async_db()
+
+    #----------Create----------
+    async def create_user(self, email, name):
+        """ Add a new user to the database."""
+        if not email or not name:
+            return {"Success": False, "message": "Email and Name are required."}
+
+        result = await self.db.add_user(email, name)
+        _bump_versions()
+        if isinstance(result, dict):  # duplicate or error caught
+            return result
+        elif result.data:
+            return {"Success": True, "message": "User added successfully!", "data": result.data}
+        else:
+            return {"Success": False, "message": "Failed to add user"}
+
+    #---------Read----------
+    async def fetch_all_users(self):
+        """ Fetch all users from the database."""
+        result = await self.db.get_all_users()
+        if result.data is not None:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def fetch_user_by_id(self, user_id):
+        """ Fetch a user by ID from the database."""
+        result = await self.db.get_user_by_id(user_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def fetch_user_by_email(self, email, auth_user_id=None):
+        """ Fetch one user profile by email (see UserLogic.fetch_user_by_email)."""
+        if not email:
+            return {"Success": False, "message": "Email is required."}
+        if auth_user_id:
+            cached = _profile_cache.get(auth_user_id)
+            if cached is not None and cached["email"] == email:
+                return {"Success": True, "data": cached}
+
+        result = await self.db.get_user_by_email(email)
+        if result.data:
+            profile = result.data[0]
+            if auth_user_id:
+                _profile_cache.set(auth_user_id, profile)
+            return {"Success": True, "data": profile}
+        else:
+            return {"Success": False, "message": "User not found."}
+
+    #---------Update----------
+    async def modify_user(self, user_id, email=None, name=None):
+        """ Update user details in the database."""
+        result = await self.db.update_user(user_id, email, name)
+        _profile_cache.invalidate_where(lambda profile: profile["id"] == user_id)
+        _bump_versions()
+        if result.data:
+            return {"Success": True, "message": "User updated Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #---------Delete----------
+    async def remove_user(self, user_id):
+        """ Delete a user from the database."""
+        result = await self.db.delete_user(user_id)
+        _profile_cache.invalidate_where(lambda profile: profile["id"] == user_id)
+        _bump_versions()
+        if result.data:
+            return {"Success": True, "message": "User deleted Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+
+class AsyncCategoryLogic:
+    def __init__(self, db=None):
+        self.db = db or get_async_db()
+
+    @property
+    def _cache(self):
+        """ Category snapshot cache for this logic's database (one per backend)."""
+        cache = _category_caches.get(self.db)
+        if cache is None:
+            cache = _category_caches.setdefault(self.db, ReferenceCache(ttl=_category_cache_ttl()))
+        return cache
+
+    async def _load_categories(self):
+        result = await self.db.get_all_categories()
+        if result.data is None:
+            raise RuntimeError(result.error)
+        return result.data
+
+    async def _snapshot(self):
+        return await self._cache.aget(self._load_categories)
+
+    #----------Create----------
+    async def create_category(self, name):
+        """ Add a new category to the database."""
+        result = await self.db.add_category(name)
+        self._cache.invalidate()
+        _bump_versions()
+        if result.data:
+            return {"Success": True, "message": "Category added successfully!", "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #---------Read----------
+    async def fetch_all_categories(self):
+        """ Fetch all categories (served from the category cache)."""
+        try:
+            return {"Success": True, "data": (await self._snapshot()).rows}
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+
+    async def fetch_category_by_id(self, category_id):
+        """ Fetch a category by ID, from the category cache when it is there."""
+        try:
+            category = (await self._snapshot()).by_id.get(category_id)
+        except Exception:
+            category = None
+        if category is not None:
+            return {"Success": True, "data": [category]}
+        result = await self.db.get_category_by_id(category_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def get_category_maps(self):
+        """ Prebuilt lookups: data = {"name_to_id": {...}, "id_to_name": {...}}. Read-only."""
+        try:
+            snapshot = await self._snapshot()
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": {"name_to_id": snapshot.name_to_id, "id_to_name": snapshot.id_to_name}}
+
+    #---------Update----------
+    async def modify_category(self, category_id, updated_name):
+        """ Update category details in the database."""
+        result = await self.db.update_category(category_id, updated_name)
+        self._cache.invalidate()
+        _bump_versions()
+        if result.data:
+            return {"Success": True, "message": "Category updated Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #---------Delete----------
+    async def remove_category(self, category_id):
+        """ Delete a category from the database."""
+        result = await self.db.delete_category(category_id)
+        self._cache.invalidate()
+        _bump_versions()
+        if result.data:
+            return {"Success": True, "message": "Category deleted Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+
+class AsyncTransactionLogic:
+    def __init__(self, db=None):
+        self.db = db or get_async_db()
+
+    #----------Create----------
+    async def create_transaction(self, user_id, category_id, t_type, amount, description=None, date=None, receipt_url=None):
+        """ Add a new transaction to the database. """
+        if not user_id or not category_id or not t_type or not amount:
+            return {"Success": False, "message": "User ID, Category ID, Type, and Amount are required."}
+
+        result = await self.db.add_transaction(user_id, category_id, t_type, amount, description, date, receipt_url)
+        _bump_versions(user_id=user_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def create_transactions_bulk(self, transactions, chunk_size=500):
+        """ Validate and insert many transactions (see TransactionLogic.create_transactions_bulk). """
+        if not transactions:
+            return {"Success": False, "message": "No transactions given.", "inserted": 0, "errors": []}
+
+        rows, positions, errors = _split_valid_rows(transactions)
+        inserted = 0
+        if rows:
+            result = await self.db.add_transactions_batch(rows, chunk_size=chunk_size)
+            inserted = result["inserted"]
+            for uid in {row["user_id"] for row in rows}:
+                _bump_versions(user_id=uid)
+            errors.extend({"index": positions[e["index"]], "message": e["message"]} for e in result["errors"])
+        errors.sort(key=lambda e: e["index"])
+        return {"Success": not errors, "inserted": inserted, "errors": errors}
+
+    #---------Read----------
+    async def fetch_all_transactions(self, limit=100, cursor=None):
+        """ Fetch the newest transactions across all users, one keyset page at a time. """
+        try:
+            cursor_date, cursor_id = _decode_cursor(cursor)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        result = await self.db.get_all_transactions(limit=limit, cursor_date=cursor_date, cursor_id=cursor_id)
+        if result.data is not None:
+            return _page(result.data, limit)
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def fetch_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                                      limit=100, cursor=None, sort_by="date", descending=True):
+        """ Fetch one page of a user's transactions (see TransactionLogic.fetch_user_transactions). """
+        if not user_id:
+            return {"Success": False, "message": "User ID is required."}
+        if sort_by not in TRANSACTION_SORTS:
+            return {"Success": False, "message": f"Sort must be one of {', '.join(TRANSACTION_SORTS)}."}
+        try:
+            cursor_value, cursor_id = _decode_cursor(cursor, sort_by, descending)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = await self.db.get_user_transactions(
+            user_id,
+            start_date=start_date,
+            end_date=end_date,
+            t_type=t_type,
+            category_id=category_id,
+            limit=limit,
+            cursor_value=cursor_value,
+            cursor_id=cursor_id,
+            sort_by=sort_by,
+            descending=descending
+        )
+        if result.data is not None:
+            return _page(result.data, limit, sort_by, descending)
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def export_transactions(self, user_id, fmt="csv", start_date=None, end_date=None, page_size=1000):
+        """ Async generator of encoded export chunks (one per keyset page) for a user's full history.
+        fmt is 'csv' or 'ndjson'. Nothing is yielded before the first page has loaded, and a failed
+        page raises RuntimeError instead of ending the export early. """
+        encode = encode_csv if fmt == "csv" else encode_ndjson
+        header = csv_header() if fmt == "csv" else ""
+
+        page = []
+        async for row in self.db.iter_user_transactions(user_id, start_date, end_date, page_size=page_size,
+                                                        columns=",".join(EXPORT_COLUMNS)):
+            page.append(row)
+            if len(page) >= page_size:
+                yield header + encode(page)
+                header, page = "", []
+        if page or header:
+            yield header + encode(page)
+
+    async def get_monthly_summary(self, user_id, month=None):
+        """ Income, expense and per-category totals of one user for one month. """
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = await self.db.get_monthly_rollups(user_id, month)
+        if result.data is None:
+            return {"Success": False, "message": f"Error: {result.error}"}
+        return {"Success": True, "data": _summarize_rollups(month, result.data)}
+
+    async def get_spending_analysis(self, user_id, start_month=None, end_month=None):
+        """ Trend, category totals and budget utilization for start_month..end_month (default last 12 months). """
+        try:
+            start_month, end_month = _analysis_months(start_month, end_month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        stop_month = _next_month(end_month)
+
+        utilization = await self.db.get_budget_utilization(user_id, start_month, stop_month)
+        if utilization.data is None:
+            return {"Success": False, "message": f"Error: {utilization.error}"}
+        from src.analytics import TransactionFrame
+        try:
+            frame = await TransactionFrame.aload(self.db, user_id, start_month.isoformat(), stop_month.isoformat())
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": _spending_analysis(frame, utilization.data, start_month, end_month)}
+
+    async def get_timeseries(self, user_id, start_date=None, end_date=None, bucket="month", group_by="type", t_type=None):
+        """ Per day / week / month totals by type or category (default the last 12 months).
+        Category series cover t_type rows, expense when t_type is None. """
+        try:
+            start_date, end_date = _timeseries_window(start_date, end_date, bucket, group_by, t_type)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        id_to_name = {}
+        if group_by == "category":
+            maps = await AsyncCategoryLogic(self.db).get_category_maps()
+            if not maps["Success"]:
+                return maps
+            id_to_name = maps["data"]["id_to_name"]
+
+        from src.analytics import TransactionFrame
+        try:
+            frame = await TransactionFrame.aload(self.db, user_id, start_date.isoformat(),
+                                                 (end_date + timedelta(days=1)).isoformat(), t_type)
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": _timeseries(frame, start_date, end_date, bucket, group_by, t_type, id_to_name)}
+
+    async def fetch_transaction_by_id(self, transaction_id):
+        """ Fetch a transaction by ID from the database. """
+        result = await self.db.get_transaction_by_id(transaction_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Update----------
+    async def modify_transaction(self, transaction_id, category_id=None, t_type=None, amount=None, description=None):
+        """ Update transaction details in the database. """
+        result = await self.db.update_transaction(
+            transaction_id,
+            category_id=category_id,
+            t_type=t_type,
+            amount=amount,
+            description=description
+        )
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Delete----------
+    async def remove_transaction(self, transaction_id):
+        """ Delete a transaction from the database. """
+        result = await self.db.delete_transaction(transaction_id)
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "message": "Transaction deleted successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+
+class AsyncBudgetsLogic:
+    def __init__(self, db=None):
+        self.db = db or get_async_db()
+
+    #----------Create----------
+    async def create_budget(self, user_id, category_id, amount, month=None):
+        """ Create a new budget for a user and category (month defaults to the current one). """
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = await self.db.add_budget(user_id, category_id, amount, month)
+        _bump_versions(user_id=user_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Update----------
+    async def modify_budget(self, budget_id, category_id=None, amount=None, month=None):
+        """ Update budget details in the database."""
+        if month:
+            try:
+                month = _month_start(month)
+            except ValueError as e:
+                return {"Success": False, "message": str(e)}
+
+        result = await self.db.update_budget(budget_id, category_id, amount, month)
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "message": "Budget updated Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #---------Read----------
+    async def fetch_all_budgets(self, user_id=None):
+        """ Fetch all budgets from the database."""
+        result = await self.db.get_all_budgets(user_id)
+        if result.data is not None:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def fetch_budget_by_id(self, budget_id):
+        """ Fetch a budget by ID from the database."""
+        result = await self.db.get_budget_by_id(budget_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Delete----------
+    async def remove_budget(self, budget_id):
+        """ Delete a budget from the database."""
+        result = await self.db.delete_budget(budget_id)
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "message": "Budget deleted Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Budget vs Spend----------
+    async def check_budget_limits(self, user_id, month=None):
+        """Check if spending exceeds budget limits for each category"""
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = await self.check_budget_limits_range(user_id, month, month)
+        if not result["Success"]:
+            return result
+        return {"Success": True, "data": result["data"].get(month.isoformat(), [])}
+
+    async def check_budget_limits_range(self, user_id, start_month, end_month):
+        """Budget vs spend per month (see BudgetsLogic.check_budget_limits_range)."""
+        try:
+            start_month = _month_start(start_month)
+            end_month = _month_start(end_month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        if end_month < start_month:
+            return {"Success": False, "message": "end_month must not be before start_month."}
+
+        result = await self.db.get_budget_utilization(user_id, start_month, _next_month(end_month))
+        if result.data is None:
+            return {"Success": False, "message": f"Error: {result.error}"}
+        return {"Success": True, "data": _utilization_by_month(result.data)}
+
+    async def fetch_exceeded_budgets(self, month=None, page_size=1000):
+        """Every exceeded budget of one month across all users (see BudgetsLogic.fetch_exceeded_budgets)."""
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        rows, cursor = [], (None, None)
+        while True:
+            page = await self.db.get_exceeded_budgets(month, page_size, *cursor)
+            if page.data is None:
+                return {"Success": False, "message": f"Error: {page.error}"}
+            rows.extend({"user_id": row["user_id"], "month": month.isoformat(), **_utilization_row(row)}
+                        for row in page.data)
+            if len(page.data) < page_size:
+                return {"Success": True, "data": rows}
+            cursor = (page.data[-1]["user_id"], page.data[-1]["category_id"])
+
+
+class AsyncSavingGoalsLogic:
+    def __init__(self, db=None):
+        self.db = db or get_async_db()
+
+    #----------Create----------
+    async def create_saving_goal(self, user_id, name, target_amount, saved_amount=0.0, deadline=None, status="active"):
+        result = await self.db.add_saving_goal(
+            user_id=user_id,
+            name=name,
+            target_amount=target_amount,
+            saved_amount=saved_amount,
+            target_date=deadline,
+            status=status
+        )
+        _bump_versions(user_id=user_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Read----------
+    async def fetch_all_saving_goals(self, user_id=None):
+        """ Fetch all saving goals from the database."""
+        result = await self.db.get_all_saving_goals(user_id)
+        if result.data is not None:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def fetch_saving_goal_by_id(self, goal_id):
+        """ Fetch a saving goal by ID from the database."""
+        result = await self.db.get_saving_goal_by_id(goal_id)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Update----------
+    async def modify_saving_goal(self, goal_id, name=None, target_amount=None, saved_amount=None, target_date=None, status=None):
+        """ Update saving goal details in the database."""
+        result = await self.db.update_saving_goal(goal_id, name, target_amount, saved_amount, target_date, status)
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "message": "Saving Goal updated Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def add_to_saving_goal(self, goal_id, delta):
+        """ Atomically add delta (negative to withdraw) to a goal's saved amount; never drops below 0."""
+        contributions, error = _merge_contributions({goal_id: delta})
+        if error:
+            return {"Success": False, "message": error}
+        if not contributions:
+            return {"Success": False, "message": "Contribution must not be zero."}
+        result = await self.db.add_to_saving_goal(goal_id, contributions[0]["delta"])
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        elif result.data is not None:
+            return {"Success": False, "message": "Saving goal not found."}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    async def add_to_saving_goals(self, contributions):
+        """ Apply many goal contributions ({goal_id: delta} or [{"goal_id", "delta"}]) in one round-trip."""
+        contributions, error = _merge_contributions(contributions)
+        if error:
+            return {"Success": False, "message": error}
+        if not contributions:
+            return {"Success": True, "data": []}
+        result = await self.db.add_to_saving_goals(contributions)
+        _bump_versions(result)
+        if result.data is not None:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    #--------Delete----------
+    async def remove_saving_goal(self, goal_id):
+        """ Delete a saving goal from the database."""
+        result = await self.db.delete_saving_goal(goal_id)
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "message": "Saving Goal deleted Successfully!"}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
@@ -1,13 +1,10 @@
-import os
-from supabase import create_client
+from src.db import get_auth_client
 from src.logic import UserLogic
 
 class AuthLogic:
     def __init__(self):
-        self.supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        # Shared auth client: no new client (and TLS handshake) per Login click
+        self.supabase = get_auth_client()
         self.user_logic = UserLogic()
     
     def sign_up(self, email, password, name):
@@ -0,0 +1,139 @@
+# src/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache.
+    Entries expire `ttl` seconds after they are set; once `maxsize` entries are
+    stored the least recently set one is evicted.
+    """
+    def __init__(self, ttl=300, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose value matches predicate(value)."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ReferenceSnapshot:
+    """
+    One load of a small reference table plus prebuilt lookup indexes.
+    Shared by every caller until invalidated -- treat it as read-only.
+    """
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_id = {row["id"]: row for row in rows}
+        self.id_to_name = {row["id"]: row["name"] for row in rows}
+        self.name_to_id = {row["name"]: row["id"] for row in rows}
+        self.loaded_at = time.monotonic()
+
+
+class ReferenceCache:
+    """
+    Read-through cache for a whole slowly-changing table (e.g. categories).
+    get(loader) returns the cached snapshot and only calls loader() when there is
+    none or it is older than `ttl`; invalidate() makes the next get() reload.
+    A load that was already running when invalidate() was called is returned to its
+    caller but not cached, since it may predate the write.
+    Invalidation is per process, so `ttl` bounds how stale other processes can be.
+    """
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._snapshot = None
+        self._generation = 0  # bumped by invalidate()
+        self._lock = threading.Lock()  # one sync load at a time
+        self._state_lock = threading.Lock()  # guards _snapshot and _generation
+
+    def _fresh(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        return None
+
+    def _store(self, rows, generation):
+        snapshot = ReferenceSnapshot(rows)
+        with self._state_lock:
+            if self._generation == generation:
+                self._snapshot = snapshot
+        return snapshot
+
+    def get(self, loader):
+        """loader() -> list of rows; it may raise, in which case nothing is cached."""
+        snapshot = self._fresh()
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._fresh()
+                if snapshot is None:
+                    generation = self._generation
+                    snapshot = self._store(loader(), generation)
+        return snapshot
+
+    async def aget(self, loader):
+        """Async variant of get(): loader is a coroutine function."""
+        snapshot = self._fresh()
+        if snapshot is None:
+            generation = self._generation
+            snapshot = self._store(await loader(), generation)
+        return snapshot
+
+    def invalidate(self):
+        with self._state_lock:
+            self._generation += 1
+            self._snapshot = None
+
+
+class DataVersions:
+    """
+    Write counters used as cache keys: every Logic write bumps the counter of the
+    user it touched (or the shared counter for data every user sees, such as
+    categories). get(user_id) changes exactly when that user's view may have changed.
+    """
+    def __init__(self):
+        self._shared = 0
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id=None):
+        return (self._shared, self._users.get(user_id, 0))
+
+    def bump(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._shared += 1
+            else:
+                self._users[user_id] = self._users.get(user_id, 0) + 1
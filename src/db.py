@@ -1,35 +1,161 @@
 # db.py
+# Importing this module does no I/O and pulls in no client libraries: .env is read
+# and the supabase package imported on first use, so API workers, Streamlit pages
+# and scripts that only import src.db / src.logic start quickly.
 import os
-from supabase import create_client
-from dotenv import load_dotenv
+import threading
 from datetime import date, datetime, timedelta  # ADD datetime here
 
-# Loading environment variables
-load_dotenv()
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
+#-------------------------------------
+#--------Settings (lazy)--------------
+#-------------------------------------
+_env_loaded = False
+
+
+def load_env():
+    """Read .env into the environment once (variables already set win)"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def setting(name, default=None):
+    """Environment variable, with .env loaded first"""
+    load_env()
+    return os.getenv(name, default)
+
+
+def supabase_credentials():
+    """(SUPABASE_URL, SUPABASE_KEY)"""
+    return setting("SUPABASE_URL"), setting("SUPABASE_KEY")
+
+
+def db_timeout():
+    """Seconds before a PostgREST call times out"""
+    return int(setting("FINTRACK_DB_TIMEOUT", "30"))
+
+
+def db_backend():
+    """Storage backend: "supabase" (hosted Postgres), "sqlite" (local file, see sqlite_db.py)
+    or "memory" (in-memory with simulated latency for load tests, see memory_db.py)"""
+    return setting("FINTRACK_DB_BACKEND", "supabase").strip().lower()
+
+#-------------------------------------
+#--------Shared client (per process)--
+#-------------------------------------
+# One Supabase client per process. Its PostgREST session is a single pooled
+# HTTP/2 httpx client, so keep-alive connections and TLS sessions are reused
+# by every DatabaseManager, API request and Streamlit rerun.
+_client = None
+_auth_client = None
+_db = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared data client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import create_client, ClientOptions
+                _client = create_client(*supabase_credentials(),
+                                        options=ClientOptions(postgrest_client_timeout=db_timeout()))
+    return _client
+
+
+def get_auth_client():
+    """Return the shared client used for sign-up / sign-in.
+    Kept separate from the data client: signing in stores the user's session on the
+    client and switches its Authorization header, which must never leak into the
+    queries other users run through get_client()."""
+    global _auth_client
+    if _auth_client is None:
+        with _lock:
+            if _auth_client is None:
+                from supabase import create_client, ClientOptions
+                _auth_client = create_client(*supabase_credentials(), options=ClientOptions(
+                    persist_session=False,
+                    auto_refresh_token=False
+                ))
+    return _auth_client
+
+
+def create_db(backend=None):
+    """Build a new database manager for `backend` (default: FINTRACK_DB_BACKEND).
+    Every backend implements the DatabaseManager methods and result shape."""
+    backend = backend or db_backend()
+    if backend == "supabase":
+        return DatabaseManager()
+    if backend == "sqlite":
+        from src.sqlite_db import SQLiteDatabaseManager
+        return SQLiteDatabaseManager()
+    if backend == "memory":
+        from src.memory_db import MemoryDatabaseManager
+        return MemoryDatabaseManager()
+    raise ValueError(f"Unknown database backend: {backend!r}")
+
+
+def get_db():
+    """Return the process-wide database manager (cheap; safe to call per request).
+    Its calls are timed and counted by src.metrics."""
+    global _db
+    if _db is None:
+        with _lock:
+            if _db is None:
+                from src.metrics import instrument
+                _db = instrument(create_db())
+    return _db
+
+
+def init_db():
+    """Startup hook: create the shared client and open its HTTP pool before the first request"""
+    if db_backend() == "supabase":
+        get_client().postgrest.session  # builds the pooled HTTP session now, not on the first request
+        get_auth_client()
+    return get_db()
+
+
+def close_db():
+    """Shutdown hook: close the pooled HTTP connections and drop the shared clients"""
+    global _client, _auth_client, _db
+    with _lock:
+        if _client is not None:
+            _client.postgrest.session.close()
+        _client = None
+        _auth_client = None
+        if hasattr(_db, "close"):  # local backends own their connection
+            _db.close()
+        _db = None  # the next get_db() builds a fresh manager on the new client
+
+
+# Columns a page of transactions can be ordered by; each has a (user_id, column, id) index
+TRANSACTION_SORTS = ("date", "amount")
 
-supabase = create_client(url, key)
 
 class DatabaseManager:
-    def __init__(self):
-        self.supabase = supabase
-
-            # ---------- HELPER METHOD ----------
-    def _convert_dates_to_strings(self, result):
-        """Convert any date objects in the response to ISO format strings"""
-        if hasattr(result, 'data') and result.data:
-            for item in result.data:
-                # Convert budget month field
-                if 'month' in item and isinstance(item['month'], (date, datetime)):
-                    item['month'] = item['month'].isoformat()
-                # Convert transaction date field if needed
-                if 'date' in item and isinstance(item['date'], (date, datetime)):
-                    item['date'] = item['date'].isoformat()
-                # Convert saving goal target_date field if needed
-                if 'target_date' in item and isinstance(item['target_date'], (date, datetime)):
-                    item['target_date'] = item['target_date'].isoformat()
-        return result
+    def __init__(self, client=None):
+        # None means "use the shared client"; resolved on each call so close_db()/init_db() are picked up
+        self._client = client
+
+    @property
+    def supabase(self):
+        return self._client or get_client()
+
+    # ---------- HELPER METHOD ----------
+    # Rows are returned as PostgREST sends them (dates are already ISO strings);
+    # the API encodes any remaining date objects once, in src.responses.
+    @staticmethod
+    def _after_cursor(query, cursor_value, cursor_id, sort_by="date", descending=True):
+        """Keyset filter: rows strictly after (cursor_value, cursor_id) in (sort_by, id) order.
+        Uses the (user_id, sort_by, id) index, so page N costs the same as page 1 (no OFFSET scan)."""
+        if cursor_value is not None and cursor_id:
+            op = "lt" if descending else "gt"
+            value = f'"{cursor_value}"' if sort_by == "date" else cursor_value
+            query = query.or_(f'{sort_by}.{op}.{value},and({sort_by}.eq.{value},id.{op}.{cursor_id})')
+        return query
 
 
     #-------------------------------------
@@ -55,6 +181,10 @@ class DatabaseManager:
     def get_user_by_id(self, user_id):    
         return self.supabase.table("users").select("*").eq("id", user_id).execute()
 
+    # Get User by Email (equality on the UNIQUE, hence indexed, email column)
+    def get_user_by_email(self, email):
+        return self.supabase.table("users").select("*").eq("email", email).limit(1).execute()
+
     # Update User
     def update_user(self, user_id, email=None, name=None):
         update_data = {}
@@ -111,15 +241,70 @@ class DatabaseManager:
             transaction_data["receipt_url"] = receipt_url    
         return self.supabase.table("transactions").insert(transaction_data).execute()
 
+    # Create Transactions in bulk
+    def add_transactions_batch(self, transactions, chunk_size=500):
+        """Insert many transaction rows, one multi-row INSERT per chunk.
+        Every row must carry the same keys. A chunk that fails is reported row by row
+        (index into `transactions`) and the remaining chunks are still inserted.
+        The rollup trigger runs once per INSERT statement, i.e. once per chunk."""
+        from postgrest.types import ReturnMethod
+        inserted = 0
+        errors = []
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+            try:
+                self.supabase.table("transactions").insert(chunk, returning=ReturnMethod.minimal).execute()
+                inserted += len(chunk)
+            except Exception as e:
+                errors.extend({"index": start + i, "message": str(e)} for i in range(len(chunk)))
+        return {"inserted": inserted, "errors": errors}
+
     # In get_all_transactions method:
-    def get_all_transactions(self, limit=100, offset=0):
-        result = self.supabase.table("transactions") \
-            .select("*") \
-            .order("date", desc=True) \
-            .range(offset, offset + limit - 1) \
-            .execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+    def get_all_transactions(self, limit=100, cursor_date=None, cursor_id=None):
+        """Newest transactions across all users, keyset paginated on (date, id)"""
+        query = self._after_cursor(self.supabase.table("transactions").select("*"), cursor_date, cursor_id)
+        return query.order("date", desc=True).order("id", desc=True).limit(limit).execute()
+
+    # Get User Transactions (filtered server-side, keyset paginated)
+    def get_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                              limit=100, cursor_value=None, cursor_id=None, columns="*", sort_by="date",
+                              descending=True):
+        """Get one page of a user's transactions, newest first unless sort_by/descending say otherwise.
+        All filters run in the database. (cursor_value, cursor_id) is the sort_by value and id of the
+        last row of the previous page; the next page starts strictly after it in (sort_by, id) order."""
+        if sort_by not in TRANSACTION_SORTS:
+            raise ValueError(f"Cannot sort transactions by {sort_by!r}.")
+        query = self.supabase.table("transactions").select(columns).eq("user_id", user_id)
+        if start_date:
+            query = query.gte("date", start_date)
+        if end_date:
+            query = query.lt("date", end_date)
+        if t_type:
+            query = query.eq("type", t_type)
+        if category_id:
+            query = query.eq("category_id", category_id)
+        query = self._after_cursor(query, cursor_value, cursor_id, sort_by, descending)
+        return query.order(sort_by, desc=descending).order("id", desc=descending).limit(limit).execute()
+
+    def iter_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                               page_size=1000, columns="*"):
+        """Yield every matching transaction of a user, one keyset page at a time.
+        Raises RuntimeError if a page fails, so a backend error never looks like the end of the rows."""
+        if columns != "*":
+            # the cursor needs date and id from the last row of each page
+            columns = ",".join(dict.fromkeys(columns.split(",") + ["date", "id"]))
+        cursor_value = cursor_id = None
+        while True:
+            result = self.get_user_transactions(user_id, start_date, end_date, t_type, category_id,
+                                                limit=page_size, cursor_value=cursor_value,
+                                                cursor_id=cursor_id, columns=columns)
+            if result.data is None:
+                raise RuntimeError(f"Failed to fetch transactions: {result.error}")
+            page = result.data
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor_value, cursor_id = page[-1]["date"], page[-1]["id"]
 
     # Get Monthly Transactions
     def get_monthly_transactions(self, user_id, year, month):
@@ -157,13 +342,80 @@ class DatabaseManager:
         else:
             end_date = f"{year}-{month + 1:02d}-01"
         
-        result = self.supabase.table("transactions").select("*").eq("user_id", user_id).gte("date", start_date).lt("date", end_date).execute()
-        return self._convert_dates_to_strings(result)
+        return self.supabase.table("transactions").select("*").eq("user_id", user_id).gte("date", start_date).lt("date", end_date).execute()
     
     # Delete Transaction
     def delete_transaction(self, transaction_id):
         return self.supabase.table("transactions").delete().eq("id", transaction_id).execute()
 
+    #-----------------------------------------
+    #-----------Monthly Rollups---------------
+    #-----------------------------------------
+    # Rows are kept current by the transactions_rollup trigger (see README),
+    # so every add/update/delete of a transaction updates its bucket incrementally.
+
+    # Get Monthly Rollups
+    def get_monthly_rollups(self, user_id, month):
+        """Get the (category_id, type) -> total/count buckets of one user for one month"""
+        month = month.isoformat() if isinstance(month, (date, datetime)) else month
+        return self.supabase.table("monthly_rollups") \
+            .select("category_id,type,total,txn_count") \
+            .eq("user_id", user_id) \
+            .eq("month", month) \
+            .execute()
+
+    # Get Rollups in Range
+    def get_rollups_in_range(self, user_id, start_month, end_month, t_type=None):
+        """Get a user's rollup buckets for months in [start_month, end_month)"""
+        query = self.supabase.table("monthly_rollups") \
+            .select("month,category_id,type,total,txn_count") \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month)
+        if t_type:
+            query = query.eq("type", t_type)
+        return query.execute()
+
+    #-----------------------------------------
+    #-----------Budget Utilization------------
+    #-----------------------------------------
+    # One row per (user, month, category) with a budget, kept current by the
+    # budgets and monthly_rollups triggers (see README) in the same statement as
+    # every budget and transaction write.
+    UTILIZATION_COLUMNS = "user_id,month,category_id,budget_amount,spent_amount,percentage_used,exceeded"
+
+    @staticmethod
+    def _after_utilization_cursor(query, cursor_user_id, cursor_category_id):
+        """Keyset filter: rows strictly after (user_id, category_id), with null categories first"""
+        if cursor_user_id is None:
+            return query
+        if cursor_category_id is None:
+            return query.or_(f"user_id.gt.{cursor_user_id},and(user_id.eq.{cursor_user_id},category_id.not.is.null)")
+        return query.or_(f"user_id.gt.{cursor_user_id},and(user_id.eq.{cursor_user_id},category_id.gt.{cursor_category_id})")
+
+    # Get Budget Utilization
+    def get_budget_utilization(self, user_id, start_month, end_month):
+        """Get a user's budget vs spend rows for months in [start_month, end_month)"""
+        return self.supabase.table("budget_utilization") \
+            .select(self.UTILIZATION_COLUMNS) \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month) \
+            .order("month") \
+            .execute()
+
+    # Get Exceeded Budgets
+    def get_exceeded_budgets(self, month, limit=1000, cursor_user_id=None, cursor_category_id=None):
+        """One page of the month's exceeded budgets across all users, in (user_id, category_id)
+        order; the cursor is the last row of the previous page"""
+        month = month.isoformat() if isinstance(month, (date, datetime)) else month
+        query = self.supabase.table("budget_utilization") \
+            .select(self.UTILIZATION_COLUMNS) \
+            .eq("month", month) \
+            .eq("exceeded", True)
+        query = self._after_utilization_cursor(query, cursor_user_id, cursor_category_id)
+        return query.order("user_id").order("category_id", nullsfirst=True).limit(limit).execute()
+
     #-------------------------------------
     #-----------Budgets Table-------------
     #-------------------------------------
@@ -181,24 +433,28 @@ class DatabaseManager:
             "month": month.isoformat() if isinstance(month, (date, datetime)) else month
         }
         
-        result = self.supabase.table("budgets").insert(budget_data).execute()
-        
-        return self._convert_dates_to_strings(result)
+        return self.supabase.table("budgets").insert(budget_data).execute()
 
     # Get All Budgets
     def get_all_budgets(self, user_id=None):
         query = self.supabase.table("budgets").select("*")
         if user_id:
             query = query.eq("user_id", user_id)
-        result = query.execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+        return query.execute()
+
+    # Get Budgets in Range
+    def get_budgets_in_range(self, user_id, start_month, end_month):
+        """Get a user's budgets for months in [start_month, end_month)"""
+        return self.supabase.table("budgets") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .gte("month", start_month.isoformat() if isinstance(start_month, (date, datetime)) else start_month) \
+            .lt("month", end_month.isoformat() if isinstance(end_month, (date, datetime)) else end_month) \
+            .execute()
 
     # Get Budget by ID
     def get_budget_by_id(self, budget_id):
-        result = self.supabase.table("budgets").select("*").eq("id", budget_id).execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+        return self.supabase.table("budgets").select("*").eq("id", budget_id).execute()
 
     # Update Budget
     def update_budget(self, budget_id, category_id=None, amount=None, month=None):
@@ -210,15 +466,11 @@ class DatabaseManager:
         if month:
             update_data["month"] = month
         
-        result = self.supabase.table("budgets").update(update_data).eq("id", budget_id).execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+        return self.supabase.table("budgets").update(update_data).eq("id", budget_id).execute()
 
     # Delete Budget
     def delete_budget(self, budget_id):
-        result = self.supabase.table("budgets").delete().eq("id", budget_id).execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+        return self.supabase.table("budgets").delete().eq("id", budget_id).execute()
 
     #-------------------------------------------
     #-----------Saving Goals Table---------------
@@ -243,9 +495,7 @@ class DatabaseManager:
         query = self.supabase.table("savings_goals").select("*")
         if user_id:
             query = query.eq("user_id", user_id)
-        result = query.execute()
-        
-        return self._convert_dates_to_strings(result)  # CALL HELPER HERE
+        return query.execute()
 
     # Get Saving Goal by ID
     def get_saving_goal_by_id(self, goal_id):
@@ -266,6 +516,17 @@ class DatabaseManager:
             update_data["status"] = status
         return self.supabase.table("savings_goals").update(update_data).eq("id", goal_id).execute()
 
+    # Add to Saving Goal (atomic, server-side)
+    def add_to_saving_goal(self, goal_id, delta):
+        """saved_amount = max(saved_amount + delta, 0) in one UPDATE (add_to_saving_goal SQL function, see README),
+        so concurrent contributions are never lost"""
+        return self.supabase.rpc("add_to_saving_goal", {"goal_id": goal_id, "delta": delta}).execute()
+
+    # Add to many Saving Goals in one call
+    def add_to_saving_goals(self, contributions):
+        """contributions: [{"goal_id": ..., "delta": ...}]; one atomic UPDATE for all goals"""
+        return self.supabase.rpc("add_to_saving_goals", {"contributions": contributions}).execute()
+
     # Delete Saving Goal
     def delete_saving_goal(self, goal_id):
         return self.supabase.table("savings_goals").delete().eq("id", goal_id).execute()
\ No newline at end of file
@@ -0,0 +1,32 @@
+# src/exporter.py
+# Encoders for streaming a user's transactions out as CSV or NDJSON.
+# Rows are encoded one page at a time so the server never holds the full export.
+import csv
+import io
+import json
+
+EXPORT_COLUMNS = ("id", "date", "type", "amount", "category_id", "description", "receipt_url")
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def csv_header():
+    return ",".join(EXPORT_COLUMNS) + "\r\n"
+
+
+def encode_csv(rows):
+    """Encode a page of transaction dicts as CSV lines (no header)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([row.get(column) for column in EXPORT_COLUMNS] for row in rows)
+    return buffer.getvalue()
+
+
+def encode_ndjson(rows):
+    """Encode a page of transaction dicts as newline-delimited JSON."""
+    return "".join(
+        json.dumps({column: row.get(column) for column in EXPORT_COLUMNS}, default=str) + "\n"
+        for row in rows
+    )
@@ -0,0 +1,314 @@
+# src/importer.py
+# Streaming bank-statement importer.
+#
+#   parse (CSV / OFX) -> normalize -> map categories -> dedupe -> chunked batch insert
+#
+# Every stage is a generator, so only one chunk of rows (plus a bounded dedupe
+# window and one page of stored rows) is held in memory whatever the size of the
+# statement or of the user's history.
+import csv
+import hashlib
+import io
+import re
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+from src.logic import TransactionLogic, CategoryLogic
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y%m%d")
+MAX_REPORTED_ERRORS = 100
+
+# Header aliases (lower-case) -> canonical field
+CSV_COLUMNS = {
+    "date": "date", "transaction date": "date", "posted date": "date", "value date": "date",
+    "amount": "amount", "transaction amount": "amount",
+    "debit": "debit", "withdrawal": "debit", "withdrawals": "debit",
+    "credit": "credit", "deposit": "credit", "deposits": "credit",
+    "description": "description", "narration": "description", "details": "description",
+    "memo": "description", "payee": "description", "name": "description",
+    "category": "category", "type": "type", "id": "fitid", "reference": "fitid", "fitid": "fitid",
+}
+
+
+class ImportRowError(ValueError):
+    """A statement row that cannot be imported (bad date, amount, category...)."""
+
+
+#----------Parse----------
+def parse_csv(text_stream):
+    """Yield (line_number, raw record) from a CSV statement, mapping known header aliases."""
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    fields = [CSV_COLUMNS.get(h.strip().lower(), h.strip().lower()) for h in header]
+    for line_number, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield line_number, dict(zip(fields, values))
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)")
+
+
+def parse_ofx(text_stream):
+    """Yield (line_number, raw record) for each <STMTTRN> of an OFX/QFX statement.
+    Handles both SGML (unclosed tags) and XML flavours, line by line."""
+    record = None
+    for line_number, line in enumerate(text_stream, start=1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            if tag == "STMTTRN":
+                if closing:
+                    if record is not None:
+                        yield line_number, record
+                    record = None
+                else:
+                    record = {}
+            elif record is not None and not closing and value.strip():
+                record[tag] = value.strip()
+
+
+def _ofx_record(record):
+    """Map OFX STMTTRN fields onto the CSV field names used by normalize()."""
+    description = record.get("NAME") or ""
+    if record.get("MEMO"):
+        description = f"{description} {record['MEMO']}".strip()
+    return {
+        "date": record.get("DTPOSTED", "")[:8],
+        "amount": record.get("TRNAMT", ""),
+        "description": description,
+        "fitid": record.get("FITID"),
+    }
+
+
+#----------Normalize----------
+def parse_date(value):
+    value = (value or "").strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise ImportRowError(f"Unrecognised date: {value!r}")
+
+
+def parse_amount(value):
+    """'1,234.50', '₹ 99', '(12.00)', '-5' -> float (parentheses mean negative)."""
+    text = (value or "").strip()
+    negative = text.startswith("(") and text.endswith(")")
+    text = re.sub(r"[^0-9.\-]", "", text)
+    if not text or text in ("-", "."):
+        raise ImportRowError(f"Unrecognised amount: {value!r}")
+    try:
+        amount = float(text)
+    except ValueError:
+        raise ImportRowError(f"Unrecognised amount: {value!r}")
+    return -abs(amount) if negative else amount
+
+
+def normalize(record):
+    """Raw statement record -> dict with date, type, amount (> 0), description, category, fitid."""
+    if record.get("amount", "").strip():
+        signed = parse_amount(record["amount"])
+    elif record.get("debit", "").strip():
+        signed = -abs(parse_amount(record["debit"]))
+    elif record.get("credit", "").strip():
+        signed = abs(parse_amount(record["credit"]))
+    else:
+        raise ImportRowError("Missing amount")
+    if signed == 0:
+        raise ImportRowError("Zero amount")
+
+    t_type = (record.get("type") or "").strip().lower()
+    if t_type in ("debit", "dr", "withdrawal"):
+        t_type = "expense"
+    elif t_type in ("credit", "cr", "deposit"):
+        t_type = "income"
+    elif t_type not in ("income", "expense"):
+        t_type = "expense" if signed < 0 else "income"
+
+    return {
+        "date": parse_date(record.get("date")),
+        "type": t_type,
+        "amount": round(abs(signed), 2),
+        "description": (record.get("description") or "").strip() or None,
+        "category": (record.get("category") or "").strip(),
+        "fitid": record.get("fitid") or None,
+    }
+
+
+def _fingerprint(t_date, t_type, amount, description):
+    key = f"{t_date}|{t_type}|{amount:.2f}|{(description or '').lower()}"
+    return hashlib.blake2b(key.encode(), digest_size=8).digest()
+
+
+class StatementImporter:
+    """
+    Imports one user's bank statement through the Logic layer.
+    Usage: StatementImporter(user_id).import_file(fileobj, "csv") -> stats dict
+    """
+    def __init__(self, user_id, default_category_id=None, chunk_size=500, dedupe_window=100_000,
+                 transaction_logic=None, category_logic=None):
+        self.user_id = user_id
+        self.default_category_id = default_category_id
+        self.chunk_size = chunk_size
+        self.dedupe_window = dedupe_window
+        self.transaction_logic = transaction_logic or TransactionLogic()
+        self.category_logic = category_logic or CategoryLogic()
+
+    def import_file(self, fileobj, fmt="csv", encoding="utf-8-sig"):
+        """Run the whole pipeline over a text or binary file object; returns import stats."""
+        if isinstance(fileobj, io.TextIOBase):
+            text_stream = fileobj
+        else:
+            text_stream = io.TextIOWrapper(fileobj, encoding=encoding, errors="replace", newline="")
+
+        stats = {"rows_read": 0, "inserted": 0, "duplicates": 0, "failed": 0, "errors": []}
+        started = time.perf_counter()
+        rows = self._parsed(text_stream, fmt)
+        rows = self._normalized(rows, stats)
+        rows = self._mapped(rows, stats)
+        rows = self._deduped(rows, stats)
+        claimed = OrderedDict()
+        for chunk in self._chunks(rows):
+            self._insert(chunk, stats, claimed)
+        if text_stream is not fileobj:
+            text_stream.detach()  # leave the caller's file open
+
+        stats["seconds"] = round(time.perf_counter() - started, 3)
+        stats["rows_per_sec"] = round(stats["rows_read"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+        stats["Success"] = stats["failed"] == 0
+        return stats
+
+    #----------Pipeline stages----------
+    def _parsed(self, text_stream, fmt):
+        fmt = (fmt or "csv").lower()
+        if fmt == "csv":
+            yield from parse_csv(text_stream)
+        elif fmt in ("ofx", "qfx"):
+            for line_number, record in parse_ofx(text_stream):
+                yield line_number, _ofx_record(record)
+        else:
+            raise ValueError(f"Unsupported statement format: {fmt}")
+
+    def _normalized(self, records, stats):
+        for line_number, record in records:
+            stats["rows_read"] += 1
+            try:
+                yield line_number, normalize(record)
+            except ImportRowError as e:
+                self._fail(stats, line_number, str(e))
+
+    def _mapped(self, records, stats):
+        categories = self.category_logic.fetch_all_categories()
+        name_to_id = {c["name"].strip().lower(): c["id"] for c in categories["data"]} if categories["Success"] else {}
+        for line_number, row in records:
+            category_id = name_to_id.get(row.pop("category").lower()) or self.default_category_id
+            if not category_id:
+                self._fail(stats, line_number, "No matching category and no default category")
+                continue
+            row["category_id"] = category_id
+            yield line_number, row
+
+    def _deduped(self, records, stats):
+        """Drop repeated FITIDs within the file (bounded LRU window). Rows without a FITID are
+        never dropped here: identical same-day rows are separate transactions."""
+        seen = OrderedDict()
+        for line_number, row in records:
+            fitid = row["fitid"]
+            if fitid:
+                if fitid in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen[fitid] = None
+                if len(seen) > self.dedupe_window:
+                    seen.popitem(last=False)
+            yield line_number, row
+
+    def _chunks(self, records):
+        chunk = []
+        for item in records:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _insert(self, chunk, stats, claimed):
+        """Skip rows already stored (earlier imports of an overlapping statement), then batch insert.
+        A fingerprint stored n times skips at most n rows; `claimed` counts the stored rows this
+        import has already matched or inserted, so they are not matched a second time."""
+        keys = [_fingerprint(row["date"], row["type"], row["amount"], row["description"]) for _, row in chunk]
+        existing = self._existing_counts(set(keys), min(r["date"] for _, r in chunk), max(r["date"] for _, r in chunk))
+        if existing is None:
+            # without the stored rows duplicates cannot be told apart, so insert nothing
+            for line_number, _ in chunk:
+                self._fail(stats, line_number, "Could not check for existing transactions.")
+            return
+        fresh = []
+        for key, (line_number, row) in zip(keys, chunk):
+            if existing[key] > claimed.get(key, 0):
+                self._claim(claimed, key)
+                stats["duplicates"] += 1
+            else:
+                fresh.append((key, line_number, row))
+        if not fresh:
+            return
+
+        result = self.transaction_logic.create_transactions_bulk([{
+            "user_id": self.user_id,
+            "category_id": row["category_id"],
+            "type": row["type"],
+            "amount": row["amount"],
+            "description": row["description"],
+            "date": row["date"].isoformat(),
+        } for _, _, row in fresh], chunk_size=self.chunk_size)
+        stats["inserted"] += result.get("inserted", 0)
+        failed = set()
+        for error in result.get("errors", []):
+            failed.add(error["index"])
+            self._fail(stats, fresh[error["index"]][1], error["message"])
+        for index, (key, _, _) in enumerate(fresh):
+            if index not in failed:
+                self._claim(claimed, key)
+
+    def _existing_counts(self, keys, first_date, last_date):
+        """How often each fingerprint in keys is already stored between first_date and last_date,
+        or None if the stored rows cannot be read. Rows are streamed a page at a time and only
+        the chunk's fingerprints are counted, so a long date span costs reads, not memory."""
+        counts = Counter()
+        try:
+            for t in self.transaction_logic.iter_user_transactions(
+                self.user_id,
+                start_date=first_date.isoformat(),
+                end_date=(last_date + timedelta(days=1)).isoformat(),
+                columns="date,type,amount,description"
+            ):
+                key = _fingerprint(parse_date(str(t["date"])[:10]), t["type"], float(t["amount"]), t["description"])
+                if key in keys:
+                    counts[key] += 1
+        except Exception:
+            return None
+        return counts
+
+    def _claim(self, claimed, key):
+        claimed[key] = claimed.pop(key, 0) + 1
+        if len(claimed) > self.dedupe_window:
+            claimed.popitem(last=False)
+
+    @staticmethod
+    def _fail(stats, line_number, message):
+        stats["failed"] += 1
+        if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+            stats["errors"].append({"line": line_number, "message": message})
+
+
+def detect_format(filename):
+    """'statement.OFX' -> 'ofx'; anything unknown is treated as CSV."""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    return extension if extension in ("csv", "ofx", "qfx") else "csv"
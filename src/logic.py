@@ -1,14 +1,302 @@
 # src/logic.py
-from src.db import DatabaseManager
-from datetime import date, datetime
+from src.db import TRANSACTION_SORTS, get_db, setting
+from src.cache import TTLCache, ReferenceCache, DataVersions
+from datetime import date, datetime, timedelta
+import base64
+import json
+import weakref
+
+# Signed-in auth user id -> users row, so repeat logins skip the profile lookup
+_profile_cache = TTLCache(ttl=300, maxsize=10000)
+
+# Database manager -> category ReferenceCache (categories change rarely and are read on every page)
+_category_caches = weakref.WeakKeyDictionary()
+
+
+def _category_cache_ttl():
+    return int(setting("FINTRACK_CATEGORY_CACHE_TTL", "600"))
+
+# Per-user write counters; caches of Logic results key on them (see frontend/cached_logic.py)
+data_versions = DataVersions()
+
+
+def data_version(user_id=None):
+    """Opaque value that changes whenever a write may have changed what user_id sees."""
+    return data_versions.get(user_id)
+
+
+def _bump_versions(result=None, user_id=None):
+    """Record a write: bump user_id, else the user of every row the write returned,
+    else the shared version (which invalidates every user)."""
+    if user_id is not None:
+        data_versions.bump(user_id)
+        return
+    rows = getattr(result, "data", None) or []
+    user_ids = {row.get("user_id") for row in rows if isinstance(row, dict)} - {None}
+    if not user_ids:
+        data_versions.bump()
+    for uid in user_ids:
+        data_versions.bump(uid)
+
+
+def _month_start(month=None):
+    """Normalize None / date / 'YYYY-MM' / 'YYYY-MM-DD' to the first day of that month.
+    Raises ValueError for anything else."""
+    if month is None:
+        month = date.today()
+    elif isinstance(month, str):
+        try:
+            if len(month) == 7:  # YYYY-MM
+                month = datetime.strptime(month + '-01', '%Y-%m-%d').date()
+            elif len(month) >= 10:  # YYYY-MM-DD (time part ignored)
+                month = datetime.strptime(month[:10], '%Y-%m-%d').date()
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError("Invalid month format. Use YYYY-MM-DD or YYYY-MM")
+    elif not isinstance(month, date):
+        raise ValueError("Month must be a date object.")
+    return date(month.year, month.month, 1)
+
+
+def _next_month(month):
+    """First day of the month after the given first-of-month date."""
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def _analysis_months(start_month=None, end_month=None, months=12):
+    """(first month, last month) of an analysis window; defaults to the last `months` months."""
+    end_month = _month_start(end_month)
+    if start_month is not None:
+        start_month = _month_start(start_month)
+    else:
+        index = end_month.year * 12 + end_month.month - months  # months since year 0, zero-based
+        start_month = date(index // 12, index % 12 + 1, 1)
+    if end_month < start_month:
+        raise ValueError("end_month must not be before start_month.")
+    return start_month, end_month
+
+
+def _spending_analysis(frame, utilization, start_month, end_month):
+    """Trend and category totals of one window from one frame, with its budget_utilization rows."""
+    return {
+        "start_month": start_month.isoformat(),
+        "end_month": end_month.isoformat(),
+        "trend": frame.monthly_trend(start_month, end_month),
+        "summary": frame.summary(),
+        "budgets": _utilization_by_month(utilization),
+    }
+
+
+TRANSACTION_TYPES = ("income", "expense")
+TIMESERIES_BUCKETS = ("day", "week", "month")
+TIMESERIES_GROUPS = ("type", "category")
+MAX_TIMESERIES_BUCKETS = 1000
+
+
+def _to_date(value):
+    """None / date / 'YYYY-MM-DD' (time part ignored) -> date. Raises ValueError for anything else."""
+    if value is None or isinstance(value, date):
+        return value.date() if isinstance(value, datetime) else value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _timeseries_window(start_date, end_date, bucket, group_by, t_type):
+    """Validated (first day, last day) of a time series, both inclusive; defaults to the
+    last 12 months. Raises ValueError for a bad bucket / group / type or too many buckets."""
+    if bucket not in TIMESERIES_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(TIMESERIES_BUCKETS)}.")
+    if group_by not in TIMESERIES_GROUPS:
+        raise ValueError(f"group_by must be one of {', '.join(TIMESERIES_GROUPS)}.")
+    if t_type is not None and t_type not in TRANSACTION_TYPES:
+        raise ValueError("Type must be either 'income' or 'expense'.")
+    try:
+        end_date = _to_date(end_date) or date.today()
+        start_date = _to_date(start_date) or _analysis_months(None, end_date)[0]
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    if end_date < start_date:
+        raise ValueError("'to' must not be before 'from'.")
+    days = (end_date - start_date).days + 1
+    buckets = {"day": days, "week": days / 7,
+               "month": (end_date.year - start_date.year) * 12 + end_date.month - start_date.month}
+    if buckets[bucket] > MAX_TIMESERIES_BUCKETS:
+        raise ValueError(f"At most {MAX_TIMESERIES_BUCKETS} buckets per request; use a larger bucket or a shorter range.")
+    return start_date, end_date
+
+
+def _timeseries(frame, start_date, end_date, bucket, group_by, t_type, id_to_name):
+    """Bucketed series of one window; category series get a display name."""
+    if group_by == "category":
+        t_type = t_type or "expense"
+    series = frame.timeseries(start_date, end_date, bucket, group_by, t_type)
+    series["series"] = [
+        {"key": line["key"],
+         "name": id_to_name.get(line["key"], "Uncategorized") if group_by == "category" else line["key"],
+         "y": line["y"]}
+        for line in series["series"]
+    ]
+    return {"bucket": bucket, "group_by": group_by, "type": t_type,
+            "from": start_date.isoformat(), "to": end_date.isoformat(), **series}
+
+
+def _sort_tag(sort_by, descending):
+    """Extra cursor fields naming a non-default order, so a token only resumes the order it came from"""
+    return [] if (sort_by, descending) == ("date", True) else [sort_by, "desc" if descending else "asc"]
+
+
+def _encode_cursor(row, sort_by="date", descending=True):
+    """Opaque next-page token for the (sort_by, id) keyset position of a row."""
+    value = str(row["date"]) if sort_by == "date" else row[sort_by]
+    raw = json.dumps([value, str(row["id"]), *_sort_tag(sort_by, descending)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor, sort_by="date", descending=True):
+    """Token from _encode_cursor -> (sort value, id); (None, None) for no cursor.
+    Raises ValueError if malformed or made for another order."""
+    if not cursor:
+        return None, None
+    try:
+        value, cursor_id, *tag = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if tag != _sort_tag(sort_by, descending):
+            raise ValueError
+        if sort_by == "date":
+            datetime.fromisoformat(value)
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError
+        if not str(cursor_id).replace("-", "").isalnum():
+            raise ValueError
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    return value, cursor_id
+
+
+def _page(rows, limit, sort_by="date", descending=True):
+    """Page result with the opaque cursor of the last row, or None when this is the last page."""
+    next_cursor = _encode_cursor(rows[-1], sort_by, descending) if len(rows) == limit else None
+    return {"Success": True, "data": rows, "next_cursor": next_cursor}
+
+
+def _clean_transaction_row(row):
+    """Validate one incoming transaction dict and return (db_row, None) or (None, error message).
+    Every db_row has the same keys so a batch can go out as one multi-row INSERT."""
+    user_id = row.get("user_id")
+    category_id = row.get("category_id")
+    t_type = row.get("type", row.get("t_type"))
+    amount = row.get("amount")
+    if not user_id or not category_id or not t_type or not amount:
+        return None, "User ID, Category ID, Type, and Amount are required."
+    if t_type not in TRANSACTION_TYPES:
+        return None, f"Type must be one of {', '.join(TRANSACTION_TYPES)}."
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return None, "Amount must be a number."
+    if amount <= 0:
+        return None, "Amount must be greater than 0."
+
+    t_date = row.get("date")
+    if isinstance(t_date, (date, datetime)):
+        t_date = t_date.isoformat()
+    elif t_date:
+        try:
+            datetime.fromisoformat(str(t_date))
+        except ValueError:
+            return None, "Date must be an ISO format date string."
+    else:
+        t_date = datetime.now().isoformat()
+
+    return {
+        "user_id": user_id,
+        "category_id": category_id,
+        "type": t_type,
+        "amount": amount,
+        "description": row.get("description") or None,
+        "date": t_date,
+        "receipt_url": row.get("receipt_url") or None
+    }, None
+
+
+def _split_valid_rows(transactions):
+    """Validate a batch in one pass: (db rows, their input positions, per-row errors)."""
+    rows, positions, errors = [], [], []
+    for index, row in enumerate(transactions):
+        clean, error = _clean_transaction_row(row)
+        if error:
+            errors.append({"index": index, "message": error})
+        else:
+            rows.append(clean)
+            positions.append(index)
+    return rows, positions, errors
+
+
+def _merge_contributions(contributions):
+    """{goal_id: delta} or [{"goal_id", "delta"}] -> ([{"goal_id", "delta"}] one per goal, error).
+    Deltas for the same goal are summed; goals whose deltas cancel out are dropped."""
+    items = contributions.items() if isinstance(contributions, dict) else (
+        (c.get("goal_id"), c.get("delta")) for c in contributions or []
+    )
+    merged = {}
+    for goal_id, delta in items:
+        if not goal_id:
+            return None, "Each contribution needs a goal_id."
+        try:
+            delta = float(delta)
+        except (TypeError, ValueError):
+            return None, "Contribution amounts must be numbers."
+        merged[goal_id] = merged.get(goal_id, 0.0) + delta
+    return [{"goal_id": g, "delta": round(d, 2)} for g, d in merged.items() if round(d, 2) != 0], None
+
+
+def _summarize_rollups(month, buckets):
+    """Fold one month's rollup buckets into income/expense/per-category totals."""
+    summary = {
+        "month": month.isoformat(),
+        "income": 0,
+        "expense": 0,
+        "transaction_count": 0,
+        "income_by_category": {},
+        "expense_by_category": {}
+    }
+    for bucket in buckets:
+        t_type = bucket["type"]
+        if t_type not in ("income", "expense"):
+            continue
+        summary[t_type] += bucket["total"]
+        summary["transaction_count"] += bucket["txn_count"]
+        by_category = summary[f"{t_type}_by_category"]
+        by_category[bucket["category_id"]] = by_category.get(bucket["category_id"], 0) + bucket["total"]
+    summary["balance"] = summary["income"] - summary["expense"]
+    return summary
+
+
+def _utilization_row(row):
+    """One budget_utilization row as a budget-vs-spend result."""
+    return {
+        'category_id': row['category_id'],
+        'budget_amount': row['budget_amount'],
+        'spent_amount': row['spent_amount'],
+        'remaining_amount': row['budget_amount'] - row['spent_amount'],
+        'exceeded': bool(row['exceeded']),
+        'percentage_used': row['percentage_used']
+    }
+
+
+def _utilization_by_month(rows):
+    """Group budget_utilization rows by month: {"YYYY-MM-01": [per-category results]}."""
+    results = {}
+    for row in rows:
+        results.setdefault(f"{str(row['month'])[:7]}-01", []).append(_utilization_row(row))
+    return results
 
 class UserLogic:
     """
     Acts as a bridge between frontend (Streamlit/FastAPI) and the database.
     """
-    def __init__(self):
-        #Create a databse manager instance (this will handle all the db operations)
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        # Shared, pooled database manager (pass one explicitly to use a different backend)
+        self.db = db or get_db()
 
     #----------Create----------
     def create_user(self, email, name):
@@ -20,6 +308,7 @@ class UserLogic:
         
         #Call DB method to add user
         result = self.db.add_user(email, name)
+        _bump_versions()
         # Handle Supabase insert response
         if isinstance(result, dict):  # duplicate or error caught
             return result
@@ -45,10 +334,32 @@ class UserLogic:
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
     
+    def fetch_user_by_email(self, email, auth_user_id=None):
+        """ Fetch one user profile by email with a single indexed lookup.
+        data is the user row itself. When auth_user_id is given the profile is
+        cached against it for a few minutes."""
+        if not email:
+            return {"Success": False, "message": "Email is required."}
+        if auth_user_id:
+            cached = _profile_cache.get(auth_user_id)
+            if cached is not None and cached["email"] == email:
+                return {"Success": True, "data": cached}
+
+        result = self.db.get_user_by_email(email)
+        if result.data:
+            profile = result.data[0]
+            if auth_user_id:
+                _profile_cache.set(auth_user_id, profile)
+            return {"Success": True, "data": profile}
+        else:
+            return {"Success": False, "message": "User not found."}
+
     #---------Update----------
     def modify_user(self, user_id, email=None, name=None):
         """ Update user details in the database."""
         result = self.db.update_user(user_id, email, name)
+        _profile_cache.invalidate_where(lambda profile: profile["id"] == user_id)
+        _bump_versions()
         if result.data:
             return {"Success": True, "message": "User updated Successfully!"}
         else:
@@ -58,20 +369,40 @@ class UserLogic:
     def remove_user(self, user_id):
         """ Delete a user from the database."""
         result = self.db.delete_user(user_id)
+        _profile_cache.invalidate_where(lambda profile: profile["id"] == user_id)
+        _bump_versions()
         if result.data:
             return {"Success": True, "message": "User deleted Successfully!"}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
 
 class CategoryLogic:
-    def __init__(self):
-        #Create a databse manager instance (this will handle all the db operations)
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    @property
+    def _cache(self):
+        """ Category snapshot cache for this logic's database (one per backend)."""
+        cache = _category_caches.get(self.db)
+        if cache is None:
+            cache = _category_caches.setdefault(self.db, ReferenceCache(ttl=_category_cache_ttl()))
+        return cache
+
+    def _load_categories(self):
+        result = self.db.get_all_categories()
+        if result.data is None:
+            raise RuntimeError(result.error)
+        return result.data
+
+    def _snapshot(self):
+        return self._cache.get(self._load_categories)
         
     #----------Create----------
     def create_category(self, name):
         """ Add a new category to the database."""
         result = self.db.add_category(name)
+        self._cache.invalidate()
+        _bump_versions()
         if result.data:
             return {"Success": True, "message": "Category added successfully!", "data": result.data}
         else:
@@ -79,25 +410,40 @@ class CategoryLogic:
     
     #---------Read----------
     def fetch_all_categories(self):
-        """ Fetch all categories from the database."""
-        result = self.db.get_all_categories()
-        if result.data is not None:
-            return {"Success": True, "data": result.data}
-        else:
-            return {"Success": False, "message": f"Error: {result.error}"}
+        """ Fetch all categories (served from the category cache)."""
+        try:
+            return {"Success": True, "data": self._snapshot().rows}
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
     
     def fetch_category_by_id(self, category_id):
-        """ Fetch a category by ID from the database."""
+        """ Fetch a category by ID, from the category cache when it is there."""
+        try:
+            category = self._snapshot().by_id.get(category_id)
+        except Exception:
+            category = None
+        if category is not None:
+            return {"Success": True, "data": [category]}
         result = self.db.get_category_by_id(category_id)
         if result.data:
             return {"Success": True, "data": result.data}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
+
+    def get_category_maps(self):
+        """ Prebuilt lookups: data = {"name_to_id": {...}, "id_to_name": {...}}. Read-only."""
+        try:
+            snapshot = self._snapshot()
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": {"name_to_id": snapshot.name_to_id, "id_to_name": snapshot.id_to_name}}
     
     #---------Update----------
     def modify_category(self, category_id, updated_name):
         """ Update category details in the database."""
         result = self.db.update_category(category_id, updated_name)
+        self._cache.invalidate()
+        _bump_versions()
         if result.data:
             return {"Success": True, "message": "Category updated Successfully!"}
         else:
@@ -107,15 +453,16 @@ class CategoryLogic:
     def remove_category(self, category_id):
         """ Delete a category from the database."""
         result = self.db.delete_category(category_id)
+        self._cache.invalidate()
+        _bump_versions()
         if result.data:
             return {"Success": True, "message": "Category deleted Successfully!"}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}        
 
 class TransactionLogic:
-    def __init__(self):
-        # Create a database manager instance (handles all DB operations)
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        self.db = db or get_db()
 
     #----------Create----------
     def create_transaction(self, user_id, category_id, t_type, amount, description=None, date=None, receipt_url=None):
@@ -124,20 +471,153 @@ class TransactionLogic:
             return {"Success": False, "message": "User ID, Category ID, Type, and Amount are required."}
         
         result = self.db.add_transaction(user_id, category_id, t_type, amount, description, date, receipt_url)
+        _bump_versions(user_id=user_id)
         if result.data:
             return {"Success": True, "data": result.data}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
 
+    def create_transactions_bulk(self, transactions, chunk_size=500):
+        """ Validate and insert many transactions with chunked multi-row inserts.
+        Invalid rows are skipped; errors are reported per row with its index in `transactions`. """
+        if not transactions:
+            return {"Success": False, "message": "No transactions given.", "inserted": 0, "errors": []}
+
+        rows, positions, errors = _split_valid_rows(transactions)
+        inserted = 0
+        if rows:
+            result = self.db.add_transactions_batch(rows, chunk_size=chunk_size)
+            inserted = result["inserted"]
+            for uid in {row["user_id"] for row in rows}:
+                _bump_versions(user_id=uid)
+            errors.extend({"index": positions[e["index"]], "message": e["message"]} for e in result["errors"])
+        errors.sort(key=lambda e: e["index"])
+        return {"Success": not errors, "inserted": inserted, "errors": errors}
+
     #---------Read----------
-    def fetch_all_transactions(self, limit=100, offset=0):
-        """ Fetch all transactions from the database. """
-        result = self.db.get_all_transactions(limit=limit, offset=offset)
+    def fetch_all_transactions(self, limit=100, cursor=None):
+        """ Fetch the newest transactions across all users, one keyset page at a time.
+        Pass back next_cursor to get the following page. """
+        try:
+            cursor_date, cursor_id = _decode_cursor(cursor)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        result = self.db.get_all_transactions(limit=limit, cursor_date=cursor_date, cursor_id=cursor_id)
         if result.data is not None:
-            return {"Success": True, "data": result.data}
+            return _page(result.data, limit)
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    def fetch_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                                limit=100, cursor=None, sort_by="date", descending=True):
+        """ Fetch one page of a user's transactions, filtered and sorted in the database.
+        sort_by is "date" or "amount"; the default is newest first.
+        next_cursor is an opaque token for the following page, or None on the last page.
+        Pages are keyset-based on (sort_by, id): deep pages cost the same as the first and
+        rows do not shift between pages when new transactions arrive. """
+        if not user_id:
+            return {"Success": False, "message": "User ID is required."}
+        if sort_by not in TRANSACTION_SORTS:
+            return {"Success": False, "message": f"Sort must be one of {', '.join(TRANSACTION_SORTS)}."}
+        try:
+            cursor_value, cursor_id = _decode_cursor(cursor, sort_by, descending)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = self.db.get_user_transactions(
+            user_id,
+            start_date=start_date,
+            end_date=end_date,
+            t_type=t_type,
+            category_id=category_id,
+            limit=limit,
+            cursor_value=cursor_value,
+            cursor_id=cursor_id,
+            sort_by=sort_by,
+            descending=descending
+        )
+        if result.data is not None:
+            return _page(result.data, limit, sort_by, descending)
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
 
+    def fetch_all_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                                    columns="*"):
+        """ Fetch every matching transaction of one user (paged internally with a keyset cursor). """
+        if not user_id:
+            return {"Success": False, "message": "User ID is required."}
+        try:
+            rows = list(self.iter_user_transactions(user_id, start_date, end_date, t_type, category_id, columns))
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": rows}
+
+    def iter_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                               columns="*"):
+        """ Yield every matching transaction of one user, one keyset page in memory at a time.
+        Raises if a page cannot be read. """
+        return self.db.iter_user_transactions(user_id, start_date, end_date, t_type, category_id, columns=columns)
+
+    def get_monthly_summary(self, user_id, month=None):
+        """ Income, expense and per-category totals of one user for one month.
+        Reads the pre-aggregated monthly_rollups buckets, so the cost does not grow
+        with the number of transactions. """
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = self.db.get_monthly_rollups(user_id, month)
+        if result.data is None:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+        return {"Success": True, "data": _summarize_rollups(month, result.data)}
+
+    def get_spending_analysis(self, user_id, start_month=None, end_month=None):
+        """ Monthly income/expense trend, category totals and budget utilization for
+        start_month..end_month (both inclusive, default the last 12 months).
+        Loads the window's transactions once into a columnar TransactionFrame. """
+        try:
+            start_month, end_month = _analysis_months(start_month, end_month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        stop_month = _next_month(end_month)
+
+        utilization = self.db.get_budget_utilization(user_id, start_month, stop_month)
+        if utilization.data is None:
+            return {"Success": False, "message": f"Error: {utilization.error}"}
+        from src.analytics import TransactionFrame  # NumPy is only imported by pages that chart trends
+        try:
+            frame = TransactionFrame.load(self.db, user_id, start_month.isoformat(), stop_month.isoformat())
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": _spending_analysis(frame, utilization.data, start_month, end_month)}
+
+    def get_timeseries(self, user_id, start_date=None, end_date=None, bucket="month", group_by="type", t_type=None):
+        """ Totals per day / week / month bucket from start_date to end_date (both inclusive,
+        default the last 12 months), one series per type or category:
+        data = {"x": [bucket starts], "series": [{"key", "name", "y": [...]}], "count": [...], ...}.
+        Category series cover t_type rows, expense when t_type is None.
+        Buckets are computed in one pass over the window's transactions. """
+        try:
+            start_date, end_date = _timeseries_window(start_date, end_date, bucket, group_by, t_type)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        id_to_name = {}
+        if group_by == "category":
+            maps = CategoryLogic(self.db).get_category_maps()
+            if not maps["Success"]:
+                return maps
+            id_to_name = maps["data"]["id_to_name"]
+
+        from src.analytics import TransactionFrame
+        try:
+            frame = TransactionFrame.load(self.db, user_id, start_date.isoformat(),
+                                          (end_date + timedelta(days=1)).isoformat(), t_type)
+        except Exception as e:
+            return {"Success": False, "message": f"Error: {e}"}
+        return {"Success": True, "data": _timeseries(frame, start_date, end_date, bucket, group_by, t_type, id_to_name)}
+
     def fetch_transaction_by_id(self, transaction_id):
         """ Fetch a transaction by ID from the database. """
         result = self.db.get_transaction_by_id(transaction_id)
@@ -156,6 +636,7 @@ class TransactionLogic:
             amount=amount,
             description=description
         )
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "data": result.data}
         else:
@@ -165,6 +646,7 @@ class TransactionLogic:
     def remove_transaction(self, transaction_id):
         """ Delete a transaction from the database. """
         result = self.db.delete_transaction(transaction_id)
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "message": "Transaction deleted successfully!"}
         else:
@@ -172,62 +654,38 @@ class TransactionLogic:
 
 
 class BudgetsLogic:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, db=None):
+        self.db = db or get_db()
         
     #----------Create----------
     def create_budget(self, user_id, category_id, amount, month=None):
         """
-        Create a new budget for a user and category.
+        Create a new budget for a user and category (month defaults to the current one).
         """
-        # Handle default month
-        if month is None:
-            today = date.today()
-            month = date(today.year, today.month, 1)
-        
-        # Handle string month input (from Streamlit)
-        if isinstance(month, str):
-            try:
-                # Try parsing as YYYY-MM-DD format
-                if len(month) == 10:  # YYYY-MM-DD
-                    month = datetime.strptime(month, '%Y-%m-%d').date()
-                elif len(month) == 7:  # YYYY-MM
-                    month = datetime.strptime(month + '-01', '%Y-%m-%d').date()
-                else:
-                    return {"Success": False, "message": "Invalid month format. Use YYYY-MM-DD or YYYY-MM"}
-            except ValueError as e:
-                return {"Success": False, "message": f"Invalid month format: {str(e)}"}
-        
-        # Ensure month is first day of month
-        if not isinstance(month, date):
-            return {"Success": False, "message": "Month must be a date object."}
-
-        # Ensure month is first day of the month
-        month = date(month.year, month.month, 1)
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
 
         # Call database
         result = self.db.add_budget(user_id, category_id, amount, month)
+        _bump_versions(user_id=user_id)
         if result.data:
             return {"Success": True, "data": result.data}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
 
-    # Also update the modify_budget method
+    #--------Update----------
     def modify_budget(self, budget_id, category_id=None, amount=None, month=None):
         """ Update budget details in the database."""
-        # Handle string month input if provided
-        if month and isinstance(month, str):
+        if month:
             try:
-                if len(month) == 10:  # YYYY-MM-DD
-                    month = datetime.strptime(month, '%Y-%m-%d').date()
-                elif len(month) == 7:  # YYYY-MM
-                    month = datetime.strptime(month + '-01', '%Y-%m-%d').date()
-                # Ensure it's first day of month
-                month = date(month.year, month.month, 1)
-            except ValueError:
-                return {"Success": False, "message": "Invalid month format"}
-        
+                month = _month_start(month)
+            except ValueError as e:
+                return {"Success": False, "message": str(e)}
+
         result = self.db.update_budget(budget_id, category_id, amount, month)
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "message": "Budget updated Successfully!"}
         else:
@@ -255,55 +713,66 @@ class BudgetsLogic:
     def remove_budget(self, budget_id):
         """ Delete a budget from the database."""
         result = self.db.delete_budget(budget_id)
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "message": "Budget deleted Successfully!"}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
         
-     # check budget limits
+    #--------Budget vs Spend----------
     def check_budget_limits(self, user_id, month=None):
         """Check if spending exceeds budget limits for each category"""
-        if month is None:
-            today = date.today()
-            month = date(today.year, today.month, 1)
-        
-        month_str = month.isoformat() if isinstance(month, date) else month
-        
-        # Get all budgets for the user and month
-        budgets = self.db.get_all_budgets(user_id)
-        if not budgets.data:
-            return {"Success": True, "data": []}
-        
-        # Get transactions for the month
-        transactions = self.db.get_monthly_transactions(user_id, month.year, month.month)
-        
-        results = []
-        for budget in budgets.data:
-            if budget['month'].startswith(month_str[:7]):  # Compare YYYY-MM
-                category_id = budget['category_id']
-                budget_amount = budget['amount']
-                
-                # Calculate total expenses for this category in the month
-                category_expenses = sum(
-                    t['amount'] for t in transactions.data 
-                    if t['category_id'] == category_id and t['type'] == 'expense'
-                )
-                
-                results.append({
-                    'category_id': category_id,
-                    'budget_amount': budget_amount,
-                    'spent_amount': category_expenses,
-                    'remaining_amount': budget_amount - category_expenses,
-                    'exceeded': category_expenses > budget_amount,
-                    'percentage_used': (category_expenses / budget_amount * 100) if budget_amount > 0 else 0
-                })
-        
-        return {"Success": True, "data": results}
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        result = self.check_budget_limits_range(user_id, month, month)
+        if not result["Success"]:
+            return result
+        return {"Success": True, "data": result["data"].get(month.isoformat(), [])}
+
+    def check_budget_limits_range(self, user_id, start_month, end_month):
+        """Budget vs spend for every month from start_month to end_month (both inclusive).
+        Returns {"YYYY-MM-01": [per-category results]} for the months that have budgets.
+        A single indexed read of the budget_utilization table, which the database keeps
+        current on every budget and transaction write."""
+        try:
+            start_month = _month_start(start_month)
+            end_month = _month_start(end_month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+        if end_month < start_month:
+            return {"Success": False, "message": "end_month must not be before start_month."}
+
+        result = self.db.get_budget_utilization(user_id, start_month, _next_month(end_month))
+        if result.data is None:
+            return {"Success": False, "message": f"Error: {result.error}"}
+        return {"Success": True, "data": _utilization_by_month(result.data)}
+
+    def fetch_exceeded_budgets(self, month=None, page_size=1000):
+        """Every exceeded budget of one month (default this month) across all users, ordered by
+        user_id, for batch notification jobs. Read page by page from the exceeded index."""
+        try:
+            month = _month_start(month)
+        except ValueError as e:
+            return {"Success": False, "message": str(e)}
+
+        rows, cursor = [], (None, None)
+        while True:
+            page = self.db.get_exceeded_budgets(month, page_size, *cursor)
+            if page.data is None:
+                return {"Success": False, "message": f"Error: {page.error}"}
+            rows.extend({"user_id": row["user_id"], "month": month.isoformat(), **_utilization_row(row)}
+                        for row in page.data)
+            if len(page.data) < page_size:
+                return {"Success": True, "data": rows}
+            cursor = (page.data[-1]["user_id"], page.data[-1]["category_id"])
 
 
 class SavingGoalsLogic:
-    def __init__(self):       
-        self.db = DatabaseManager()     
+    def __init__(self, db=None):
+        self.db = db or get_db()
     
     #----------Create----------
     def create_saving_goal(self, user_id, name, target_amount, saved_amount=0.0, deadline=None, status="active"):
@@ -315,6 +784,7 @@ class SavingGoalsLogic:
             target_date=deadline,  # 👈 maps API "deadline" to DB "target_date"
             status=status
         )
+        _bump_versions(user_id=user_id)
         if result.data:
             return {"Success": True, "data": result.data}
         else:
@@ -341,15 +811,47 @@ class SavingGoalsLogic:
     def modify_saving_goal(self, goal_id, name=None, target_amount=None, saved_amount=None, target_date=None, status=None):
         """ Update saving goal details in the database."""
         result = self.db.update_saving_goal(goal_id, name, target_amount, saved_amount, target_date, status)
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "message": "Saving Goal updated Successfully!"}
         else:
             return {"Success": False, "message": f"Error: {result.error}"}
+
+    def add_to_saving_goal(self, goal_id, delta):
+        """ Atomically add delta (negative to withdraw) to a goal's saved amount; never drops below 0."""
+        contributions, error = _merge_contributions({goal_id: delta})
+        if error:
+            return {"Success": False, "message": error}
+        if not contributions:
+            return {"Success": False, "message": "Contribution must not be zero."}
+        result = self.db.add_to_saving_goal(goal_id, contributions[0]["delta"])
+        _bump_versions(result)
+        if result.data:
+            return {"Success": True, "data": result.data}
+        elif result.data is not None:
+            return {"Success": False, "message": "Saving goal not found."}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
+
+    def add_to_saving_goals(self, contributions):
+        """ Apply many goal contributions ({goal_id: delta} or [{"goal_id", "delta"}]) in one round-trip."""
+        contributions, error = _merge_contributions(contributions)
+        if error:
+            return {"Success": False, "message": error}
+        if not contributions:
+            return {"Success": True, "data": []}
+        result = self.db.add_to_saving_goals(contributions)
+        _bump_versions(result)
+        if result.data is not None:
+            return {"Success": True, "data": result.data}
+        else:
+            return {"Success": False, "message": f"Error: {result.error}"}
         
     #--------Delete----------
     def remove_saving_goal(self, goal_id):
         """ Delete a saving goal from the database."""
         result = self.db.delete_saving_goal(goal_id)
+        _bump_versions(result)
         if result.data:
             return {"Success": True, "message": "Saving Goal deleted Successfully!"}
         else:
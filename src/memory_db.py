@@ -0,0 +1,99 @@
+# memory_db.py
+# In-memory stand-in for Supabase, for load testing the API locally.
+# Select it with FINTRACK_DB_BACKEND=memory. Data lives in a private SQLite
+# ":memory:" database (same tables, methods and results as the other backends)
+# and every call waits for a simulated network round-trip first:
+#
+#   FINTRACK_MEMORY_LATENCY_MS  mean per-call latency (default 0)
+#   FINTRACK_MEMORY_JITTER_MS   +/- uniform jitter around it (default 0)
+#
+# The async view awaits that delay instead of sleeping a thread, like the real
+# async client, so a single API worker can be driven at thousands of RPS.
+import asyncio
+import functools
+import random
+import time
+
+from src.async_db import AsyncDatabaseManager
+from src.db import setting
+from src.sqlite_db import SQLiteDatabaseManager
+
+# One simulated round-trip each. iter_user_transactions is not listed: it pays
+# one round-trip per page through get_user_transactions, as with Supabase.
+ROUND_TRIP_METHODS = (
+    "add_user", "get_all_users", "get_user_by_id", "get_user_by_email", "update_user", "delete_user",
+    "add_category", "get_all_categories", "get_category_by_id", "update_category", "delete_category",
+    "add_transaction", "get_all_transactions", "get_user_transactions", "get_monthly_transactions",
+    "get_transaction_by_id", "update_transaction", "delete_transaction",
+    "get_monthly_rollups", "get_rollups_in_range", "get_budget_utilization", "get_exceeded_budgets",
+    "add_budget", "get_all_budgets", "get_budgets_in_range", "get_budget_by_id", "update_budget", "delete_budget",
+    "add_saving_goal", "get_all_saving_goals", "get_saving_goal_by_id", "update_saving_goal", "delete_saving_goal",
+    "add_to_saving_goal", "add_to_saving_goals",
+)
+
+
+class MemoryDatabaseManager(SQLiteDatabaseManager):
+    """In-memory database manager with configurable per-call latency and jitter"""
+    def __init__(self, latency_ms=None, jitter_ms=None, seed=None):
+        super().__init__(":memory:")
+        # settings are read here, not at import, so importing this module touches no .env
+        self.latency_ms = float(setting("FINTRACK_MEMORY_LATENCY_MS", "0")) if latency_ms is None else latency_ms
+        self.jitter_ms = float(setting("FINTRACK_MEMORY_JITTER_MS", "0")) if jitter_ms is None else jitter_ms
+        self._random = random.Random(seed)
+
+    def delay(self):
+        """Seconds one simulated round-trip takes: latency +/- uniform jitter, never negative"""
+        if not self.latency_ms and not self.jitter_ms:
+            return 0.0
+        jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    # Bulk inserts pay one round-trip per chunk, like one multi-row INSERT each
+    def add_transactions_batch(self, transactions, chunk_size=500):
+        chunks = -(-len(transactions) // chunk_size)
+        time.sleep(sum(self.delay() for _ in range(chunks)))
+        return super().add_transactions_batch(transactions, chunk_size)
+
+
+def _with_latency(name):
+    method = getattr(SQLiteDatabaseManager, name)
+
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        delay = self.delay()
+        if delay:
+            time.sleep(delay)
+        return method(self, *args, **kwargs)
+    return call
+
+
+for _name in ROUND_TRIP_METHODS:
+    setattr(MemoryDatabaseManager, _name, _with_latency(_name))
+
+
+class AsyncMemoryDatabaseManager:
+    """
+    Async view of a MemoryDatabaseManager for the API: the simulated latency is
+    awaited (asyncio.sleep) and the in-memory query then runs inline.
+    """
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        method = getattr(SQLiteDatabaseManager, name)
+        db = self._db
+
+        async def call(*args, **kwargs):
+            if name == "add_transactions_batch":
+                chunk_size = kwargs.get("chunk_size", args[1] if len(args) > 1 else 500)
+                delay = sum(db.delay() for _ in range(-(-len(args[0]) // chunk_size)))
+            else:
+                delay = db.delay()
+            await asyncio.sleep(delay)
+            return method(db, *args, **kwargs)
+        return call
+
+    async def iter_user_transactions(self, *args, **kwargs):
+        """Yield every matching transaction, one simulated round-trip per page"""
+        async for row in AsyncDatabaseManager.iter_user_transactions(self, *args, **kwargs):
+            yield row
@@ -0,0 +1,269 @@
+# src/metrics.py
+# Request timing and database call instrumentation.
+#
+#   InstrumentedDatabaseManager  wraps any database manager (sync or async) and
+#                                times every add_/get_/update_/delete_ call
+#   DbStats / track_db()         per-request (contextvar) DB calls, time and rows
+#   MetricsMiddleware            ASGI middleware: request metrics + Server-Timing header
+#   render_metrics()             Prometheus text exposition (served on /metrics)
+#
+# Metrics are per process; with several API workers, scrape each one.
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "fintrack_http_requests_total": ("counter", "HTTP requests by route and status.", None),
+    "fintrack_http_request_duration_seconds": ("histogram", "Wall time per HTTP request.", SECONDS_BUCKETS),
+    "fintrack_http_request_db_calls": ("histogram", "Database round-trips per HTTP request.", CALL_BUCKETS),
+    "fintrack_http_request_db_duration_seconds": ("histogram", "Time waiting on the database per HTTP request.",
+                                                  SECONDS_BUCKETS),
+    "fintrack_http_request_db_rows": ("histogram", "Rows returned by the database per HTTP request.", ROW_BUCKETS),
+    "fintrack_db_calls_total": ("counter", "Database calls by operation.", None),
+    "fintrack_db_errors_total": ("counter", "Failed database calls by operation.", None),
+    "fintrack_db_rows_total": ("counter", "Rows returned by the database by operation.", None),
+    "fintrack_db_call_duration_seconds": ("histogram", "Duration of one database call by operation.", SECONDS_BUCKETS),
+}
+
+# Database manager methods that are one round-trip each
+_OPERATION_PREFIXES = ("add_", "get_", "update_", "delete_")
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by (metric name, label pairs)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}  # key -> [bucket counts..., sum, count]
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self._lock:
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self):
+        """Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(state) for key, state in self._histograms.items()}
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            else:
+                for (metric, labels), state in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(buckets, state):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(state[-2])}")
+                    lines.append(f"{name}_count{_labels(labels)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def render_metrics():
+    return registry.render()
+
+
+#----------Per-request DB stats----------
+class DbStats:
+    """Database calls, time and rows accumulated for one request (or one render)."""
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+    def record(self, operation, args, kwargs, seconds, rows):
+        self.calls += 1
+        self.seconds += seconds
+        self.rows += rows
+
+
+_current_stats = contextvars.ContextVar("fintrack_db_stats", default=None)
+
+
+@contextmanager
+def track_db(stats=None):
+    """Collect the DB calls made in this context (and tasks/threads started from it) into stats."""
+    stats = stats if stats is not None else DbStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def set_db_stats(stats):
+    """Make stats (or None) the collector for the current context until replaced.
+    For long-lived contexts such as a Streamlit script thread; prefer track_db()."""
+    _current_stats.set(stats)
+
+
+def _row_count(result):
+    data = getattr(result, "data", None)
+    return len(data) if isinstance(data, list) else 0
+
+
+def _record(operation, args, kwargs, seconds, result=None, failed=False):
+    labels = (("operation", operation),)
+    rows = _row_count(result)
+    registry.inc("fintrack_db_calls_total", labels)
+    registry.observe("fintrack_db_call_duration_seconds", labels, seconds)
+    if rows:
+        registry.inc("fintrack_db_rows_total", labels, rows)
+    if failed or getattr(result, "error", None) or (isinstance(result, dict) and result.get("Success") is False):
+        registry.inc("fintrack_db_errors_total", labels)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(operation, args, kwargs, seconds, rows)
+
+
+#----------Database hook----------
+class InstrumentedDatabaseManager:
+    """
+    Transparent proxy over a database manager: every add_/get_/update_/delete_ call
+    (sync or async) is timed and recorded; everything else passes straight through.
+    The unwrapped manager is available as .wrapped.
+    """
+    def __init__(self, db):
+        self.wrapped = db
+
+    def __getattr__(self, name):
+        attr = getattr(self.wrapped, name)
+        if name == "iter_user_transactions":
+            # run the backend's paging loop against the proxy so each page is recorded
+            wrapper = functools.partial(type(self.wrapped).iter_user_transactions, self)
+        elif callable(attr) and name.startswith(_OPERATION_PREFIXES):
+            wrapper = self._timed_async(name, attr) if inspect.iscoroutinefunction(attr) else self._timed(name, attr)
+        else:
+            return attr
+        setattr(self, name, wrapper)  # build each wrapper once
+        return wrapper
+
+    @staticmethod
+    def _timed(name, method):
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                _record(name, args, kwargs, time.perf_counter() - started, failed=True)
+                raise
+            _record(name, args, kwargs, time.perf_counter() - started, result)
+            return result
+        return call
+
+    @staticmethod
+    def _timed_async(name, method):
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await method(*args, **kwargs)
+            except Exception:
+                _record(name, args, kwargs, time.perf_counter() - started, failed=True)
+                raise
+            _record(name, args, kwargs, time.perf_counter() - started, result)
+            return result
+        return call
+
+
+def instrument(db):
+    """Wrap a database manager so its calls are recorded (idempotent)."""
+    return db if isinstance(db, InstrumentedDatabaseManager) else InstrumentedDatabaseManager(db)
+
+
+#----------ASGI middleware----------
+def server_timing(total_seconds, stats):
+    """Server-Timing header value: total, time outside the DB, and DB time with call/row counts."""
+    db_ms = stats.seconds * 1000
+    total_ms = total_seconds * 1000
+    return (f'total;dur={total_ms:.1f}, app;dur={max(total_ms - db_ms, 0.0):.1f}, '
+            f'db;dur={db_ms:.1f};desc="{stats.calls} calls, {stats.rows} rows"')
+
+
+class MetricsMiddleware:
+    """
+    Per-request wall time, DB round-trips, DB time and rows returned.
+    Adds a Server-Timing header (measured up to the start of the response) and
+    feeds the Prometheus metrics once the response has been fully sent.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - started, stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with track_db() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                labels = (("method", scope["method"]), ("route", route))
+                registry.inc("fintrack_http_requests_total", labels + (("status", str(status)),))
+                registry.observe("fintrack_http_request_duration_seconds", labels, time.perf_counter() - started)
+                registry.observe("fintrack_http_request_db_calls", labels, stats.calls)
+                registry.observe("fintrack_http_request_db_duration_seconds", labels, stats.seconds)
+                registry.observe("fintrack_http_request_db_rows", labels, stats.rows)
@@ -0,0 +1,43 @@
+# src/responses.py
+# Fast JSON encoding for the large list endpoints (transactions, budgets, saving goals).
+#
+# Rows go straight from the database to bytes: orjson encodes the dicts (and any
+# date/datetime values, natively) in one pass, with no jsonable_encoder walk and no
+# per-row date conversion beforehand. Falls back to the standard json module when
+# orjson is not installed.
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, see requirements.txt
+    orjson = None
+
+
+def _default(value):
+    """Types neither encoder handles on its own."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content):
+    """Encode content as compact UTF-8 JSON bytes; dates become ISO strings."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with dumps(). Returned directly from a route, it also skips
+    FastAPI's response-model validation: the route's response_model still documents
+    the shape in OpenAPI, but the rows are not re-validated on every request.
+    """
+    def render(self, content):
+        return dumps(content)
@@ -0,0 +1,657 @@
+# sqlite_db.py
+# Local SQLite implementation of the DatabaseManager interface, for CI benchmarks,
+# offline deployments and single-node installs. Select it with
+# FINTRACK_DB_BACKEND=sqlite (file path in FINTRACK_SQLITE_PATH).
+#
+# Same method names and the same result shape as the Supabase manager: every call
+# returns an object with .data (list of row dicts, or None on error) and .error.
+# monthly_rollups and budget_utilization are kept current by triggers, as in
+# Postgres, so aggregates are answered by SQL instead of Python loops.
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+
+from src.db import DatabaseManager, TRANSACTION_SORTS, setting
+
+DEFAULT_SQLITE_PATH = "fintrack.db"  # FINTRACK_SQLITE_PATH overrides it; read when a manager is created
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,  -- UNIQUE also indexes email for the login lookup
+    name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    category_id TEXT REFERENCES categories(id) ON DELETE SET NULL,
+    type TEXT CHECK (type IN ('income', 'expense')),
+    amount REAL NOT NULL,
+    description TEXT,
+    date TEXT NOT NULL,  -- ISO timestamp, 'YYYY-MM-DDTHH:MM:SS[.ffffff]'
+    receipt_url TEXT
+);
+-- Per-user listings, date filters and keyset pages (date DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions (user_id, date, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_amount ON transactions (user_id, amount, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date, id);
+
+CREATE TABLE IF NOT EXISTS budgets (
+    id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    category_id TEXT REFERENCES categories(id) ON DELETE SET NULL,
+    month TEXT NOT NULL,  -- first day of the month, 'YYYY-MM-01'
+    amount REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_budgets_user_month_category ON budgets (user_id, month, category_id);
+
+CREATE TABLE IF NOT EXISTS savings_goals (
+    id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    target_amount REAL NOT NULL,
+    saved_amount REAL DEFAULT 0,
+    target_date TEXT NOT NULL,
+    status TEXT CHECK (status IN ('active', 'completed', 'paused')) DEFAULT 'active'
+);
+CREATE INDEX IF NOT EXISTS idx_savings_goals_user ON savings_goals (user_id);
+
+-- Running totals per (user, month, category, type); '' stands for "no category"
+-- because SQLite treats NULLs in a primary key as distinct
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    category_id TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    txn_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, category_id, type)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_insert AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO monthly_rollups (user_id, month, category_id, type, total, txn_count)
+    VALUES (NEW.user_id, substr(NEW.date, 1, 7) || '-01', COALESCE(NEW.category_id, ''), NEW.type, NEW.amount, 1)
+    ON CONFLICT (user_id, month, category_id, type)
+    DO UPDATE SET total = total + excluded.total, txn_count = txn_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_delete AFTER DELETE ON transactions
+BEGIN
+    UPDATE monthly_rollups SET total = total - OLD.amount, txn_count = txn_count - 1
+    WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND type = OLD.type;
+    DELETE FROM monthly_rollups
+    WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND type = OLD.type AND txn_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_rollup_update
+AFTER UPDATE OF user_id, category_id, type, amount, date ON transactions
+BEGIN
+    UPDATE monthly_rollups SET total = total - OLD.amount, txn_count = txn_count - 1
+    WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND type = OLD.type;
+    DELETE FROM monthly_rollups
+    WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND type = OLD.type AND txn_count <= 0;
+    INSERT INTO monthly_rollups (user_id, month, category_id, type, total, txn_count)
+    VALUES (NEW.user_id, substr(NEW.date, 1, 7) || '-01', COALESCE(NEW.category_id, ''), NEW.type, NEW.amount, 1)
+    ON CONFLICT (user_id, month, category_id, type)
+    DO UPDATE SET total = total + excluded.total, txn_count = txn_count + 1;
+END;
+
+-- Budget vs spend per (user, month, category) with a budget. The budget side follows
+-- the budgets table, the spent side follows the expense rollup bucket.
+CREATE TABLE IF NOT EXISTS budget_utilization (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    category_id TEXT NOT NULL DEFAULT '',
+    budget_amount REAL NOT NULL DEFAULT 0,
+    budget_count INTEGER NOT NULL DEFAULT 0,
+    spent_amount REAL NOT NULL DEFAULT 0,
+    percentage_used REAL GENERATED ALWAYS AS
+        (CASE WHEN budget_amount > 0 THEN spent_amount / budget_amount * 100 ELSE 0 END) VIRTUAL,
+    exceeded INTEGER GENERATED ALWAYS AS (spent_amount > budget_amount) VIRTUAL,
+    PRIMARY KEY (user_id, month, category_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_budget_utilization_exceeded
+ON budget_utilization (month, user_id, category_id) WHERE spent_amount > budget_amount;
+
+CREATE TRIGGER IF NOT EXISTS budgets_utilization_insert AFTER INSERT ON budgets
+BEGIN
+    INSERT INTO budget_utilization (user_id, month, category_id, budget_amount, budget_count, spent_amount)
+    VALUES (NEW.user_id, substr(NEW.month, 1, 7) || '-01', COALESCE(NEW.category_id, ''), NEW.amount, 1,
+            COALESCE((SELECT total FROM monthly_rollups
+                      WHERE user_id = NEW.user_id AND month = substr(NEW.month, 1, 7) || '-01'
+                        AND category_id = COALESCE(NEW.category_id, '') AND type = 'expense'), 0))
+    ON CONFLICT (user_id, month, category_id)
+    DO UPDATE SET budget_amount = budget_amount + excluded.budget_amount, budget_count = budget_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS budgets_utilization_delete AFTER DELETE ON budgets
+BEGIN
+    UPDATE budget_utilization SET budget_amount = budget_amount - OLD.amount, budget_count = budget_count - 1
+    WHERE user_id = OLD.user_id AND month = substr(OLD.month, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '');
+    DELETE FROM budget_utilization
+    WHERE user_id = OLD.user_id AND month = substr(OLD.month, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND budget_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS budgets_utilization_update
+AFTER UPDATE OF user_id, category_id, month, amount ON budgets
+BEGIN
+    UPDATE budget_utilization SET budget_amount = budget_amount - OLD.amount, budget_count = budget_count - 1
+    WHERE user_id = OLD.user_id AND month = substr(OLD.month, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '');
+    DELETE FROM budget_utilization
+    WHERE user_id = OLD.user_id AND month = substr(OLD.month, 1, 7) || '-01'
+      AND category_id = COALESCE(OLD.category_id, '') AND budget_count <= 0;
+    INSERT INTO budget_utilization (user_id, month, category_id, budget_amount, budget_count, spent_amount)
+    VALUES (NEW.user_id, substr(NEW.month, 1, 7) || '-01', COALESCE(NEW.category_id, ''), NEW.amount, 1,
+            COALESCE((SELECT total FROM monthly_rollups
+                      WHERE user_id = NEW.user_id AND month = substr(NEW.month, 1, 7) || '-01'
+                        AND category_id = COALESCE(NEW.category_id, '') AND type = 'expense'), 0))
+    ON CONFLICT (user_id, month, category_id)
+    DO UPDATE SET budget_amount = budget_amount + excluded.budget_amount, budget_count = budget_count + 1;
+END;
+
+-- The rollup triggers above run inside the transaction write, and these inside them
+CREATE TRIGGER IF NOT EXISTS rollups_utilization_insert AFTER INSERT ON monthly_rollups
+WHEN NEW.type = 'expense'
+BEGIN
+    UPDATE budget_utilization SET spent_amount = NEW.total
+    WHERE user_id = NEW.user_id AND month = NEW.month AND category_id = NEW.category_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_utilization_update AFTER UPDATE OF total ON monthly_rollups
+WHEN NEW.type = 'expense'
+BEGIN
+    UPDATE budget_utilization SET spent_amount = NEW.total
+    WHERE user_id = NEW.user_id AND month = NEW.month AND category_id = NEW.category_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollups_utilization_delete AFTER DELETE ON monthly_rollups
+WHEN OLD.type = 'expense'
+BEGIN
+    UPDATE budget_utilization SET spent_amount = 0
+    WHERE user_id = OLD.user_id AND month = OLD.month AND category_id = OLD.category_id;
+END;
+"""
+
+# Fills budget_utilization from the budgets already in a database created before it existed
+UTILIZATION_BACKFILL = """
+INSERT INTO budget_utilization (user_id, month, category_id, budget_amount, budget_count, spent_amount)
+SELECT b.user_id, substr(b.month, 1, 7) || '-01', COALESCE(b.category_id, ''), SUM(b.amount), COUNT(*),
+       COALESCE(r.total, 0)
+FROM budgets AS b
+LEFT JOIN monthly_rollups AS r
+    ON r.user_id = b.user_id AND r.month = substr(b.month, 1, 7) || '-01'
+   AND r.category_id = COALESCE(b.category_id, '') AND r.type = 'expense'
+GROUP BY 1, 2, 3
+"""
+UTILIZATION_COLUMNS = ("user_id, month, NULLIF(category_id, '') AS category_id, budget_amount, spent_amount, "
+                       "percentage_used, exceeded")
+
+TRANSACTION_COLUMNS = ("id", "user_id", "category_id", "type", "amount", "description", "date", "receipt_url")
+
+
+class SQLiteResult:
+    """Stand-in for the PostgREST response: rows in .data, error message in .error"""
+    def __init__(self, data=None, error=None):
+        self.data = data
+        self.error = error
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _new_id():
+    return str(uuid.uuid4())
+
+
+def _timestamp(value=None):
+    """date / datetime / ISO string -> sortable 'YYYY-MM-DDTHH:MM:SS' text (now() for None)"""
+    if value is None:
+        return datetime.now().isoformat(timespec="seconds")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat() + "T00:00:00"
+    value = str(value)
+    if len(value) == 10:
+        return value + "T00:00:00"
+    return value[:10] + "T" + value[11:]
+
+
+def _day(value):
+    """date / datetime / ISO string -> 'YYYY-MM-DD'"""
+    return value.isoformat()[:10] if isinstance(value, (date, datetime)) else str(value)[:10]
+
+
+def _columns(columns):
+    """Validate a PostgREST-style column list ("*" or "a,b,c") against the transactions table"""
+    if columns == "*":
+        return "*"
+    names = [c.strip() for c in columns.split(",")]
+    unknown = [c for c in names if c not in TRANSACTION_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown transaction columns: {', '.join(unknown)}")
+    return ", ".join(names)
+
+
+class SQLiteDatabaseManager:
+    def __init__(self, path=None):
+        self.path = path or setting("FINTRACK_SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        # One connection shared by every thread, serialised by a lock. SQLite allows a
+        # single writer anyway, and this also works for ":memory:" databases.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = _dict_row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode = WAL")
+                self._conn.execute("PRAGMA synchronous = NORMAL")
+            backfill = not self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'budget_utilization'").fetchone()
+            self._conn.executescript(SCHEMA)
+            if backfill:
+                self._conn.execute(UTILIZATION_BACKFILL)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- HELPER METHODS ----------
+    def _query(self, sql, params=()):
+        """Run one statement; rows (including RETURNING rows) come back in .data"""
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return SQLiteResult(rows)
+        except sqlite3.Error as e:
+            return SQLiteResult(None, str(e))
+
+    def _insert(self, table, row):
+        row = {"id": _new_id(), **row}
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+        return self._query(f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING *", tuple(row.values()))
+
+    def _update(self, table, row_id, update_data):
+        if not update_data:
+            return SQLiteResult(None, "No fields to update.")
+        assignments = ", ".join(f"{column} = ?" for column in update_data)
+        return self._query(f"UPDATE {table} SET {assignments} WHERE id = ? RETURNING *",
+                           (*update_data.values(), row_id))
+
+    def _delete(self, table, row_id):
+        return self._query(f"DELETE FROM {table} WHERE id = ? RETURNING *", (row_id,))
+
+    def _select_by_id(self, table, row_id):
+        return self._query(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
+
+
+    #-------------------------------------
+    #-------------Users Table-------------
+    #-------------------------------------
+    # Create Users
+    def add_user(self, email, name):
+        result = self._insert("users", {"email": email, "name": name})
+        if result.error and "UNIQUE" in result.error:
+            return {"Success": False, "message": "User already exists"}
+        if result.error:
+            return {"Success": False, "message": result.error}
+        return result
+
+    # Get All Users
+    def get_all_users(self):
+        return self._query("SELECT * FROM users")
+
+    # Get User by ID
+    def get_user_by_id(self, user_id):
+        return self._select_by_id("users", user_id)
+
+    # Get User by Email
+    def get_user_by_email(self, email):
+        return self._query("SELECT * FROM users WHERE email = ? LIMIT 1", (email,))
+
+    # Update User
+    def update_user(self, user_id, email=None, name=None):
+        update_data = {}
+        if email:
+            update_data["email"] = email
+        if name:
+            update_data["name"] = name
+        return self._update("users", user_id, update_data)
+
+    # Delete User
+    def delete_user(self, user_id):
+        return self._delete("users", user_id)
+
+    #-------------------------------------
+    #-----------Categories Table----------
+    #-------------------------------------
+    # Create categories
+    def add_category(self, name):
+        return self._insert("categories", {"name": name})
+
+    # Get All categories
+    def get_all_categories(self):
+        return self._query("SELECT * FROM categories")
+
+    # Get category by ID
+    def get_category_by_id(self, category_id):
+        return self._select_by_id("categories", category_id)
+
+    # Update category
+    def update_category(self, category_id, updated_name):
+        return self._update("categories", category_id, {"name": updated_name})
+
+    # Delete Category
+    def delete_category(self, category_id):
+        return self._delete("categories", category_id)
+
+    #-----------------------------------------
+    #-----------Transactions Table------------
+    #-----------------------------------------
+    # Create Transaction
+    def add_transaction(self, user_id, category_id, t_type, amount, description=None, date=None, receipt_url=None):
+        return self._insert("transactions", {
+            "user_id": user_id,
+            "category_id": category_id,
+            "type": t_type,
+            "amount": amount,
+            "description": description or None,
+            "date": _timestamp(date),
+            "receipt_url": receipt_url or None
+        })
+
+    # Create Transactions in bulk
+    def add_transactions_batch(self, transactions, chunk_size=500):
+        """Insert many transaction rows, one transaction (executemany) per chunk.
+        A chunk that fails is rolled back and reported row by row; later chunks still run."""
+        inserted = 0
+        errors = []
+        for start in range(0, len(transactions), chunk_size):
+            chunk = [{**row, "id": _new_id(), "date": _timestamp(row.get("date"))}
+                     for row in transactions[start:start + chunk_size]]
+            columns = list(chunk[0])
+            sql = f"INSERT INTO transactions ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+            try:
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    try:
+                        self._conn.executemany(sql, [tuple(row[c] for c in columns) for row in chunk])
+                        self._conn.execute("COMMIT")
+                    except BaseException:
+                        self._conn.execute("ROLLBACK")
+                        raise
+                inserted += len(chunk)
+            except (sqlite3.Error, KeyError) as e:
+                errors.extend({"index": start + i, "message": str(e)} for i in range(len(chunk)))
+        return {"inserted": inserted, "errors": errors}
+
+    def get_all_transactions(self, limit=100, cursor_date=None, cursor_id=None):
+        """Newest transactions across all users, keyset paginated on (date, id)"""
+        where, params = self._after_cursor([], [], _timestamp(cursor_date) if cursor_date else None, cursor_id)
+        sql = "SELECT * FROM transactions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._query(sql + " ORDER BY date DESC, id DESC LIMIT ?", (*params, limit))
+
+    @staticmethod
+    def _after_cursor(where, params, cursor_value, cursor_id, sort_by="date", descending=True):
+        """Keyset filter: rows strictly after (cursor_value, cursor_id) in (sort_by, id) order.
+        sort_by must already be checked against TRANSACTION_SORTS (it is put into the SQL)."""
+        if cursor_value is not None and cursor_id:
+            op = "<" if descending else ">"
+            where.append(f"({sort_by} {op} ? OR ({sort_by} = ? AND id {op} ?))")
+            params.extend((cursor_value, cursor_value, cursor_id))
+        return where, params
+
+    # Get User Transactions (filtered in SQL, keyset paginated)
+    def get_user_transactions(self, user_id, start_date=None, end_date=None, t_type=None, category_id=None,
+                              limit=100, cursor_value=None, cursor_id=None, columns="*", sort_by="date",
+                              descending=True):
+        """Get one page of a user's transactions, newest first unless sort_by/descending say otherwise
+        (served by idx_transactions_user_date / idx_transactions_user_amount)"""
+        if sort_by not in TRANSACTION_SORTS:
+            return SQLiteResult(None, f"Cannot sort transactions by {sort_by!r}.")
+        try:
+            columns = _columns(columns)
+        except ValueError as e:
+            return SQLiteResult(None, str(e))
+        if sort_by == "date" and cursor_value is not None:
+            cursor_value = _timestamp(cursor_value)
+        where, params = ["user_id = ?"], [user_id]
+        if start_date:
+            where.append("date >= ?")
+            params.append(_timestamp(start_date))
+        if end_date:
+            where.append("date < ?")
+            params.append(_timestamp(end_date))
+        if t_type:
+            where.append("type = ?")
+            params.append(t_type)
+        if category_id:
+            where.append("category_id = ?")
+            params.append(category_id)
+        where, params = self._after_cursor(where, params, cursor_value, cursor_id, sort_by, descending)
+        order = "DESC" if descending else "ASC"
+        sql = (f"SELECT {columns} FROM transactions WHERE {' AND '.join(where)} "
+               f"ORDER BY {sort_by} {order}, id {order} LIMIT ?")
+        return self._query(sql, (*params, limit))
+
+    # Same paging loop as the Supabase manager (only calls get_user_transactions)
+    iter_user_transactions = DatabaseManager.iter_user_transactions
+
+    # Get Monthly Transactions
+    def get_monthly_transactions(self, user_id, year, month):
+        """Get transactions for a specific user and month"""
+        start_date = date(year, month, 1)
+        end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return self._query(
+            "SELECT * FROM transactions WHERE user_id = ? AND date >= ? AND date < ?",
+            (user_id, _timestamp(start_date), _timestamp(end_date))
+        )
+
+    # Get Transaction by ID
+    def get_transaction_by_id(self, transaction_id):
+        return self._select_by_id("transactions", transaction_id)
+
+    # Update Transaction
+    def update_transaction(self, transaction_id, category_id=None, t_type=None, amount=None, description=None):
+        update_data = {}
+        if category_id:
+            update_data["category_id"] = category_id
+        if t_type:
+            update_data["type"] = t_type
+        if amount:
+            update_data["amount"] = amount
+        if description is not None:  # Allow empty string
+            update_data["description"] = description
+        return self._update("transactions", transaction_id, update_data)
+
+    # Delete Transaction
+    def delete_transaction(self, transaction_id):
+        return self._delete("transactions", transaction_id)
+
+    #-----------------------------------------
+    #-----------Monthly Rollups---------------
+    #-----------------------------------------
+    # Get Monthly Rollups
+    def get_monthly_rollups(self, user_id, month):
+        """Get the (category_id, type) -> total/count buckets of one user for one month"""
+        return self._query(
+            "SELECT NULLIF(category_id, '') AS category_id, type, total, txn_count "
+            "FROM monthly_rollups WHERE user_id = ? AND month = ?",
+            (user_id, _day(month))
+        )
+
+    # Get Rollups in Range
+    def get_rollups_in_range(self, user_id, start_month, end_month, t_type=None):
+        """Get a user's rollup buckets for months in [start_month, end_month)"""
+        sql = ("SELECT month, NULLIF(category_id, '') AS category_id, type, total, txn_count "
+               "FROM monthly_rollups WHERE user_id = ? AND month >= ? AND month < ?")
+        params = [user_id, _day(start_month), _day(end_month)]
+        if t_type:
+            sql += " AND type = ?"
+            params.append(t_type)
+        return self._query(sql, params)
+
+    #-----------------------------------------
+    #-----------Budget Utilization------------
+    #-----------------------------------------
+    # Get Budget Utilization
+    def get_budget_utilization(self, user_id, start_month, end_month):
+        """Get a user's budget vs spend rows for months in [start_month, end_month)"""
+        return self._query(
+            f"SELECT {UTILIZATION_COLUMNS} FROM budget_utilization "
+            "WHERE user_id = ? AND month >= ? AND month < ? ORDER BY month, category_id",
+            (user_id, _day(start_month), _day(end_month))
+        )
+
+    # Get Exceeded Budgets
+    def get_exceeded_budgets(self, month, limit=1000, cursor_user_id=None, cursor_category_id=None):
+        """One page of the month's exceeded budgets across all users, in (user_id, category_id)
+        order; the cursor is the last row of the previous page"""
+        sql = f"SELECT {UTILIZATION_COLUMNS} FROM budget_utilization WHERE month = ? AND spent_amount > budget_amount"
+        params = [_day(month)]
+        if cursor_user_id is not None:
+            sql += " AND (user_id, category_id) > (?, ?)"
+            params += [cursor_user_id, cursor_category_id or '']
+        return self._query(sql + " ORDER BY user_id, category_id LIMIT ?", (*params, limit))
+
+    #-------------------------------------
+    #-----------Budgets Table-------------
+    #-------------------------------------
+    # Create Budget
+    def add_budget(self, user_id, category_id, amount, month=None):
+        if month is None:
+            today = date.today()
+            month = date(today.year, today.month, 1)
+        return self._insert("budgets", {
+            "user_id": user_id,
+            "category_id": category_id,
+            "amount": amount,
+            "month": _day(month)
+        })
+
+    # Get All Budgets
+    def get_all_budgets(self, user_id=None):
+        if user_id:
+            return self._query("SELECT * FROM budgets WHERE user_id = ?", (user_id,))
+        return self._query("SELECT * FROM budgets")
+
+    # Get Budgets in Range
+    def get_budgets_in_range(self, user_id, start_month, end_month):
+        """Get a user's budgets for months in [start_month, end_month)"""
+        return self._query(
+            "SELECT * FROM budgets WHERE user_id = ? AND month >= ? AND month < ?",
+            (user_id, _day(start_month), _day(end_month))
+        )
+
+    # Get Budget by ID
+    def get_budget_by_id(self, budget_id):
+        return self._select_by_id("budgets", budget_id)
+
+    # Update Budget
+    def update_budget(self, budget_id, category_id=None, amount=None, month=None):
+        update_data = {}
+        if category_id:
+            update_data["category_id"] = category_id
+        if amount:
+            update_data["amount"] = amount
+        if month:
+            update_data["month"] = _day(month)
+        return self._update("budgets", budget_id, update_data)
+
+    # Delete Budget
+    def delete_budget(self, budget_id):
+        return self._delete("budgets", budget_id)
+
+    #-------------------------------------------
+    #-----------Saving Goals Table---------------
+    #-------------------------------------------
+    # Create Saving Goal
+    def add_saving_goal(self, user_id, name, target_amount, saved_amount=0.0, target_date=None, status="active"):
+        if target_date is None:
+            target_date = date.today() + timedelta(days=30)
+        return self._insert("savings_goals", {
+            "user_id": user_id,
+            "name": name,
+            "target_amount": target_amount,
+            "saved_amount": saved_amount,
+            "target_date": _day(target_date),
+            "status": status
+        })
+
+    # Get All Saving Goals
+    def get_all_saving_goals(self, user_id=None):
+        if user_id:
+            return self._query("SELECT * FROM savings_goals WHERE user_id = ?", (user_id,))
+        return self._query("SELECT * FROM savings_goals")
+
+    # Get Saving Goal by ID
+    def get_saving_goal_by_id(self, goal_id):
+        return self._select_by_id("savings_goals", goal_id)
+
+    # Update Saving Goal
+    def update_saving_goal(self, goal_id, name=None, target_amount=None, saved_amount=None, target_date=None, status=None):
+        update_data = {}
+        if name:
+            update_data["name"] = name
+        if target_amount:
+            update_data["target_amount"] = target_amount
+        if saved_amount is not None:  # Allow zero
+            update_data["saved_amount"] = saved_amount
+        if target_date:
+            update_data["target_date"] = _day(target_date)
+        if status:
+            update_data["status"] = status
+        return self._update("savings_goals", goal_id, update_data)
+
+    # Add to Saving Goal (atomic)
+    def add_to_saving_goal(self, goal_id, delta):
+        """saved_amount = max(saved_amount + delta, 0) in a single UPDATE"""
+        return self._query(
+            "UPDATE savings_goals SET saved_amount = MAX(COALESCE(saved_amount, 0) + ?, 0) WHERE id = ? RETURNING *",
+            (delta, goal_id)
+        )
+
+    # Add to many Saving Goals in one call
+    def add_to_saving_goals(self, contributions):
+        """contributions: [{"goal_id": ..., "delta": ...}]; applied in one transaction"""
+        rows = []
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    for c in contributions:
+                        rows.extend(self._conn.execute(
+                            "UPDATE savings_goals SET saved_amount = MAX(COALESCE(saved_amount, 0) + ?, 0) "
+                            "WHERE id = ? RETURNING *", (c["delta"], c["goal_id"])
+                        ).fetchall())
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            return SQLiteResult(None, str(e))
+        return SQLiteResult(rows)
+
+    # Delete Saving Goal
+    def delete_saving_goal(self, goal_id):
+        return self._delete("savings_goals", goal_id)
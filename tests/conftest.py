@@ -0,0 +1,27 @@
+# tests/conftest.py
+# Lets `pytest` run from anywhere: src.* is imported from the project root, as the app does.
+# Tests that need a database get a fresh in-memory SQLite one (src/sqlite_db.py), which keeps
+# monthly_rollups and budget_utilization current with the same triggers as Postgres.
+import sys, os
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.sqlite_db import SQLiteDatabaseManager
+
+
+@pytest.fixture
+def db():
+    db = SQLiteDatabaseManager(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def user_id(db):
+    return db.add_user("test@example.com", "Test User").data[0]["id"]
+
+
+@pytest.fixture
+def category_ids(db):
+    return [db.add_category(name).data[0]["id"] for name in ("Food", "Rent")]
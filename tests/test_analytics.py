@@ -0,0 +1,77 @@
+# tests/test_analytics.py
+# TransactionFrame trends and bucketed time series over hand-checked rows.
+from datetime import date
+
+from src.analytics import TransactionFrame
+
+ROWS = [
+    {"category_id": "food", "type": "expense", "amount": 60.0, "date": "2026-08-31T20:00:00"},  # Monday
+    {"category_id": "food", "type": "income", "amount": 100.0, "date": "2026-09-01T08:00:00"},
+    {"category_id": "rent", "type": "expense", "amount": 500.0, "date": "2026-09-06T12:00:00"},  # Sunday
+    {"category_id": None, "type": "expense", "amount": 2.5, "date": "2026-09-07T00:00:00"},      # Monday
+    {"category_id": "food", "type": "expense", "amount": 40.0, "date": "2026-11-15T09:00:00"},
+]
+
+
+def series(result):
+    return {line["key"]: line["y"] for line in result["series"]}
+
+
+#----------monthly_trend----------
+def test_monthly_trend_keeps_empty_months():
+    trend = TransactionFrame.from_rows(ROWS).monthly_trend()
+    assert trend == {
+        "months": ["2026-08-01", "2026-09-01", "2026-10-01", "2026-11-01"],
+        "income": [0.0, 100.0, 0.0, 0.0],
+        "expense": [60.0, 502.5, 0.0, 40.0],
+        "balance": [-60.0, -402.5, 0.0, -40.0],
+        "count": [1, 3, 0, 1],
+    }
+
+
+def test_monthly_trend_window_clips_rows():
+    trend = TransactionFrame.from_rows(ROWS).monthly_trend("2026-09-01", "2026-10-01")
+    assert trend["months"] == ["2026-09-01", "2026-10-01"]
+    assert trend["expense"] == [502.5, 0.0]
+
+
+def test_monthly_trend_of_nothing():
+    assert TransactionFrame.from_rows([]).monthly_trend()["months"] == []
+
+
+#----------timeseries----------
+def test_timeseries_by_type_per_week():
+    result = TransactionFrame.from_rows(ROWS).timeseries(date(2026, 8, 31), date(2026, 9, 13), "week")
+    assert result["x"] == ["2026-08-31", "2026-09-07"]
+    assert series(result) == {"income": [100.0, 0.0], "expense": [560.0, 2.5]}
+    assert result["count"] == [3, 1]
+
+
+def test_timeseries_per_day_is_inclusive_and_zero_filled():
+    result = TransactionFrame.from_rows(ROWS).timeseries(date(2026, 9, 5), date(2026, 9, 7), "day")
+    assert result["x"] == ["2026-09-05", "2026-09-06", "2026-09-07"]
+    assert series(result) == {"expense": [0.0, 500.0, 2.5]}
+    assert result["count"] == [0, 1, 1]
+
+
+def test_timeseries_by_category_counts_expenses_only():
+    frame = TransactionFrame.from_rows(ROWS)
+    result = frame.timeseries(date(2026, 8, 1), date(2026, 11, 30), "month", "category")
+    assert result["x"] == ["2026-08-01", "2026-09-01", "2026-10-01", "2026-11-01"]
+    assert series(result) == {
+        "food": [60.0, 0.0, 0.0, 40.0],  # the 100 of food income is not added in
+        "rent": [0.0, 500.0, 0.0, 0.0],
+        None: [0.0, 2.5, 0.0, 0.0],
+    }
+
+    income = frame.timeseries(date(2026, 8, 1), date(2026, 11, 30), "month", "category", t_type="income")
+    assert series(income) == {"food": [0.0, 100.0, 0.0, 0.0]}
+
+
+def test_timeseries_totals_match_the_trend():
+    frame = TransactionFrame.from_rows(ROWS)
+    trend = frame.monthly_trend("2026-08-01", "2026-11-01")
+    for bucket in ("day", "week", "month"):
+        result = series(frame.timeseries(date(2026, 8, 1), date(2026, 11, 30), bucket))
+        assert round(sum(result["expense"]), 2) == round(sum(trend["expense"]), 2)
+        assert round(sum(result["income"]), 2) == round(sum(trend["income"]), 2)
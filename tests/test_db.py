@@ -0,0 +1,46 @@
+# tests/test_db.py
+# Process-wide database manager lifecycle (src/db.py) and lazily read backend settings.
+import os
+import subprocess
+import sys
+
+from src import db as db_module
+from src.memory_db import MemoryDatabaseManager
+from src.sqlite_db import SQLiteDatabaseManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _ClientOnlyManager:
+    """Stands in for the Supabase manager, which has no close() of its own."""
+
+
+def test_close_db_drops_a_manager_without_close(monkeypatch):
+    monkeypatch.setattr(db_module, "_db", _ClientOnlyManager())
+    db_module.close_db()
+    assert db_module._db is None
+
+
+def test_close_db_closes_a_local_backend(monkeypatch):
+    local = SQLiteDatabaseManager(":memory:")
+    monkeypatch.setattr(db_module, "_db", local)
+    db_module.close_db()
+    assert db_module._db is None
+    assert local.get_all_users().data is None  # connection is closed
+
+
+#----------Settings----------
+def test_importing_the_app_reads_no_settings():
+    code = ("import sys, src.sqlite_db, src.memory_db, api.main; "
+            "sys.exit('dotenv' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
+
+
+def test_backend_settings_are_read_when_a_manager_is_created(monkeypatch, tmp_path):
+    monkeypatch.setenv("FINTRACK_SQLITE_PATH", str(tmp_path / "fintrack.db"))
+    monkeypatch.setenv("FINTRACK_MEMORY_LATENCY_MS", "12.5")
+    local = SQLiteDatabaseManager()
+    assert local.path == str(tmp_path / "fintrack.db")
+    local.close()
+    assert MemoryDatabaseManager().latency_ms == 12.5
+    assert MemoryDatabaseManager(latency_ms=0).latency_ms == 0
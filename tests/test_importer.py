@@ -0,0 +1,168 @@
+# tests/test_importer.py
+# Statement parsing and normalization, then dedupe against the rows already stored.
+import io
+from datetime import date
+
+import pytest
+
+from src.importer import (
+    ImportRowError, StatementImporter, parse_csv, parse_ofx, _ofx_record, _fingerprint, parse_date, parse_amount, normalize,
+    detect_format
+)
+from src.logic import TransactionLogic, CategoryLogic
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260901120000[0:GMT]
+<TRNAMT>-4.50
+<FITID>T1
+<NAME>Coffee
+<MEMO>Card 1234
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20260902</DTPOSTED><TRNAMT>100.00</TRNAMT><FITID>T2</FITID><NAME>Salary</NAME></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+#----------Parse----------
+def test_parse_csv_maps_header_aliases_and_skips_blank_lines():
+    text = "Transaction Date,Narration,Withdrawal,Deposit,Reference\n2026-09-01,Coffee,4.50,,A1\n,,,,\n2026-09-02,Salary,,100,A2\n"
+    rows = list(parse_csv(io.StringIO(text)))
+    assert [line for line, _ in rows] == [2, 4]
+    assert rows[0][1] == {"date": "2026-09-01", "description": "Coffee", "debit": "4.50", "credit": "", "fitid": "A1"}
+
+
+def test_parse_ofx_handles_sgml_and_xml_transactions():
+    records = [_ofx_record(record) for _, record in parse_ofx(io.StringIO(OFX))]
+    assert records == [
+        {"date": "20260901", "amount": "-4.50", "description": "Coffee Card 1234", "fitid": "T1"},
+        {"date": "20260902", "amount": "100.00", "description": "Salary", "fitid": "T2"},
+    ]
+
+
+#----------Normalize----------
+@pytest.mark.parametrize("text, amount", [
+    ("1,234.50", 1234.5), ("₹ 99", 99.0), ("(12.00)", -12.0), ("-5", -5.0),
+])
+def test_parse_amount(text, amount):
+    assert parse_amount(text) == amount
+
+
+@pytest.mark.parametrize("text", ["", "abc", "-", None])
+def test_parse_amount_rejects_non_numbers(text):
+    with pytest.raises(ImportRowError):
+        parse_amount(text)
+
+
+@pytest.mark.parametrize("text", ["2026-09-01", "2026/09/01", "01/09/2026", "20260901", "2026-09-01T10:30:00"])
+def test_parse_date(text):
+    assert parse_date(text) == date(2026, 9, 1)
+
+
+def test_parse_date_rejects_unknown_formats():
+    with pytest.raises(ImportRowError, match="Unrecognised date"):
+        parse_date("next tuesday")
+
+
+def test_normalize_signs_and_types():
+    assert normalize({"date": "2026-09-01", "debit": "4.50", "description": " Coffee ", "category": "Food"}) == {
+        "date": date(2026, 9, 1), "type": "expense", "amount": 4.5,
+        "description": "Coffee", "category": "Food", "fitid": None,
+    }
+    assert normalize({"date": "2026-09-01", "amount": "-20", "type": "CR"})["type"] == "income"
+    assert normalize({"date": "2026-09-01", "credit": "20"})["type"] == "income"
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"date": "2026-09-01"}, "Missing amount"),
+    ({"date": "2026-09-01", "amount": "0.00"}, "Zero amount"),
+])
+def test_normalize_rejects_rows_without_an_amount(record, message):
+    with pytest.raises(ImportRowError, match=message):
+        normalize(record)
+
+
+def test_detect_format():
+    assert [detect_format(n) for n in ("a.OFX", "b.qfx", "c.csv", "statement", None)] == ["ofx", "qfx", "csv", "csv", "csv"]
+
+
+#----------Dedupe----------
+HEADER = "date,amount,description,category\n"
+
+
+def run_import(db, user_id, text, **kwargs):
+    importer = StatementImporter(user_id, transaction_logic=TransactionLogic(db),
+                                 category_logic=CategoryLogic(db), **kwargs)
+    stats = importer.import_file(io.StringIO(text))
+    return stats["inserted"], stats["duplicates"], stats["failed"]
+
+
+def stored_amounts(db, user_id):
+    return sorted(t["amount"] for t in db.get_user_transactions(user_id, limit=1000).data)
+
+
+def test_identical_same_day_rows_are_all_imported(db, user_id, category_ids):
+    text = HEADER + "2026-09-01,-4.50,Coffee,Food\n" * 2 + "2026-09-01,-12,Lunch,Food\n"
+    assert run_import(db, user_id, text) == (3, 0, 0)
+    assert stored_amounts(db, user_id) == [4.5, 4.5, 12]
+
+
+def test_reimport_skips_only_rows_already_stored(db, user_id, category_ids):
+    run_import(db, user_id, HEADER + "2026-09-01,-4.50,Coffee,Food\n" * 2)
+
+    assert run_import(db, user_id, HEADER + "2026-09-01,-4.50,Coffee,Food\n" * 2) == (0, 2, 0)
+    # an overlapping statement with one more coffee that day adds just that one
+    assert run_import(db, user_id, HEADER + "2026-09-01,-4.50,Coffee,Food\n" * 3) == (1, 2, 0)
+    assert stored_amounts(db, user_id) == [4.5, 4.5, 4.5]
+
+
+def test_rows_inserted_by_an_earlier_chunk_are_not_duplicates(db, user_id, category_ids):
+    text = HEADER + "2026-09-01,-4.50,Coffee,Food\n" * 3
+    assert run_import(db, user_id, text, chunk_size=1) == (3, 0, 0)
+    assert run_import(db, user_id, text + "2026-09-01,-4.50,Coffee,Food\n", chunk_size=1) == (1, 3, 0)
+
+
+def test_repeated_fitid_is_dropped_within_a_file(db, user_id, category_ids):
+    text = ("date,amount,description,category,fitid\n"
+            "2026-09-01,-4.50,Coffee,Food,T1\n"
+            "2026-09-01,-4.50,Coffee,Food,T1\n"
+            "2026-09-01,-4.50,Coffee,Food,T2\n")
+    assert run_import(db, user_id, text) == (2, 1, 0)
+
+
+def test_bad_rows_are_reported_with_their_line(db, user_id, category_ids):
+    text = HEADER + "2026-09-01,-4.50,Coffee,Food\nsoon,-1,Tea,Food\n2026-09-02,-3,Snack,Unknown\n"
+    importer = StatementImporter(user_id, transaction_logic=TransactionLogic(db), category_logic=CategoryLogic(db))
+    stats = importer.import_file(io.StringIO(text))
+    assert (stats["inserted"], stats["failed"], stats["Success"]) == (1, 2, False)
+    assert [e["line"] for e in stats["errors"]] == [3, 4]
+
+
+def test_existing_counts_keep_only_the_chunk_fingerprints(db, user_id, category_ids):
+    # years of unrelated history inside the chunk's date span are read but not held
+    for year in range(2020, 2027):
+        for month in range(1, 13):
+            db.add_transaction(user_id, category_ids[0], "expense", month, "Rent", f"{year}-{month:02d}-05")
+    keys = {_fingerprint(date(2026, 9, 5), "expense", 9, "Rent"),
+            _fingerprint(date(2020, 1, 5), "expense", 1, "Rent"),
+            _fingerprint(date(2023, 3, 1), "expense", 3, "Gift")}
+    importer = StatementImporter(user_id, transaction_logic=TransactionLogic(db), category_logic=CategoryLogic(db))
+    counts = importer._existing_counts(keys, date(2020, 1, 5), date(2026, 9, 5))
+    assert sorted(counts.values()) == [1, 1]
+    assert set(counts) <= keys
+
+
+def test_chunk_fails_when_stored_rows_cannot_be_read(db, user_id, category_ids, monkeypatch):
+    logic = TransactionLogic(db)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("Failed to fetch transactions: timeout")
+        yield
+
+    monkeypatch.setattr(logic, "iter_user_transactions", broken)
+    importer = StatementImporter(user_id, transaction_logic=logic, category_logic=CategoryLogic(db))
+    stats = importer.import_file(io.StringIO(HEADER + "2026-09-01,-4.50,Coffee,Food\n"))
+    assert (stats["inserted"], stats["failed"]) == (0, 1)
+    assert stats["errors"] == [{"line": 2, "message": "Could not check for existing transactions."}]
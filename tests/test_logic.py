@@ -0,0 +1,102 @@
+# tests/test_logic.py
+# Helpers of src/logic.py: months, keyset cursors and saving-goal contribution merging.
+import asyncio
+import base64
+import json
+from datetime import date, datetime
+
+import pytest
+
+from src.async_db import ThreadedAsyncDatabaseManager
+from src.async_logic import AsyncBudgetsLogic
+from src.logic import BudgetsLogic, _month_start, _encode_cursor, _decode_cursor, _merge_contributions
+
+
+def _raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+#----------Months----------
+@pytest.mark.parametrize("month", ["2026-09", "2026-09-17", "2026-09-17T10:00:00", date(2026, 9, 17), datetime(2026, 9, 17, 8)])
+def test_month_start(month):
+    assert _month_start(month) == date(2026, 9, 1)
+
+
+@pytest.mark.parametrize("month, message", [
+    ("2026-13", "Invalid month format. Use YYYY-MM-DD or YYYY-MM"),
+    ("Sept", "Invalid month format. Use YYYY-MM-DD or YYYY-MM"),
+    (202609, "Month must be a date object."),
+])
+def test_month_start_rejects(month, message):
+    with pytest.raises(ValueError, match=message):
+        _month_start(month)
+
+
+@pytest.mark.parametrize("month", ["2026-09", "2026-09-17T10:00:00", date(2026, 9, 17), "2026-13", "Sept", 202609])
+def test_sync_and_async_budgets_agree_on_months(db, user_id, category_ids, month):
+    sync = BudgetsLogic(db).create_budget(user_id, category_ids[0], 100, month)
+    async_ = asyncio.run(AsyncBudgetsLogic(ThreadedAsyncDatabaseManager(db)).create_budget(
+        user_id, category_ids[0], 100, month))
+    assert sync["Success"] == async_["Success"]
+    if sync["Success"]:
+        assert sync["data"][0]["month"] == async_["data"][0]["month"] == "2026-09-01"
+    else:
+        assert sync["message"] == async_["message"]
+
+
+#----------Cursors----------
+def test_cursor_round_trip():
+    row = {"date": "2026-09-01T10:30:00", "id": "6f1c2a9e-0b7d-4d4e-9a51-3c2b1d0e8f77"}
+    assert _decode_cursor(_encode_cursor(row)) == (row["date"], row["id"])
+
+
+def test_amount_cursor_round_trip():
+    row = {"date": "2026-09-01T10:30:00", "amount": 12.5, "id": "6f1c2a9e-0b7d-4d4e-9a51-3c2b1d0e8f77"}
+    cursor = _encode_cursor(row, "amount", False)
+    assert _decode_cursor(cursor, "amount", False) == (12.5, row["id"])
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _decode_cursor(_raw_cursor(["12.5", row["id"], "amount", "asc"]), "amount", False)  # not a number
+
+
+def test_no_cursor_is_first_page():
+    assert _decode_cursor(None) == (None, None)
+    assert _decode_cursor("") == (None, None)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    _raw_cursor(["2026-09-01"]),                                 # id missing
+    _raw_cursor(["yesterday", "abc"]),                           # not a date
+    _raw_cursor(["2026-09-01", "abc' OR '1'='1"]),               # id is not a uuid-like token
+    _encode_cursor({"date": "2026-09-01", "id": "abc"})[:-3],    # truncated
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _decode_cursor(cursor)
+
+
+#----------Contributions----------
+def test_merge_contributions_sums_per_goal():
+    merged, error = _merge_contributions([
+        {"goal_id": "a", "delta": 10},
+        {"goal_id": "b", "delta": "2.5"},
+        {"goal_id": "a", "delta": 0.105},
+    ])
+    assert error is None
+    assert merged == [{"goal_id": "a", "delta": 10.11}, {"goal_id": "b", "delta": 2.5}]
+
+
+def test_merge_contributions_accepts_a_mapping_and_drops_cancelled_goals():
+    merged, error = _merge_contributions({"a": 5, "b": 0})
+    assert (merged, error) == ([{"goal_id": "a", "delta": 5.0}], None)
+    merged, error = _merge_contributions([{"goal_id": "a", "delta": 5}, {"goal_id": "a", "delta": -5}])
+    assert (merged, error) == ([], None)
+
+
+@pytest.mark.parametrize("contributions, message", [
+    ([{"delta": 5}], "Each contribution needs a goal_id."),
+    ([{"goal_id": "a", "delta": "five"}], "Contribution amounts must be numbers."),
+    ([{"goal_id": "a"}], "Contribution amounts must be numbers."),
+])
+def test_merge_contributions_rejects_bad_input(contributions, message):
+    assert _merge_contributions(contributions) == (None, message)
@@ -0,0 +1,184 @@
+# tests/test_sqlite_db.py
+# SQLite backend: trigger-maintained monthly_rollups / budget_utilization and keyset pages.
+import base64
+import json
+import random
+
+import pytest
+
+from src.logic import TransactionLogic
+
+
+def _raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def rollups(db, user_id, month="2026-09-01"):
+    """{(category_id, type): (total, txn_count)} of one month"""
+    return {(r["category_id"], r["type"]): (round(r["total"], 2), r["txn_count"])
+            for r in db.get_monthly_rollups(user_id, month).data}
+
+
+def utilization(db, user_id, month="2026-09-01"):
+    """{category_id: (budget_amount, spent_amount, exceeded)} of one month"""
+    rows = db.get_budget_utilization(user_id, month, "2026-10-01").data
+    return {r["category_id"]: (r["budget_amount"], round(r["spent_amount"], 2), bool(r["exceeded"])) for r in rows}
+
+
+#----------monthly_rollups----------
+def test_rollup_insert(db, user_id, category_ids):
+    food, rent = category_ids
+    db.add_transaction(user_id, food, "expense", 10, date="2026-09-01")
+    db.add_transaction(user_id, food, "expense", 5.5, date="2026-09-30T23:59:00")
+    db.add_transaction(user_id, rent, "income", 100, date="2026-09-15")
+    db.add_transaction(user_id, food, "expense", 7, date="2026-10-01")
+
+    assert rollups(db, user_id) == {(food, "expense"): (15.5, 2), (rent, "income"): (100, 1)}
+    assert rollups(db, user_id, "2026-10-01") == {(food, "expense"): (7, 1)}
+
+
+def test_rollup_update_moves_amount_between_buckets(db, user_id, category_ids):
+    food, rent = category_ids
+    txn = db.add_transaction(user_id, food, "expense", 10, date="2026-09-01").data[0]
+    db.add_transaction(user_id, food, "expense", 4, date="2026-09-02")
+
+    db.update_transaction(txn["id"], amount=25)
+    assert rollups(db, user_id) == {(food, "expense"): (29, 2)}
+
+    db.update_transaction(txn["id"], category_id=rent, t_type="income")
+    assert rollups(db, user_id) == {(food, "expense"): (4, 1), (rent, "income"): (25, 1)}
+
+
+def test_rollup_delete_drops_empty_buckets(db, user_id, category_ids):
+    food, _ = category_ids
+    first = db.add_transaction(user_id, food, "expense", 10, date="2026-09-01").data[0]
+    second = db.add_transaction(user_id, food, "expense", 4, date="2026-09-02").data[0]
+
+    db.delete_transaction(first["id"])
+    assert rollups(db, user_id) == {(food, "expense"): (4, 1)}
+    db.delete_transaction(second["id"])
+    assert rollups(db, user_id) == {}
+
+
+def _random_writes(db, user_id, category_ids, seed=7, steps=300):
+    """Inserts, updates (amount, type, category) and deletes over three months."""
+    rng, ids = random.Random(seed), []
+    for _ in range(steps):
+        roll = rng.random()
+        if ids and roll < 0.2:
+            db.delete_transaction(ids.pop(rng.randrange(len(ids))))
+        elif ids and roll < 0.45:
+            db.update_transaction(rng.choice(ids), category_id=rng.choice(category_ids),
+                                  t_type=rng.choice(("income", "expense")), amount=rng.randint(1, 500))
+        else:
+            ids.append(db.add_transaction(user_id, rng.choice(category_ids), rng.choice(("income", "expense")),
+                                          rng.randint(1, 500), date=f"2026-{rng.randint(8, 10):02d}-{rng.randint(1, 28):02d}"
+                                          ).data[0]["id"])
+
+
+def test_rollups_match_the_raw_rows_after_random_writes(db, user_id, category_ids):
+    _random_writes(db, user_id, category_ids)
+    expected = db._query(
+        "SELECT substr(date, 1, 7) || '-01' AS month, category_id, type, SUM(amount) AS total, COUNT(*) AS n "
+        "FROM transactions GROUP BY 1, 2, 3").data
+    stored = db._query("SELECT month, category_id, type, total, txn_count AS n FROM monthly_rollups").data
+    as_set = lambda rows: {(r["month"], r["category_id"], r["type"], round(r["total"], 2), r["n"]) for r in rows}
+    assert as_set(stored) == as_set(expected)
+
+
+
+#----------budget_utilization----------
+def test_utilization_follows_budget_writes(db, user_id, category_ids):
+    food, rent = category_ids
+    db.add_transaction(user_id, food, "expense", 80, date="2026-09-03")
+    budget = db.add_budget(user_id, food, 50, "2026-09-01").data[0]
+    assert utilization(db, user_id) == {food: (50, 80, True)}  # existing spend is picked up
+
+    db.update_budget(budget["id"], amount=100)
+    assert utilization(db, user_id) == {food: (100, 80, False)}
+
+    db.update_budget(budget["id"], category_id=rent)
+    assert utilization(db, user_id) == {rent: (100, 0, False)}
+
+    db.delete_budget(budget["id"])
+    assert utilization(db, user_id) == {}
+
+
+def test_utilization_follows_transaction_writes(db, user_id, category_ids):
+    food, _ = category_ids
+    db.add_budget(user_id, food, 50, "2026-09-01")
+    txn = db.add_transaction(user_id, food, "expense", 30, date="2026-09-03").data[0]
+    db.add_transaction(user_id, food, "income", 500, date="2026-09-04")  # income is not spending
+    assert utilization(db, user_id) == {food: (50, 30, False)}
+
+    db.update_transaction(txn["id"], amount=60)
+    assert utilization(db, user_id) == {food: (50, 60, True)}
+    assert [r["category_id"] for r in db.get_exceeded_budgets("2026-09-01").data] == [food]
+
+    db.delete_transaction(txn["id"])
+    assert utilization(db, user_id) == {food: (50, 0, False)}
+    assert db.get_exceeded_budgets("2026-09-01").data == []
+
+def test_utilization_matches_the_raw_rows_after_random_writes(db, user_id, category_ids):
+    for month in ("2026-08-01", "2026-09-01", "2026-10-01"):
+        for category_id in category_ids:
+            db.add_budget(user_id, category_id, 2000, month)
+    _random_writes(db, user_id, category_ids, seed=11)
+    spent = {(r["month"], r["category_id"]): r["total"] for r in db._query(
+        "SELECT substr(date, 1, 7) || '-01' AS month, category_id, SUM(amount) AS total "
+        "FROM transactions WHERE type = 'expense' GROUP BY 1, 2").data}
+    rows = db.get_budget_utilization(user_id, "2026-08-01", "2026-11-01").data
+    assert len(rows) == 6
+    for row in rows:
+        assert round(row["spent_amount"], 2) == round(spent.get((row["month"], row["category_id"]), 0), 2)
+        assert bool(row["exceeded"]) == (row["spent_amount"] > 2000)
+
+
+#----------Keyset pages----------
+def test_cursor_pages_cover_every_row_once(db, user_id, category_ids):
+    food, _ = category_ids
+    ids = {db.add_transaction(user_id, food, "expense", i + 1, date=f"2026-09-{i % 3 + 1:02d}").data[0]["id"]
+           for i in range(7)}
+    logic, seen, cursor = TransactionLogic(db), [], None
+    while True:
+        page = logic.fetch_user_transactions(user_id, limit=3, cursor=cursor)
+        assert page["Success"]
+        seen += [t["id"] for t in page["data"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+
+    tampered = logic.fetch_user_transactions(user_id, cursor=_raw_cursor(["2026-09-01", "x;--"]))
+    assert tampered == {"Success": False, "message": "Invalid cursor."}
+
+
+@pytest.mark.parametrize("sort_by, descending", [("date", True), ("date", False), ("amount", True), ("amount", False)])
+def test_sorted_pages_cover_every_row_once_in_order(db, user_id, category_ids, sort_by, descending):
+    food, _ = category_ids
+    for i in range(11):  # repeated dates and amounts, so ties are broken by id
+        db.add_transaction(user_id, food, "expense", i % 4 + 1, date=f"2026-09-{i % 3 + 1:02d}")
+    logic, seen, cursor = TransactionLogic(db), [], None
+    while True:
+        page = logic.fetch_user_transactions(user_id, limit=3, cursor=cursor, sort_by=sort_by, descending=descending)
+        assert page["Success"]
+        seen += page["data"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    keys = [(t[sort_by], t["id"]) for t in seen]
+    assert keys == sorted(keys, reverse=descending)
+    assert len(set(keys)) == 11
+
+
+def test_cursor_only_resumes_its_own_order(db, user_id, category_ids):
+    for amount in (5, 10, 15):
+        db.add_transaction(user_id, category_ids[0], "expense", amount, date="2026-09-01")
+    logic = TransactionLogic(db)
+    cursor = logic.fetch_user_transactions(user_id, limit=1, sort_by="amount")["next_cursor"]
+    assert logic.fetch_user_transactions(user_id, limit=1, cursor=cursor, sort_by="amount")["data"][0]["amount"] == 10
+    for sort_by, descending in (("date", True), ("amount", False)):
+        assert logic.fetch_user_transactions(user_id, cursor=cursor, sort_by=sort_by, descending=descending) == {
+            "Success": False, "message": "Invalid cursor."}
+    assert logic.fetch_user_transactions(user_id, sort_by="id") == {
+        "Success": False, "message": "Sort must be one of date, amount."}